@@ -0,0 +1,45 @@
+import argparse
+from datetime import datetime
+
+from core.backfill import TIPOS_BACKFILL, executar_backfill
+from core.config import BACKFILL_FATIAS, BACKFILL_PARALELISMO
+from core.since_token import datetime_para_token, validar_idade_token, formatar_timedelta
+from gerenciar_since_tokens import parse_datetime, resolver_timezone
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        description="Backfill histórico: divide o período em fatias e importa todas em paralelo."
+    )
+    parser.add_argument("--tipo", choices=TIPOS_BACKFILL, required=True, help="Endpoint a reimportar.")
+    parser.add_argument("--inicio", required=True, help="Data/hora inicial (ex: 2025-12-10 08:00).")
+    parser.add_argument("--fim", help="Data/hora final (padrão: agora).")
+    parser.add_argument("--fatias", type=int, default=BACKFILL_FATIAS, help="Quantidade de fatias de tempo.")
+    parser.add_argument("--paralelismo", type=int, default=BACKFILL_PARALELISMO, help="Fatias importadas ao mesmo tempo.")
+    parser.add_argument("--timezone", help="Nome IANA do timezone (ex: America/Manaus).")
+    parser.add_argument("--offset", type=float, help="Offset UTC em horas (ex: -4). Ignorado se --timezone for informado.")
+    parser.add_argument("--utc", action="store_true", help="Indica que as datas fornecidas já estão em UTC.")
+    parser.add_argument("--forcar", action="store_true", help="Permite início fora do limite de 7 dias da MiX.")
+    return parser
+
+
+def main():
+    args = construir_parser().parse_args()
+    tz = resolver_timezone(args)
+    inicio = parse_datetime(args.inicio, tz)
+    fim = parse_datetime(args.fim, tz) if args.fim else datetime.now(tz)
+
+    valido, _, idade, limite = validar_idade_token(datetime_para_token(inicio))
+    if not valido and not args.forcar:
+        raise SystemExit(
+            f"O início está fora da janela aceita pela MiX ({formatar_timedelta(idade)} > {formatar_timedelta(limite)}). "
+            "Use uma data mais recente ou rode com --forcar."
+        )
+
+    resultados = executar_backfill(args.tipo, inicio, fim, args.fatias, args.paralelismo)
+    if any(resultado.erro for resultado in resultados):
+        raise SystemExit("❌ Backfill incompleto: há fatias com erro (veja o resumo acima).")
+
+
+if __name__ == "__main__":
+    main()
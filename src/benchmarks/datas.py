@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.utils import converter_lote_utc_para_manaus, converter_utc_para_manaus
+
+# Execute a partir de src/: python -m benchmarks.datas --linhas 100000
+
+
+def gerar_datas(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        (base + timedelta(seconds=aleatorio.randrange(365 * 86400))).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for _ in range(quantidade)
+    ]
+
+
+# Entradas fora do formato 'YYYY-MM-DDTHH:MM:SSZ': as duas versões devem devolver o mesmo (None)
+DATAS_LIMITE = [
+    "2025-03-01T12:00:00.123Z",
+    "2025-03-01T12:00:00+00:00",
+    "2025-03-01T12:00:00-04:00",
+    "2025-03-01",
+    "2025-03-01T12:00:00",
+    "lixo",
+    "",
+    None,
+]
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara conversão de datas linha a linha x vetorizada.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'linha a linha':>15} {'vetorizado':>12} {'ganho':>8}")
+    for quantidade in args.linhas:
+        datas = gerar_datas(quantidade) + DATAS_LIMITE
+        assert converter_lote_utc_para_manaus(datas) == [converter_utc_para_manaus(d) for d in datas]
+        por_linha = medir(lambda: [converter_utc_para_manaus(d) for d in datas], args.repeticoes)
+        vetorizado = medir(lambda: converter_lote_utc_para_manaus(datas), args.repeticoes)
+        print(f"{quantidade:>10} {por_linha:>14.4f}s {vetorizado:>11.4f}s {por_linha / vetorizado:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Benchmark ponta a ponta dos importadores contra a MiX simulada e um MySQL local.
+
+Sobe benchmarks.mix_simulado com um conjunto fixo (1k, 100k ou 1m linhas) e
+roda cada importador num processo próprio, medindo por etapa: páginas/s,
+linhas/s, latência p50/p99 das páginas, pico de RSS do processo e idas ao
+banco (delta de `Questions` no SHOW GLOBAL STATUS). O resultado vai para um
+JSON com o commit atual, para comparar versões.
+
+Use um banco dedicado (DB_NAME): as tabelas e os since_tokens de eventos e
+trips são sobrescritos. Execute a partir de src/:
+
+    python -m benchmarks.importadores --dataset 100k
+    python -m benchmarks.importadores --dataset 1k --etapas eventos trips --taxa-429 0.05
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS
+    resource = None
+
+# Nada de core.* (nem benchmarks.mix_simulado, que importa core) no topo: o
+# processo de cada etapa importa este módulo e só depois ajusta o ambiente,
+# e core.config lê as variáveis na importação.
+
+DATASETS = {
+    "1k": {"eventos": 1_000, "trips": 1_000, "assets": 100, "drivers": 100},
+    "100k": {"eventos": 100_000, "trips": 100_000, "assets": 1_000, "drivers": 1_000},
+    "1m": {"eventos": 1_000_000, "trips": 1_000_000, "assets": 5_000, "drivers": 5_000},
+}
+
+# Etapa -> (importador em core.importadores, contador de linhas da MiX simulada)
+ETAPAS = {
+    "tipos_eventos": ("tipos_eventos", "itens_tipos_eventos"),
+    "assets": ("assets", "itens_assets"),
+    "drivers": ("drivers", "itens_drivers"),
+    "eventos": ("eventos", "itens_events"),
+    "trips": ("trips", "itens_trips"),
+    "subtrips": ("subtrips", "itens_subtrips"),
+}
+# Importadores que seguem o since_token: começam do primeiro item do conjunto
+CHECKPOINTS = {"eventos": "since_tokens/since_token_eventos.txt", "trips": "since_tokens/since_token_trips.txt"}
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def percentil(valores, p):
+    """Percentil pelo posto mais próximo (None se não houver amostras)."""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posto = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados) + 0.5)) - 1))
+    return ordenados[posto]
+
+
+def porta_livre(host):
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def consultas_mysql():
+    """Contador global `Questions` do MySQL (None se o banco não responder)."""
+    import mysql.connector
+    from core.config import DB_CONFIG
+
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+    except mysql.connector.Error:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        linha = cursor.fetchone()
+        cursor.close()
+        return int(linha[1]) if linha else None
+    finally:
+        conn.close()
+
+
+def ambiente_filho(url, pasta):
+    """Variáveis do processo da etapa: MiX simulada, sem cota e pastas locais isoladas."""
+    from benchmarks.mix_simulado import ROTA_TOKEN
+
+    return {
+        "MIX_API_URL": url,
+        "MIX_AUTH_URL": f"{url}{ROTA_TOKEN}",
+        "MIX_ORGANISATION_ID": os.getenv("MIX_ORGANISATION_ID") or "5264698351645850280",
+        "MIX_CLIENT_ID": "benchmark",
+        "MIX_CLIENT_SECRET": "benchmark",
+        "MIX_USERNAME": "benchmark",
+        "MIX_PASSWORD": "benchmark",
+        "MIX_LIMITE_POR_MINUTO": "1000000",
+        "MIX_LIMITE_POR_HORA": "1000000",
+        "BACKOFF_BASE_SEGUNDOS": "0.05",
+        "BACKOFF_MAX_SEGUNDOS": "1",
+        "DRENAR_MAX_PAGINAS": "1000000",
+        "DRENAR_MAX_SEGUNDOS": "86400",
+        "HTTP_CACHE_PASTA": os.path.join(pasta, "cache_http"),
+        "ARQUIVO_BRUTO_PASTA": os.path.join(pasta, "arquivo_bruto"),
+        # Sem spool: banco fora do ar aparece como erro, não como gravação rápida
+        "SPOOL": "0",
+        "REGISTRO_EVENTOS_ARQUIVO": os.path.join(pasta, "tipos_eventos_tr.json"),
+    }
+
+
+def executar_etapa(etapa, ambiente, pasta, since_token):
+    """Roda um importador (no processo filho) e devolve as medições do lado do cliente."""
+    os.environ.update(ambiente)
+    os.chdir(pasta)
+    from core import cliente_mix
+    from core.importadores import IMPORTADORES
+    from core.since_token import salvar_checkpoint
+
+    paginas = []
+    cliente = cliente_mix.obter_cliente()
+    get_original = cliente.get
+
+    def get_medido(caminho, **kwargs):
+        inicio = time.perf_counter()
+        response = get_original(caminho, **kwargs)
+        paginas.append((time.perf_counter() - inicio, response.status_code))
+        return response
+
+    cliente.get = get_medido
+    nome, _ = ETAPAS[etapa]
+    with open(os.path.join(pasta, f"{etapa}.log"), "a", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        if etapa in CHECKPOINTS:
+            salvar_checkpoint(etapa, since_token, CHECKPOINTS[etapa])
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            if etapa in CHECKPOINTS:
+                if IMPORTADORES[nome](reiniciar_no_fim=False).erro:
+                    erro = "pipeline interrompido"
+            else:
+                IMPORTADORES[nome]()
+        except Exception as exc:
+            erro = exc
+        segundos = time.perf_counter() - inicio
+
+    pico_rss_mb = None
+    if resource is not None:
+        pico_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {
+        "segundos": segundos,
+        "latencias": [duracao for duracao, status in paginas if status in (200, 304)],
+        "requisicoes": len(paginas),
+        "pico_rss_mb": pico_rss_mb,
+        "erro": (erro if isinstance(erro, str) else repr(erro)) if erro else None,
+    }
+
+
+def medir_etapa(etapa, servidor, pasta, contexto):
+    from benchmarks.mix_simulado import _token
+
+    antes_mix = servidor.contadores.copia()
+    antes_banco = consultas_mysql()
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        medicao = executor.submit(
+            executar_etapa, etapa, ambiente_filho(servidor.url, pasta), pasta, _token(servidor.dados.inicio)
+        ).result()
+    depois_banco = consultas_mysql()
+    depois_mix = servidor.contadores.copia()
+
+    _, contador = ETAPAS[etapa]
+    linhas = depois_mix.get(contador, 0) - antes_mix.get(contador, 0)
+    latencias = medicao.pop("latencias")
+    segundos = medicao["segundos"]
+    return {
+        "etapa": etapa,
+        **medicao,
+        "paginas": len(latencias),
+        "linhas": linhas,
+        "paginas_por_segundo": len(latencias) / segundos if segundos else None,
+        "linhas_por_segundo": linhas / segundos if segundos else None,
+        "latencia_p50_ms": percentil(latencias, 50) * 1000 if latencias else None,
+        "latencia_p99_ms": percentil(latencias, 99) * 1000 if latencias else None,
+        "idas_ao_banco": (depois_banco - antes_banco) if None not in (antes_banco, depois_banco) else None,
+        "respostas_mix": {
+            chave: depois_mix[chave] - antes_mix.get(chave, 0)
+            for chave in depois_mix if chave.startswith("status_") and depois_mix[chave] != antes_mix.get(chave, 0)
+        },
+    }
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(description="Benchmark dos importadores contra a MiX simulada e o MySQL local.")
+    parser.add_argument("--dataset", choices=DATASETS, default="1k")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=list(ETAPAS),
+                        help="Etapas, na ordem (tipos_eventos prepara o registro dos eventos).")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latência injetada pela MiX simulada.")
+    parser.add_argument("--variacao-ms", type=float, default=0.0)
+    parser.add_argument("--taxa-429", type=float, default=0.0)
+    parser.add_argument("--taxa-5xx", type=float, default=0.0)
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: benchmarks/resultados/).")
+    parser.add_argument("--pasta", help="Pasta de trabalho (logs, spool, arquivo bruto). Padrão: temporária.")
+    return parser
+
+
+def main():
+    from benchmarks.mix_simulado import DadosSimulados, Falhas, ServidorMixSimulado
+
+    args = construir_parser().parse_args()
+    volume = DATASETS[args.dataset]
+    host = "127.0.0.1"
+    dados = DadosSimulados(semente=args.semente, **volume)
+    falhas = Falhas(args.latencia_ms, args.variacao_ms, args.taxa_429, args.taxa_5xx, retry_after=0)
+    servidor = ServidorMixSimulado((host, porta_livre(host)), dados, falhas)
+    servidor.iniciar()
+    pasta = os.path.abspath(args.pasta or tempfile.mkdtemp(prefix="benchmark_importadores_"))
+    os.makedirs(pasta, exist_ok=True)
+    contexto = multiprocessing.get_context("spawn")
+
+    print(f"🏁 Benchmark {args.dataset} | MiX simulada em {servidor.url} | logs em {pasta}")
+    print(f"{'etapa':>14} {'linhas':>9} {'páginas':>8} {'linhas/s':>10} {'pág/s':>8} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'idas DB':>9}")
+    etapas = []
+    try:
+        for etapa in args.etapas:
+            medicao = medir_etapa(etapa, servidor, pasta, contexto)
+            etapas.append(medicao)
+            print(f"{etapa:>14} {medicao['linhas']:>9} {medicao['paginas']:>8} "
+                  f"{_fmt(medicao['linhas_por_segundo'], 10, 0)} {_fmt(medicao['paginas_por_segundo'], 8, 1)} "
+                  f"{_fmt(medicao['latencia_p50_ms'], 8, 1)} {_fmt(medicao['latencia_p99_ms'], 8, 1)} "
+                  f"{_fmt(medicao['pico_rss_mb'], 8, 0)} {_fmt(medicao['idas_ao_banco'], 9, 0)}")
+            if medicao["erro"]:
+                print(f"{'':>14} ❌ {medicao['erro']} (veja {etapa}.log)")
+    finally:
+        servidor.encerrar()
+
+    resultado = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(),
+        "dataset": args.dataset,
+        "volume": volume,
+        "semente": args.semente,
+        "falhas": {"latencia_ms": args.latencia_ms, "variacao_ms": args.variacao_ms,
+                   "taxa_429": args.taxa_429, "taxa_5xx": args.taxa_5xx},
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "etapas": etapas,
+    }
+    saida = args.saida or os.path.join(
+        PASTA_RESULTADOS, f"{args.dataset}-{resultado['commit'] or 'sem-commit'}-{datetime.now():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultado salvo em {saida}")
+
+
+def _fmt(valor, largura, casas):
+    return f"{'-':>{largura}}" if valor is None else f"{valor:>{largura}.{casas}f}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+"""Servidor local que imita a API MiX (identidade + Integrate) para testes de carga.
+
+Gera eventos, trips (com subtrips), assets, drivers e tipos de evento
+sintéticos de forma determinística (mesma semente e volume = mesmos itens),
+espalhados numa janela que termina no início do servidor. As páginas de
+createdsince seguem o protocolo da MiX: o since_token (AAAAMMDDHHMMSSmmm)
+escolhe o primeiro item, `quantity` limita a página e as respostas trazem
+GetSinceToken/HasMoreItems. Latência, 429 (com Retry-After) e 5xx podem ser
+injetados para exercitar o limitador e as novas tentativas do cliente.
+
+Execute a partir de src/ e aponte o .env para ele:
+
+    python -m benchmarks.mix_simulado --eventos 100000 --trips 10000 --porta 8099
+
+    MIX_API_URL=http://127.0.0.1:8099
+    MIX_AUTH_URL=http://127.0.0.1:8099/core/connect/token
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core.registro_eventos import TABELAS_LEGADAS
+
+ORGANISATION_ID = "5264698351645850280"
+SITE_ID = 491492595400001151
+QUANTIDADE_MAXIMA = 1000
+FIXTURE_DRIVERS = os.path.join(os.path.dirname(__file__), "..", "..", "dados_endpoint.csv")
+
+ROTA_CREATEDSINCE = re.compile(
+    r"^/api/(events|trips)/groups/createdsince/organisation/[^/]+/sincetoken/(\d+)/quantity/(\d+)$"
+)
+ROTA_CADASTROS = {
+    re.compile(r"^/api/assets/group/[^/]+$"): "assets",
+    re.compile(r"^/api/drivers/organisation/[^/]+$"): "drivers",
+    re.compile(r"^/api/libraryevents/organisation/[^/]+$"): "tipos_eventos",
+    re.compile(r"^/api/driverlicence/group/[^/]+$"): "licencas",
+}
+ROTA_TOKEN = "/core/connect/token"
+
+# Área de Manaus, onde a frota real roda
+LATITUDE, LONGITUDE = -3.1, -60.0
+
+
+def _mistura(*valores):
+    """Hash inteiro estável (64 bits) de uma tupla: o "aleatório" de cada item."""
+    digest = hashlib.blake2b(repr(valores).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _fracao(*valores):
+    return _mistura(*valores) / 2**64
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _token(dt):
+    return dt.strftime("%Y%m%d%H%M%S") + f"{dt.microsecond // 1000:03d}"
+
+
+def _data_do_token(token):
+    dt = datetime.strptime(token[:14], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+    milis = int(token[14:17] or 0) if len(token) >= 17 else 0
+    return dt + timedelta(milliseconds=milis)
+
+
+def ler_drivers_fixture(caminho=FIXTURE_DRIVERS):
+    """Drivers do dados_endpoint.csv (export real de /api/drivers), se existir."""
+    if not os.path.exists(caminho):
+        return []
+    drivers = []
+    with open(caminho, newline="", encoding="utf-8") as f:
+        for linha in csv.DictReader(f):
+            drivers.append({
+                "IsSystemDriver": linha["IsSystemDriver"] == "True",
+                "FmDriverId": int(linha["FmDriverId"]),
+                "DriverId": int(linha["DriverId"]),
+                "SiteId": int(linha["SiteId"]),
+                "ExtendedDriverIdType": linha["ExtendedDriverIdType"],
+                "EmployeeNumber": linha["EmployeeNumber"] or None,
+                "Name": linha["Name"],
+            })
+    return drivers
+
+
+class DadosSimulados:
+    """Conjunto sintético fixo: item i do stream nasce em inicio + i * passo."""
+
+    def __init__(self, eventos=10000, trips=1000, assets=200, drivers=None, subtrips_por_trip=3,
+                 janela_horas=12, semente=42, fim=None, usar_fixture=True):
+        self.semente = semente
+        self.subtrips_por_trip = subtrips_por_trip
+        self.fim = (fim or datetime.now(timezone.utc)).replace(microsecond=0)
+        self.inicio = self.fim - timedelta(hours=janela_horas)
+        self.totais = {"events": eventos, "trips": trips}
+
+        fixture = ler_drivers_fixture() if usar_fixture else []
+        quantidade_drivers = len(fixture) if drivers is None and fixture else (drivers or 100)
+        self.drivers = [self._completar_driver(d) for d in fixture[:quantidade_drivers]]
+        self.drivers += [self._driver(i) for i in range(len(self.drivers), quantidade_drivers)]
+        self.assets = [self._asset(i) for i in range(assets)]
+        self.tipos_eventos = [
+            {
+                "EventTypeId": tipo_id,
+                "EventType": "Tr",
+                "Description": f"(Tr) {nome}",
+                "DisplayUnits": "km/h" if "Velocidade" in nome else None,
+                "FormatType": "Number",
+                "ValueName": "Velocidade" if "Velocidade" in nome else "Valor",
+            }
+            for tipo_id, (_, nome) in TABELAS_LEGADAS.items()
+        ]
+        self._ids_tipos = list(TABELAS_LEGADAS)
+        self._passos_ms = {
+            tipo: max(1, int((self.fim - self.inicio).total_seconds() * 1000) // max(1, total))
+            for tipo, total in self.totais.items()
+        }
+
+    # -- cadastros ---------------------------------------------------------
+
+    def _asset(self, i):
+        return {
+            "AssetId": 1344000000000000000 + i,
+            "AssetTypeId": 5,
+            "Description": f"ONIBUS {1000 + i}",
+            "IsConnectedTrailer": False,
+            "RegistrationNumber": f"SIM{i:04d}",
+            "SiteId": SITE_ID,
+            "FuelType": "Diesel",
+            "FuelTankCapacity": 300,
+            "TargetFuelConsumption": 2.5,
+            "TargetFuelConsumptionUnits": "KmPerLitre",
+            "TargetHourlyFuelConsumption": None,
+            "TargetHourlyFuelConsumptionUnits": None,
+            "FleetNumber": str(1000 + i),
+            "WltpMaxRangeKm": None,
+            "BatteryCapacitykWh": None,
+            "UsableBatteryCapacitykWh": None,
+            "Make": "Mercedes-Benz",
+            "Model": "O-500",
+            "Year": str(2015 + i % 10),
+            "VinNumber": f"9BM{_mistura(self.semente, 'vin', i) % 10**14:014d}",
+            "SerialNumber": None,
+            "AempEquipmentId": None,
+            "EngineNumber": None,
+            "DefaultDriverId": None,
+            "FmVehicleId": i + 1,
+            "AdditionalMobileDevice": None,
+            "Notes": None,
+            "Icon": "Bus",
+            "IconColour": "Blue",
+            "Colour": "Branco",
+            "AssetImage": None,
+            "IsDefaultImage": True,
+            "AssetImageUrl": None,
+            "UserState": "Available",
+            "CreatedBy": "simulador",
+            "CreatedDate": _iso(self.inicio - timedelta(days=365)),
+            "Odometer": None,
+            "EngineHours": None,
+            "Country": "Brazil",
+        }
+
+    def _driver(self, i):
+        return self._completar_driver({
+            "IsSystemDriver": False,
+            "FmDriverId": i + 1,
+            "DriverId": 1344082000000000000 + i,
+            "SiteId": SITE_ID,
+            "ExtendedDriverIdType": "None",
+            "EmployeeNumber": f"{1000 + i}*",
+            "Name": f"MOTORISTA SIMULADO {i:05d}",
+        })
+
+    @staticmethod
+    def _completar_driver(driver):
+        # Campos que o export CSV não traz mas a API devolve
+        return {
+            "ImageUri": None, "MobileNumber": None, "Email": None, "ExtendedDriverId": None,
+            "Country": "Brazil", "AdditionalDetailFields": [], **driver,
+        }
+
+    # -- streams createdsince ---------------------------------------------
+
+    def data_do_item(self, tipo, indice):
+        return self.inicio + timedelta(milliseconds=indice * self._passos_ms[tipo])
+
+    def pagina(self, tipo, since_token, quantidade, incluir_subtrips=False):
+        """Retorna (itens, GetSinceToken, HasMoreItems) a partir do since_token."""
+        total = self.totais[tipo]
+        passo = self._passos_ms[tipo]
+        desde_ms = (_data_do_token(since_token) - self.inicio).total_seconds() * 1000
+        primeiro = min(total, max(0, -(-int(desde_ms) // passo)))
+        ultimo = min(total, primeiro + min(quantidade, QUANTIDADE_MAXIMA))
+        if tipo == "events":
+            itens = [self.evento(i) for i in range(primeiro, ultimo)]
+        else:
+            itens = [self.trip(i, incluir_subtrips) for i in range(primeiro, ultimo)]
+        if ultimo > primeiro:
+            novo_token = _token(self.data_do_item(tipo, ultimo - 1) + timedelta(milliseconds=1))
+        else:
+            novo_token = since_token
+        return itens, novo_token, ultimo < total
+
+    def _posicao(self, chave, momento, velocidade, odometro):
+        return {
+            "Latitude": round(LATITUDE + (_fracao(*chave, "lat") - 0.5) * 0.3, 6),
+            "Longitude": round(LONGITUDE + (_fracao(*chave, "lon") - 0.5) * 0.3, 6),
+            "SpeedKilometresPerHour": velocidade,
+            "OdometerKilometres": odometro,
+            "Timestamp": _iso(momento),
+        }
+
+    def evento(self, i):
+        aleatorio = _mistura(self.semente, "evento", i)
+        inicio = self.data_do_item("events", i)
+        duracao = 1 + aleatorio % 120
+        fim = inicio + timedelta(seconds=duracao)
+        velocidade = 20 + (aleatorio >> 8) % 70
+        odometro = round(10000 + (aleatorio >> 16) % 500000 / 10, 1)
+        asset = self.assets[(aleatorio >> 24) % len(self.assets)] if self.assets else {"AssetId": None}
+        driver = self.drivers[(aleatorio >> 32) % len(self.drivers)] if self.drivers else {"DriverId": None}
+        return {
+            "AssetId": asset["AssetId"],
+            "DriverId": driver["DriverId"],
+            "EventId": 7000000000000000000 + i,
+            "EventTypeId": self._ids_tipos[(aleatorio >> 40) % len(self._ids_tipos)],
+            "EventCategory": "Event",
+            "StartDateTime": _iso(inicio),
+            "StartOdometerKilometres": odometro,
+            "StartPosition": self._posicao(("evento", i, "ini"), inicio, velocidade, odometro),
+            "EndDateTime": _iso(fim),
+            "EndOdometerKilometres": round(odometro + duracao * velocidade / 3600, 1),
+            "EndPosition": self._posicao(("evento", i, "fim"), fim, velocidade, odometro),
+            "Value": float(velocidade),
+            "FuelUsedLitres": round(duracao * 0.002, 3),
+            "ValueType": "Value",
+            "ValueUnits": "km/h",
+            "TotalTimeSeconds": duracao,
+            "TotalOccurances": 1,
+            "SpeedLimit": 60.0,
+        }
+
+    def trip(self, i, incluir_subtrips=False):
+        aleatorio = _mistura(self.semente, "trip", i)
+        inicio = self.data_do_item("trips", i)
+        duracao = 600 + aleatorio % 5400
+        parado = (aleatorio >> 12) % 600
+        fim = inicio + timedelta(seconds=duracao)
+        distancia = round(duracao * (20 + (aleatorio >> 20) % 40) / 3600, 2)
+        odometro = round(10000 + (aleatorio >> 28) % 500000 / 10, 1)
+        asset = self.assets[(aleatorio >> 36) % len(self.assets)] if self.assets else {"AssetId": None}
+        driver = self.drivers[(aleatorio >> 44) % len(self.drivers)] if self.drivers else {"DriverId": None}
+        trip = {
+            "TripId": 8000000000000000000 + i,
+            "AssetId": asset["AssetId"],
+            "DriverId": driver["DriverId"],
+            "DistanceKilometers": distancia,
+            "DrivingTime": duracao - parado,
+            "Duration": duracao,
+            "EndEngineSeconds": 5000000 + i * 10 + duracao,
+            "EndOdometerKilometers": round(odometro + distancia, 1),
+            "EngineSeconds": duracao,
+            "FirstDepart": _iso(inicio),
+            "FuelUsedLitres": round(distancia / 2.5, 2),
+            "LastHalt": _iso(fim),
+            "MaxAccelerationKilometersPerHourPerSecond": round(5 + _fracao(aleatorio, "ac") * 10, 1),
+            "MaxDecelerationKilometersPerHourPerSecond": round(5 + _fracao(aleatorio, "de") * 15, 1),
+            "MaxRpm": 1800 + (aleatorio >> 52) % 800,
+            "MaxSpeedKilometersPerHour": 40 + (aleatorio >> 8) % 50,
+            "Notes": None,
+            "PulseValue": 0,
+            "StandingTime": parado,
+            "StartEngineSeconds": 5000000 + i * 10,
+            "StartOdometerKilometers": odometro,
+            "TripEnd": _iso(fim),
+            "TripStart": _iso(inicio),
+        }
+        if incluir_subtrips:
+            trip["SubTrips"] = self._subtrips(i, inicio, duracao, odometro, distancia)
+        return trip
+
+    def _subtrips(self, i, inicio, duracao, odometro, distancia):
+        partes = max(1, self.subtrips_por_trip)
+        subtrips = []
+        for parte in range(partes):
+            comeco = inicio + timedelta(seconds=duracao * parte // partes)
+            termino = inicio + timedelta(seconds=duracao * (parte + 1) // partes)
+            km_inicial = round(odometro + distancia * parte / partes, 1)
+            km_final = round(odometro + distancia * (parte + 1) / partes, 1)
+            subtrips.append({
+                "SubTripStart": _iso(comeco),
+                "SubTripEnd": _iso(termino),
+                "StartOdometerKilometres": km_inicial,
+                "EndOdometerKilometres": km_final,
+                "DistanceKilometres": round(km_final - km_inicial, 2),
+                "FuelUsedLitres": round(distancia / partes / 2.5, 2),
+                "StartPosition": self._posicao(("subtrip", i, parte, "ini"), comeco, None, km_inicial),
+                "EndPosition": self._posicao(("subtrip", i, parte, "fim"), termino, None, km_final),
+            })
+        return subtrips
+
+
+class Falhas:
+    """Injeção de latência e erros, sorteada com semente própria (sequência reprodutível)."""
+
+    def __init__(self, latencia_ms=0.0, variacao_ms=0.0, taxa_429=0.0, taxa_5xx=0.0,
+                 retry_after=1, semente=7):
+        self.latencia_ms = latencia_ms
+        self.variacao_ms = variacao_ms
+        self.taxa_429 = taxa_429
+        self.taxa_5xx = taxa_5xx
+        self.retry_after = retry_after
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+
+    def sortear(self):
+        """Retorna (atraso_segundos, status_de_erro ou None)."""
+        with self._lock:
+            atraso = max(0.0, self.latencia_ms + self._aleatorio.uniform(-1, 1) * self.variacao_ms) / 1000
+            sorteio = self._aleatorio.random()
+            if sorteio < self.taxa_429:
+                return atraso, 429
+            if sorteio < self.taxa_429 + self.taxa_5xx:
+                return atraso, self._aleatorio.choice((500, 502, 503))
+            return atraso, None
+
+
+class Contadores:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.valores = {}
+
+    def somar(self, chave, quantidade=1):
+        with self._lock:
+            self.valores[chave] = self.valores.get(chave, 0) + quantidade
+
+    def copia(self):
+        with self._lock:
+            return dict(self.valores)
+
+
+class ManipuladorMix(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MixSimulado/1.0"
+
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            super().log_message(formato, *args)
+
+    # -- respostas ----------------------------------------------------------
+
+    def _responder(self, status, corpo=b"", cabecalhos=None):
+        cabecalhos = dict(cabecalhos or {})
+        if corpo and self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            corpo = gzip.compress(corpo, compresslevel=1)
+            cabecalhos["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        if corpo and self.command != "HEAD":
+            self.wfile.write(corpo)
+        self.server.contadores.somar(f"status_{status}")
+
+    def _json(self, status, dados, cabecalhos=None):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self._responder(status, corpo, {"Content-Type": "application/json; charset=utf-8", **(cabecalhos or {})})
+        return corpo
+
+    def _falhar_se_sorteado(self):
+        atraso, erro = self.server.falhas.sortear()
+        if atraso:
+            time.sleep(atraso)
+        if erro == 429:
+            self._json(429, {"Message": "Too many requests"}, {"Retry-After": str(self.server.falhas.retry_after)})
+        elif erro:
+            self._json(erro, {"Message": "Erro simulado"})
+        return erro is not None
+
+    # -- rotas ----------------------------------------------------------------
+
+    def do_POST(self):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        formulario = parse_qs(self.rfile.read(tamanho).decode("utf-8")) if tamanho else {}
+        if urlsplit(self.path).path != ROTA_TOKEN:
+            self._json(404, {"Message": "Not found"})
+            return
+        grant = (formulario.get("grant_type") or [""])[0]
+        if grant not in ("password", "refresh_token"):
+            self._json(400, {"error": "unsupported_grant_type"})
+            return
+        self.server.contadores.somar(f"token_{grant}")
+        access = self.server.emitir_token()
+        self._json(200, {
+            "access_token": access,
+            "refresh_token": f"refresh-{access}",
+            "expires_in": self.server.expira_em,
+            "token_type": "Bearer",
+        })
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        autorizacao = self.headers.get("Authorization", "")
+        if not self.server.token_valido(autorizacao.removeprefix("Bearer ").strip()):
+            self._json(401, {"Message": "Authorization has been denied for this request."})
+            return
+        if self._falhar_se_sorteado():
+            return
+
+        encontrado = ROTA_CREATEDSINCE.match(partes.path)
+        if encontrado:
+            tipo, since_token, quantidade = encontrado.group(1), encontrado.group(2), int(encontrado.group(3))
+            subtrips = parse_qs(partes.query).get("includeSubTrips", ["false"])[0].lower() == "true"
+            itens, novo_token, has_more = self.server.dados.pagina(tipo, since_token, quantidade, subtrips)
+            self.server.contadores.somar(f"paginas_{tipo}")
+            self.server.contadores.somar(f"itens_{tipo}", len(itens))
+            if subtrips:
+                self.server.contadores.somar("itens_subtrips", sum(len(t["SubTrips"]) for t in itens))
+            self._json(200, itens, {"GetSinceToken": novo_token, "HasMoreItems": str(has_more)})
+            return
+
+        for rota, nome in ROTA_CADASTROS.items():
+            if rota.match(partes.path):
+                self._cadastro(nome)
+                return
+        self._json(404, {"Message": "Not found"})
+
+    def _cadastro(self, nome):
+        corpo, quantidade = self.server.corpo_cadastro(nome)
+        etag = f'"{hashlib.sha256(corpo).hexdigest()[:32]}"'
+        self.server.contadores.somar(f"cadastro_{nome}")
+        if self.headers.get("If-None-Match") == etag:
+            self._responder(304, cabecalhos={"ETag": etag})
+            return
+        self.server.contadores.somar(f"itens_{nome}", quantidade)
+        self._responder(200, corpo, {"Content-Type": "application/json; charset=utf-8", "ETag": etag})
+
+
+class ServidorMixSimulado(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco, dados, falhas=None, gzip=True, expira_em=3600, verboso=False):
+        super().__init__(endereco, ManipuladorMix)
+        self.dados = dados
+        self.falhas = falhas or Falhas()
+        self.gzip = gzip
+        self.expira_em = expira_em
+        self.verboso = verboso
+        self.contadores = Contadores()
+        self._tokens = set()
+        self._cadastros = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def emitir_token(self):
+        with self._lock:
+            token = f"sim-{len(self._tokens) + 1}-{os.urandom(8).hex()}"
+            self._tokens.add(token)
+            return token
+
+    def token_valido(self, token):
+        with self._lock:
+            return token in self._tokens
+
+    def corpo_cadastro(self, nome):
+        # Cadastros não mudam durante a execução: serializa uma vez só
+        with self._lock:
+            if nome not in self._cadastros:
+                dados = {"assets": self.dados.assets, "drivers": self.dados.drivers,
+                         "tipos_eventos": self.dados.tipos_eventos, "licencas": []}[nome]
+                self._cadastros[nome] = (json.dumps(dados, ensure_ascii=False).encode("utf-8"), len(dados))
+            return self._cadastros[nome]
+
+    def iniciar(self):
+        """Atende em segundo plano (uso em benchmarks); devolve a URL base."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mix-simulado", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def encerrar(self):
+        self.shutdown()
+        self.server_close()
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(description="API MiX simulada (identidade + Integrate) para testes locais.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8099)
+    parser.add_argument("--eventos", type=int, default=10000, help="Eventos no stream createdsince.")
+    parser.add_argument("--trips", type=int, default=1000, help="Trips no stream createdsince.")
+    parser.add_argument("--subtrips-por-trip", type=int, default=3)
+    parser.add_argument("--assets", type=int, default=200)
+    parser.add_argument("--drivers", type=int, help="Padrão: os drivers de dados_endpoint.csv.")
+    parser.add_argument("--janela-horas", type=float, default=12,
+                        help="Os itens ficam entre agora menos a janela e agora.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Atraso fixo por requisição.")
+    parser.add_argument("--variacao-ms", type=float, default=0.0, help="Variação (+/-) sobre a latência.")
+    parser.add_argument("--taxa-429", type=float, default=0.0, help="Fração das requisições com 429.")
+    parser.add_argument("--taxa-5xx", type=float, default=0.0, help="Fração das requisições com 500/502/503.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) dos 429.")
+    parser.add_argument("--sem-gzip", action="store_true", help="Não compacta as respostas.")
+    parser.add_argument("--verboso", action="store_true", help="Loga cada requisição.")
+    return parser
+
+
+def main():
+    args = construir_parser().parse_args()
+    dados = DadosSimulados(
+        eventos=args.eventos,
+        trips=args.trips,
+        assets=args.assets,
+        drivers=args.drivers,
+        subtrips_por_trip=args.subtrips_por_trip,
+        janela_horas=args.janela_horas,
+        semente=args.semente,
+    )
+    falhas = Falhas(args.latencia_ms, args.variacao_ms, args.taxa_429, args.taxa_5xx, args.retry_after)
+    servidor = ServidorMixSimulado((args.host, args.porta), dados, falhas, gzip=not args.sem_gzip,
+                                   verboso=args.verboso)
+    print(f"🧪 MiX simulada em {servidor.url} | {args.eventos} eventos, {args.trips} trips, "
+          f"{len(dados.assets)} assets, {len(dados.drivers)} drivers")
+    print(f"   Janela {_iso(dados.inicio)} -> {_iso(dados.fim)} | since_token inicial {_token(dados.inicio)}")
+    print(f"   MIX_API_URL={servidor.url}  MIX_AUTH_URL={servidor.url}{ROTA_TOKEN}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(f"📊 {json.dumps(servidor.contadores.copia(), sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Arquivo bruto das páginas da MiX em JSONL compactado (gzip ou zstd).
+
+Cada página buscada vira uma linha JSON com o tipo, o since_token usado, o
+GetSinceToken devolvido, os cabeçalhos da resposta e os itens. A linha é
+compactada como um membro gzip (ou frame zstd) próprio e anexada ao segmento
+atual, então um processo interrompido perde no máximo a página em escrita.
+Os segmentos giram por hora e por tamanho; os mais antigos que
+ARQUIVO_BRUTO_RETER_DIAS são apagados. reprocessar_arquivo.py regrava tudo
+no banco a partir daqui, sem chamar a MiX.
+"""
+import glob
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+from core.config import (
+    ARQUIVO_BRUTO,
+    ARQUIVO_BRUTO_PASTA,
+    ARQUIVO_BRUTO_COMPRESSAO,
+    ARQUIVO_BRUTO_MAX_MB,
+    ARQUIVO_BRUTO_RETER_DIAS,
+)
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; sem ele o arquivo usa gzip
+    zstandard = None
+
+EXTENSOES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+_ERROS_LEITURA = (EOFError, OSError) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+def _compressao_disponivel(nome):
+    if nome == "zstd" and zstandard is None:
+        print("[ARQUIVO] ⚠️ zstandard não instalado; usando gzip.")
+        return "gzip"
+    return nome if nome in EXTENSOES else "gzip"
+
+
+class ArquivoBruto:
+    def __init__(self, pasta=ARQUIVO_BRUTO_PASTA, compressao=ARQUIVO_BRUTO_COMPRESSAO,
+                 max_bytes=int(ARQUIVO_BRUTO_MAX_MB * 1024 * 1024), reter_dias=ARQUIVO_BRUTO_RETER_DIAS):
+        self.pasta = pasta
+        self.compressao = _compressao_disponivel(compressao)
+        self.max_bytes = max_bytes
+        self.reter_dias = reter_dias
+        self._segmentos = {}
+        self._lock = threading.Lock()
+        self._compressor = zstandard.ZstdCompressor(level=3) if self.compressao == "zstd" else None
+
+    def _compactar(self, dados: bytes) -> bytes:
+        if self._compressor is not None:
+            return self._compressor.compress(dados)
+        return gzip.compress(dados, compresslevel=6)
+
+    def _compactador_incremental(self):
+        """Compactador com compress()/flush() que gera um membro gzip (ou frame zstd) completo."""
+        if self._compressor is not None:
+            return self._compressor.compressobj()
+        return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+
+    def _segmento(self, tipo):
+        """Segmento atual de `tipo`: gira na troca de hora ou ao passar de max_bytes."""
+        hora = datetime.now(timezone.utc).strftime("%Y%m%dT%H")
+        hora_atual, sequencia, caminho = self._segmentos.get(tipo, (None, 0, None))
+        if hora_atual != hora:
+            sequencia, caminho = 0, None
+            self._limpar(tipo)
+        if caminho is None or (os.path.exists(caminho) and os.path.getsize(caminho) >= self.max_bytes):
+            pasta = os.path.join(self.pasta, tipo)
+            os.makedirs(pasta, exist_ok=True)
+            while True:
+                sequencia += 1
+                caminho = os.path.join(pasta, f"{tipo}-{hora}-{sequencia:04d}{EXTENSOES[self.compressao]}")
+                if not os.path.exists(caminho) or os.path.getsize(caminho) < self.max_bytes:
+                    break
+        self._segmentos[tipo] = (hora, sequencia, caminho)
+        return caminho
+
+    def _limpar(self, tipo):
+        if self.reter_dias <= 0:
+            return
+        limite = time.time() - self.reter_dias * 86400
+        for caminho in glob.glob(os.path.join(self.pasta, tipo, f"{tipo}-*")):
+            try:
+                if os.path.getmtime(caminho) < limite:
+                    os.remove(caminho)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _registro(tipo, since_token, novo_token, has_more, cabecalhos, itens):
+        return {
+            "tipo": tipo,
+            "since_token": since_token,
+            "novo_token": novo_token,
+            "has_more": has_more,
+            "recebido_em": datetime.now(timezone.utc).isoformat(),
+            "cabecalhos": dict(cabecalhos or {}),
+            "itens": itens,
+        }
+
+    def anexar(self, tipo, since_token, novo_token, has_more, cabecalhos, itens):
+        registro = self._registro(tipo, since_token, novo_token, has_more, cabecalhos, itens)
+        dados = self._compactar((json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8"))
+        with self._lock:
+            caminho = self._segmento(tipo)
+            with open(caminho, "ab") as f:
+                f.write(dados)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _anexar_arquivo(self, tipo, origem):
+        """Anexa ao segmento um membro já compactado que está no arquivo `origem`."""
+        origem.seek(0)
+        with self._lock:
+            caminho = self._segmento(tipo)
+            with open(caminho, "ab") as f:
+                shutil.copyfileobj(origem, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def registrar_pagina(self, tipo, since_token, response, itens, novo_token, has_more):
+        """Arquiva a página e devolve os itens para o gravar.
+
+        Lista: arquivada na hora. Iterador (JSON_STREAMING): cada item é
+        compactado num arquivo temporário à medida que passa adiante (a página
+        nunca fica inteira em memória) e o membro é anexado ao segmento quando
+        a página termina de ser lida. Página não lida até o fim não é arquivada.
+        """
+        cabecalhos = getattr(response, "headers", None)
+        if isinstance(itens, list):
+            self._anexar_seguro(tipo, since_token, novo_token, has_more, cabecalhos, itens)
+            return itens
+        return self._arquivar_ao_final(tipo, since_token, novo_token, has_more, cabecalhos, itens)
+
+    def _arquivar_ao_final(self, tipo, since_token, novo_token, has_more, cabecalhos, itens):
+        # O registro é o mesmo JSON de anexar(), com "itens" (última chave) escrito item a item
+        registro = json.dumps(self._registro(tipo, since_token, novo_token, has_more, cabecalhos, []),
+                              ensure_ascii=False)
+        prefixo, sufixo = registro[:-2], registro[-2:] + "\n"
+        temporario = tempfile.TemporaryFile()
+        compactador = self._compactador_incremental()
+        try:
+            temporario.write(compactador.compress(prefixo.encode("utf-8")))
+            primeiro = True
+            for item in itens:
+                trecho = json.dumps(item, ensure_ascii=False)
+                temporario.write(compactador.compress((trecho if primeiro else ", " + trecho).encode("utf-8")))
+                primeiro = False
+                yield item
+            temporario.write(compactador.compress(sufixo.encode("utf-8")))
+            temporario.write(compactador.flush())
+            try:
+                self._anexar_arquivo(tipo, temporario)
+            except Exception as exc:
+                print(f"[ARQUIVO] ⚠️ Não foi possível arquivar a página ({exc}).")
+        finally:
+            temporario.close()
+
+    def _anexar_seguro(self, *args):
+        # Falha no arquivo nunca derruba a importação
+        try:
+            self.anexar(*args)
+        except Exception as exc:
+            print(f"[ARQUIVO] ⚠️ Não foi possível arquivar a página ({exc}).")
+
+
+def listar_segmentos(tipo, pasta=ARQUIVO_BRUTO_PASTA):
+    """Segmentos de `tipo` em ordem cronológica (nome = hora UTC + sequência)."""
+    arquivos = []
+    for extensao in EXTENSOES.values():
+        arquivos.extend(glob.glob(os.path.join(pasta, tipo, f"{tipo}-*{extensao}")))
+    return sorted(arquivos, key=os.path.basename)
+
+
+def ler_segmento(caminho):
+    """Percorre os registros (páginas) de um segmento.
+
+    Uma última linha truncada (processo interrompido no meio da escrita) é
+    ignorada com aviso.
+    """
+    if caminho.endswith(EXTENSOES["zstd"]):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard não instalado; não é possível ler {caminho}")
+        bruto = open(caminho, "rb")
+        leitor = zstandard.ZstdDecompressor().stream_reader(bruto, read_across_frames=True)
+        texto = io.TextIOWrapper(leitor, encoding="utf-8")
+    else:
+        bruto = None
+        texto = gzip.open(caminho, "rt", encoding="utf-8")
+    try:
+        while True:
+            try:
+                linha = texto.readline()
+            except _ERROS_LEITURA as exc:
+                print(f"[ARQUIVO] ⚠️ {os.path.basename(caminho)}: fim truncado ({exc}).")
+                return
+            if not linha:
+                return
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                print(f"[ARQUIVO] ⚠️ {os.path.basename(caminho)}: registro incompleto ignorado.")
+                return
+    finally:
+        texto.close()
+        if bruto is not None:
+            bruto.close()
+
+
+arquivo_bruto = ArquivoBruto() if ARQUIVO_BRUTO else None
+
+
+def arquivar_pagina(tipo, since_token, response, itens, novo_token, has_more):
+    """Arquiva a página se ARQUIVO_BRUTO estiver ligado; devolve os itens para o gravar."""
+    if arquivo_bruto is None:
+        return itens
+    return arquivo_bruto.registrar_pagina(tipo, since_token, response, itens, novo_token, has_more)
@@ -1,25 +1,104 @@
 import requests
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from core.metricas import metricas
 
 load_dotenv()
 
-AUTH_URL = "https://identity.us.mixtelematics.com/core/connect/token"
+AUTH_URL = os.getenv("MIX_AUTH_URL", "https://identity.us.mixtelematics.com/core/connect/token")
 CLIENT_ID = os.getenv("MIX_CLIENT_ID")
 CLIENT_SECRET = os.getenv("MIX_CLIENT_SECRET")
 USERNAME = os.getenv("MIX_USERNAME")
 PASSWORD = os.getenv("MIX_PASSWORD")
 SCOPE = "offline_access MiX.Integrate"
+# Renova o token alguns segundos antes do expires_in informado pela MiX
+MARGEM_RENOVACAO_SEGUNDOS = int(os.getenv("MIX_TOKEN_MARGEM_SEGUNDOS", "120"))
+
+
+class ErroAutenticacao(RuntimeError):
+    """A identidade MiX respondeu sem access_token (credenciais/escopo inválidos)."""
+
+
+class GerenciadorToken:
+    """Mantém o access token em memória e o renova perto da expiração.
+
+    Usa o refresh_token (escopo offline_access) quando disponível e cai para o
+    grant de senha se a renovação falhar. O lock garante que chamadas
+    concorrentes compartilhem uma única autenticação em andamento.
+    """
+
+    def __init__(self, margem=MARGEM_RENOVACAO_SEGUNDOS):
+        self.margem = margem
+        self._lock = threading.Lock()
+        # (access_token, renovar_em) numa só tupla: leitura fora do lock é atômica
+        self._atual = (None, 0.0)
+        self._refresh_token = None
+
+    def _valido(self):
+        """Token atual se ainda não chegou a hora de renovar, senão None."""
+        token, renovar_em = self._atual
+        if token and time.monotonic() < renovar_em:
+            return token
+        return None
+
+    def _solicitar(self, data):
+        data = {"client_id": CLIENT_ID, "client_secret": CLIENT_SECRET, **data}
+        with metricas.medir("mix_auth_segundos", grant=data["grant_type"]):
+            response = requests.post(AUTH_URL, data=data, timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        token = payload.get("access_token") if isinstance(payload, dict) else None
+        if not token:
+            erro = (payload.get("error_description") or payload.get("error")) if isinstance(payload, dict) else payload
+            raise ErroAutenticacao(f"identidade MiX não devolveu access_token ({data['grant_type']}): {erro}")
+        self._refresh_token = payload.get("refresh_token") or self._refresh_token
+        expira = int(payload.get("expires_in", 3600))
+        # Margem de no máximo metade da validade: expires_in <= margem não vira re-auth a cada chamada
+        self._atual = (token, time.monotonic() + expira - min(self.margem, expira / 2))
+        return token
+
+    def _autenticar_senha(self):
+        return self._solicitar({
+            "grant_type": "password",
+            "username": USERNAME,
+            "password": PASSWORD,
+            "scope": SCOPE
+        })
+
+    def _renovar(self):
+        try:
+            return self._solicitar({
+                "grant_type": "refresh_token",
+                "refresh_token": self._refresh_token
+            })
+        except (requests.RequestException, ErroAutenticacao) as exc:
+            print(f"[AUTH] ⚠️ Falha ao renovar com refresh_token ({exc}). Autenticando novamente...")
+            self._refresh_token = None
+            return self._autenticar_senha()
+
+    def obter(self):
+        token = self._valido()
+        if token:
+            return token
+        with self._lock:
+            # Outra thread pode ter autenticado enquanto esperávamos o lock
+            token = self._valido()
+            if token:
+                return token
+            if self._refresh_token:
+                return self._renovar()
+            return self._autenticar_senha()
+
+    def invalidar(self):
+        """Descarta o access token atual (ex.: após um 401)."""
+        with self._lock:
+            self._atual = (None, 0.0)
+
+
+gerenciador_token = GerenciadorToken()
+
 
 def autenticar():
-    data = {
-        "grant_type": "password",
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET,
-        "username": USERNAME,
-        "password": PASSWORD,
-        "scope": SCOPE
-    }
-    response = requests.post(AUTH_URL, data=data)
-    response.raise_for_status()
-    return response.json()["access_token"]
+    return gerenciador_token.obter()
@@ -0,0 +1,193 @@
+import functools
+import threading
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Tuple
+
+from core.auth import autenticar
+from core.carga_massa import Acumulador
+from core.config import BACKFILL_PARALELISMO
+from core.db import gravar_direto
+from core.metricas import importador
+from core.pipeline import executar_pipeline
+from core.since_token import (
+    FUSO_MANAUS,
+    datetime_para_token,
+    token_para_datetime,
+    formatar_timedelta,
+)
+
+
+def _endpoints():
+    # Import tardio: core.backfill é usado por scripts que não precisam carregar tudo.
+    # Grava direto no MySQL (sem spool): banco fora derruba a fatia em vez de enfileirar
+    from core import importador_lote
+    from endpoints import trips
+    return {
+        "eventos": (importador_lote.buscar_pagina_eventos,
+                    functools.partial(gravar_direto, importador_lote._gravar_eventos_banco),
+                    "EventId", importador_lote.QUANTITY),
+        "trips": (trips.buscar_pagina_trips,
+                  functools.partial(gravar_direto, trips._gravar_trips_banco),
+                  "TripId", trips.QUANTITY),
+    }
+
+
+TIPOS_BACKFILL = ("eventos", "trips")
+
+
+def planejar_fatias(inicio: datetime, fim: datetime, quantidade: int) -> List[Tuple[datetime, datetime]]:
+    """Divide [inicio, fim) em `quantidade` fatias de mesma duração."""
+    if fim <= inicio:
+        raise ValueError("O fim do backfill precisa ser maior que o início.")
+    quantidade = max(1, quantidade)
+    passo = (fim - inicio) / quantidade
+    limites = [inicio + passo * i for i in range(quantidade)] + [fim]
+    return list(zip(limites[:-1], limites[1:]))
+
+
+class Deduplicador:
+    """Descarta itens já gravados pela fatia vizinha nas páginas de fronteira.
+
+    A fronteira `n` fica entre as fatias n e n+1: dos dois lados só passam por
+    aqui a página que cruza o fim da fatia n e a primeira da fatia n+1. Filtrar,
+    gravar e marcar acontecem sob o lock da fronteira, então o segundo lado
+    sempre vê o que o primeiro já gravou (as tabelas tr_* e subtrips não têm
+    chave única no identificador: uma cópia repetida viraria outra linha). A
+    fronteira é liberada quando os dois lados já gravaram.
+    """
+
+    def __init__(self, chave):
+        self.chave = chave
+        self._fronteiras = {}
+        self._lados = {}
+        self._locks_fronteira = {}
+        self._lock = threading.Lock()
+        self.descartados = 0
+
+    def gravar(self, fronteiras, itens, gravar):
+        """Filtra, grava com `gravar(itens, None)` e marca a página de fronteira. Retorna os itens gravados."""
+        with self._lock:
+            locks = [self._locks_fronteira.setdefault(n, threading.Lock()) for n in sorted(fronteiras)]
+        with ExitStack() as pilha:
+            # Sempre na mesma ordem: uma página pode estar em duas fronteiras
+            for lock in locks:
+                pilha.enter_context(lock)
+            mantidos = self.filtrar(fronteiras, itens)
+            gravar(mantidos, None)
+            self.marcar(fronteiras, mantidos)
+        return mantidos
+
+    def filtrar(self, fronteiras, itens):
+        with self._lock:
+            vistos = set().union(*(self._fronteiras.get(n, ()) for n in fronteiras))
+        mantidos = [item for item in itens if item.get(self.chave) not in vistos]
+        if vistos:
+            with self._lock:
+                self.descartados += len(itens) - len(mantidos)
+        return mantidos
+
+    def marcar(self, fronteiras, itens):
+        """Registra os itens gravados; libera a fronteira no segundo lado."""
+        identificadores = {item.get(self.chave) for item in itens} - {None}
+        with self._lock:
+            for n in fronteiras:
+                self._lados[n] = self._lados.get(n, 0) + 1
+                if self._lados[n] >= 2:
+                    self._fronteiras.pop(n, None)
+                else:
+                    self._fronteiras.setdefault(n, set()).update(identificadores)
+
+
+def _executar_fatia(tipo, numero, ultima, inicio, fim, deduplicador, max_paginas, max_segundos):
+    buscar, gravar, _, quantidade = _endpoints()[tipo]
+    prefixo = f"[BACKFILL {tipo.upper()} #{numero}]"
+    token_inicio = datetime_para_token(inicio)
+    duracao = (fim - inicio).total_seconds()
+
+    def progresso(token):
+        dt = token_para_datetime(token)
+        if not dt:
+            return
+        percentual = min(100.0, max(0.0, (dt - inicio).total_seconds() / duracao * 100))
+        print(f"{prefixo} 📈 {percentual:5.1f}% | até {dt.astimezone(FUSO_MANAUS).strftime('%d/%m/%Y %H:%M')}")
+
+    def chegou_ao_fim(token):
+        dt = token_para_datetime(token)
+        return dt is not None and dt >= fim
+
+    print(f"{prefixo} ▶️ {inicio.astimezone(FUSO_MANAUS).strftime('%d/%m/%Y %H:%M')} -> "
+          f"{fim.astimezone(FUSO_MANAUS).strftime('%d/%m/%Y %H:%M')} (token {token_inicio})")
+    # O checkpoint do importador normal não é tocado: novo_token não vai para o gravar.
+    # Sem checkpoint por página, várias páginas podem ir juntas para a carga em massa.
+    acumulador = Acumulador(gravar)
+    paginas = 0
+
+    def gravar_pagina(itens, novo_token):
+        nonlocal paginas
+        paginas += 1
+        fronteiras = []
+        if paginas == 1 and numero > 1:
+            fronteiras.append(numero - 1)
+        if not ultima and (not novo_token or chegou_ao_fim(novo_token)):
+            fronteiras.append(numero)
+        if not fronteiras:
+            return acumulador.adicionar(itens)
+        # Página de fronteira: gravada na hora para marcar só o que já está no banco
+        return len(deduplicador.gravar(fronteiras, list(itens), gravar))
+
+    with importador(f"backfill_{tipo}"):
+        resultado = executar_pipeline(
+            buscar=buscar,
+            gravar=gravar_pagina,
+            salvar_token=progresso,
+            since_token=token_inicio,
+            max_paginas=max_paginas,
+            max_segundos=max_segundos,
+            tamanho_pagina=quantidade,
+            prefixo=prefixo,
+            parar_em=chegou_ao_fim,
+        )
+        try:
+            acumulador.descarregar()
+        except Exception as exc:
+            print(f"{prefixo} ❌ Erro ao gravar o último lote: {exc}")
+            resultado.erro = True
+    return resultado
+
+
+def executar_backfill(tipo, inicio, fim, fatias, paralelismo=BACKFILL_PARALELISMO,
+                      max_paginas=100000, max_segundos=24 * 3600):
+    """Importa o intervalo [inicio, fim) em fatias concorrentes.
+
+    Cada fatia começa no since_token do seu início e para quando o stream
+    passa do início da fatia seguinte. Itens repetidos nas páginas de
+    fronteira são descartados pelo identificador (EventId/TripId).
+    """
+    if tipo not in TIPOS_BACKFILL:
+        raise ValueError(f"Tipo sem suporte a backfill: {tipo}")
+
+    plano = planejar_fatias(inicio, fim, fatias)
+    chave = _endpoints()[tipo][2]
+    deduplicador = Deduplicador(chave)
+    autenticar()
+
+    print(f"[BACKFILL {tipo.upper()}] 🧩 {len(plano)} fatias de {formatar_timedelta(plano[0][1] - plano[0][0])} "
+          f"(paralelismo={paralelismo})")
+    comeco = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, paralelismo), thread_name_prefix="backfill") as pool:
+        futuros = [
+            pool.submit(_executar_fatia, tipo, numero, numero == len(plano), ini, fim_fatia, deduplicador,
+                        max_paginas, max_segundos)
+            for numero, (ini, fim_fatia) in enumerate(plano, start=1)
+        ]
+        resultados = [futuro.result() for futuro in futuros]
+
+    print(f"\n[BACKFILL {tipo.upper()}] Resumo ({time.perf_counter() - comeco:.1f}s)")
+    for numero, resultado in enumerate(resultados, start=1):
+        status = "❌" if resultado.erro else "✅"
+        print(f"  {status} Fatia #{numero}: {resultado.paginas} páginas, {resultado.itens} itens, {resultado.segundos:.1f}s")
+    print(f"  🔁 Duplicados descartados nas fronteiras: {deduplicador.descartados}")
+    return resultados
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from core.config import HTTP_CACHE_PASTA, HTTP_CACHE_TTL_SEGUNDOS, HTTP_CACHE_MAX_MB
+
+
+class CacheHttp:
+    """Cache em disco das respostas GET, indexado pela URL.
+
+    Cada entrada tem dois arquivos: `<hash>.json` (URL, ETag, Last-Modified,
+    quando foi validada) e `<hash>.body` (corpo bruto). Dentro do TTL a
+    resposta sai direto do disco; depois disso a requisição é revalidada com
+    If-None-Match/If-Modified-Since e um 304 reaproveita o corpo salvo. Quando
+    a pasta passa de `max_bytes`, as entradas menos usadas são apagadas.
+    """
+
+    def __init__(self, pasta=HTTP_CACHE_PASTA, ttl=HTTP_CACHE_TTL_SEGUNDOS,
+                 max_bytes=int(HTTP_CACHE_MAX_MB * 1024 * 1024)):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _caminhos(self, url):
+        chave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.pasta, chave)
+        return f"{base}.json", f"{base}.body"
+
+    def ler(self, url):
+        """Retorna (meta, corpo) da entrada ou None."""
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        try:
+            with open(caminho_meta, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(caminho_corpo, "rb") as f:
+                corpo = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        agora = time.time()
+        os.utime(caminho_corpo, (agora, agora))
+        return meta, corpo
+
+    def fresca(self, meta):
+        return time.time() - meta.get("validado_em", 0) < self.ttl
+
+    def cabecalhos_condicionais(self, meta):
+        cabecalhos = {}
+        if meta.get("etag"):
+            cabecalhos["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = meta["last_modified"]
+        return cabecalhos
+
+    def salvar(self, url, response):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "validado_em": time.time(),
+        }
+        caminho_meta, caminho_corpo = self._caminhos(url)
+        os.makedirs(self.pasta, exist_ok=True)
+        _gravar_atomico(caminho_corpo, response.content)
+        _gravar_atomico(caminho_meta, json.dumps(meta).encode("utf-8"))
+        self._despejar()
+        return meta
+
+    def revalidada(self, url, meta):
+        """Marca a entrada como validada agora (após um 304)."""
+        meta = dict(meta, validado_em=time.time())
+        caminho_meta, _ = self._caminhos(url)
+        _gravar_atomico(caminho_meta, json.dumps(meta).encode("utf-8"))
+        return meta
+
+    def _despejar(self):
+        with self._lock:
+            entradas = []
+            total = 0
+            for nome in os.listdir(self.pasta):
+                if not nome.endswith(".body"):
+                    continue
+                caminho = os.path.join(self.pasta, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                entradas.append((info.st_mtime, info.st_size, caminho))
+                total += info.st_size
+            # Menos recentemente usadas primeiro (ler() atualiza o mtime do corpo)
+            for _, tamanho, caminho in sorted(entradas):
+                if total <= self.max_bytes:
+                    break
+                for arquivo in (caminho, caminho[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(arquivo)
+                    except OSError:
+                        pass
+                total -= tamanho
+
+    @staticmethod
+    def resposta(url, meta, corpo, revalidada=False):
+        """Monta um Response 200 a partir da entrada (`from_cache` = True)."""
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response._content = corpo
+        response.encoding = meta.get("encoding")
+        response.headers = CaseInsensitiveDict({
+            chave: valor for chave, valor in (
+                ("Content-Type", meta.get("content_type")),
+                ("ETag", meta.get("etag")),
+                ("Last-Modified", meta.get("last_modified")),
+            ) if valor
+        })
+        response.from_cache = True
+        response.revalidada = revalidada
+        return response
+
+
+def _gravar_atomico(caminho, conteudo: bytes):
+    temporario = f"{caminho}.{threading.get_ident()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
@@ -0,0 +1,146 @@
+"""Carga em massa: TSV temporário + LOAD DATA LOCAL INFILE + INSERT ... SELECT.
+
+Para lotes grandes (backfill, reprocessamento do arquivo bruto) o INSERT
+multi-linha ainda custa uma ida ao banco a cada LOTE_INSERT_TAMANHO linhas.
+Aqui as linhas já convertidas vão para um TSV, são carregadas de uma vez numa
+tabela temporária e mescladas no destino com um único INSERT ... SELECT
+(IGNORE ou ON DUPLICATE KEY UPDATE, conforme o esquema). Tudo roda na
+transação de quem chamou; tabelas temporárias não fazem commit implícito.
+
+Se o servidor ou o conector recusarem o LOAD DATA LOCAL (local_infile=OFF), o
+processo volta para inserir_em_lotes e não tenta de novo. Outras falhas da
+carga em massa voltam ao INSERT em lotes só naquela gravação; deadlock e
+conexão perdida sobem para quem chamou, porque a transação já se perdeu.
+"""
+import os
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import mysql.connector
+
+from core.config import CARGA_EM_MASSA_MIN_LINHAS, CARGA_EM_MASSA_BLOCO
+from core.db_utils import inserir_em_lotes, linhas_duplicadas
+from core.metricas import metricas
+
+_indisponivel = False
+
+# 1148: comando não permitido nesta versão; 3948: local_infile=OFF no servidor;
+# 2068: LOAD DATA LOCAL recusado pelo conector (allow_local_infile)
+ERROS_LOCAL_INFILE = {1148, 2068, 3948}
+# Deadlock e conexão perdida: o servidor já desfez a transação de quem chamou
+ERROS_TRANSACAO_PERDIDA = {1213, 2006, 2013, 2055}
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+def _campo_tsv(valor):
+    if valor is None:
+        return "\\N"
+    if isinstance(valor, bool):
+        return "1" if valor else "0"
+    if isinstance(valor, (int, float, Decimal)):
+        return repr(valor) if isinstance(valor, float) else str(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat(sep=" ") if isinstance(valor, datetime) else valor.isoformat()
+    return str(valor).translate(_ESCAPES)
+
+
+def escrever_tsv(arquivo, linhas):
+    for linha in linhas:
+        arquivo.write("\t".join(_campo_tsv(valor) for valor in linha))
+        arquivo.write("\n")
+
+
+def usar_carga_em_massa(quantidade):
+    return not _indisponivel and 0 < CARGA_EM_MASSA_MIN_LINHAS <= quantidade
+
+
+def tamanho_bloco(itens, padrao):
+    """Tamanho do bloco de descarga: grande quando a página/lote cabe na carga em massa."""
+    if isinstance(itens, list) and usar_carga_em_massa(len(itens)):
+        return max(padrao, CARGA_EM_MASSA_BLOCO)
+    return padrao
+
+
+def carregar_em_massa(cursor, entidade, linhas, prefixo="[DB]", **formatos):
+    """Carrega `linhas` na tabela da entidade via staging. Retorna (gravadas, segundos)."""
+    tabela = entidade.tabela.format(**formatos)
+    staging = f"stg_{entidade.nome}"
+    colunas = ", ".join(entidade.nomes)
+    inicio = time.perf_counter()
+
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", suffix=".tsv", delete=False) as arquivo:
+        escrever_tsv(arquivo, linhas)
+        caminho = arquivo.name
+    try:
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging} SELECT {colunas} FROM {tabela} WHERE 1 = 0")
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {staging} CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({colunas})",
+            (caminho,),
+        )
+        cursor.execute(entidade.sql_mesclar(staging, **formatos))
+        ignoradas = linhas_duplicadas(cursor, len(linhas)) if entidade.modo == "ignore" else 0
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+    finally:
+        os.remove(caminho)
+
+    segundos = time.perf_counter() - inicio
+    metricas.observar("mix_gravacao_segundos", segundos)
+    metricas.linhas(inseridas=len(linhas) - ignoradas, ignoradas=ignoradas)
+    print(f"{prefixo} 🚛 Carga em massa: {len(linhas)} linhas -> {tabela} em {segundos:.2f}s")
+    return len(linhas), segundos
+
+
+def gravar_linhas(cursor, entidade, linhas, identificar=None, prefixo="[DB]", **formatos):
+    """Escolhe o caminho de gravação pelo volume. Retorna (gravadas, falhas, segundos).
+
+    A partir de CARGA_EM_MASSA_MIN_LINHAS linhas usa carregar_em_massa; abaixo
+    disso (ou se a carga em massa falhar) usa inserir_em_lotes.
+    """
+    global _indisponivel
+    if usar_carga_em_massa(len(linhas)):
+        try:
+            gravadas, segundos = carregar_em_massa(cursor, entidade, linhas, prefixo, **formatos)
+            return gravadas, 0, segundos
+        except Exception as exc:
+            errno = getattr(exc, "errno", None)
+            if isinstance(exc, mysql.connector.Error) and errno in ERROS_TRANSACAO_PERDIDA:
+                raise
+            if errno in ERROS_LOCAL_INFILE:
+                _indisponivel = True
+                print(f"{prefixo} ⚠️ Carga em massa indisponível ({exc}). Voltando ao INSERT em lotes.")
+            else:
+                print(f"{prefixo} ⚠️ Falha na carga em massa ({exc}). Gravando este lote com INSERT em lotes.")
+    return inserir_em_lotes(cursor, entidade.sql(**formatos), linhas, identificar=identificar, prefixo=prefixo)
+
+
+class Acumulador:
+    """Junta várias páginas antes de gravar, para lotes grandes o bastante para a carga em massa.
+
+    Só para fluxos que não gravam checkpoint por página (backfill, reprocessamento).
+    """
+
+    def __init__(self, gravar, minimo=CARGA_EM_MASSA_MIN_LINHAS):
+        self.gravar = gravar
+        self.minimo = minimo
+        self.itens = []
+
+    def adicionar(self, itens):
+        itens = list(itens)
+        if self.minimo <= 0:
+            self.gravar(itens, None)
+            return len(itens)
+        self.itens.extend(itens)
+        if len(self.itens) >= self.minimo:
+            self.descarregar()
+        return len(itens)
+
+    def descarregar(self):
+        if self.itens:
+            itens, self.itens = self.itens, []
+            self.gravar(itens, None)
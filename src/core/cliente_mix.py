@@ -0,0 +1,148 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from core.auth import autenticar, gerenciador_token
+from core.cache_http import CacheHttp
+from core.config import (
+    MIX_API_URL,
+    HTTP_CACHE,
+    HTTP_POOL_TAMANHO,
+    HTTP_TIMEOUT_CONEXAO,
+    HTTP_TIMEOUT_LEITURA,
+    HTTP_MAX_TENTATIVAS,
+    BACKOFF_MAX_SEGUNDOS,
+)
+from core.limitador import limitador, ler_retry_after, calcular_backoff
+from core.metricas import metricas
+
+# Respostas que valem uma nova tentativa
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
+
+
+class ClienteMix:
+    """Sessão HTTP compartilhada (keep-alive + pool de conexões) para a API MiX.
+
+    Monta a URL a partir do MIX_API_URL, injeta o Bearer token do cache de
+    core.auth e pede respostas compactadas com gzip. Toda requisição passa pelo
+    limitador compartilhado (core.limitador); 429/5xx e falhas de rede são
+    repetidos com backoff exponencial, respeitando o Retry-After.
+    Com `cache=True` no get, a resposta passa pelo cache em disco
+    (core.cache_http) e é revalidada com ETag/Last-Modified.
+    """
+
+    def __init__(self, base_url=MIX_API_URL, pool=HTTP_POOL_TAMANHO,
+                 timeout=(HTTP_TIMEOUT_CONEXAO, HTTP_TIMEOUT_LEITURA)):
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        self.cache = CacheHttp() if HTTP_CACHE else None
+
+    def url(self, caminho):
+        if caminho.startswith("http"):
+            return caminho
+        return f"{self.base_url}/{caminho.lstrip('/')}"
+
+    def get(self, caminho, headers=None, cache=False, **kwargs):
+        response = self._get_com_cache(caminho, headers=headers, cache=cache, **kwargs)
+        if response.status_code in (200, 206):
+            metricas.somar("mix_paginas_total")
+        return response
+
+    def _get_com_cache(self, caminho, headers=None, cache=False, **kwargs):
+        if not cache or self.cache is None or kwargs.get("stream"):
+            return self._get(caminho, headers=headers, **kwargs)
+
+        url = self.url(caminho)
+        entrada = self.cache.ler(url)
+        if entrada is None:
+            response = self._get(caminho, headers=headers, **kwargs)
+            if response.status_code == 200:
+                self.cache.salvar(url, response)
+            return response
+
+        meta, corpo = entrada
+        if self.cache.fresca(meta):
+            print(f"[HTTP] 💾 {caminho} servido do cache (TTL).")
+            return CacheHttp.resposta(url, meta, corpo)
+
+        condicionais = self.cache.cabecalhos_condicionais(meta)
+        response = self._get(caminho, headers={**condicionais, **(headers or {})}, **kwargs)
+        if response.status_code == 304:
+            print(f"[HTTP] 💾 {caminho} sem mudanças (304), usando o cache.")
+            meta = self.cache.revalidada(url, meta)
+            return CacheHttp.resposta(url, meta, corpo, revalidada=True)
+        if response.status_code == 200:
+            self.cache.salvar(url, response)
+        return response
+
+    def _get(self, caminho, headers=None, timeout=None, max_tentativas=HTTP_MAX_TENTATIVAS, **kwargs):
+        url = self.url(caminho)
+        renovou_token = False
+        tentativa = 0
+        while True:
+            cabecalhos = {"Authorization": f"Bearer {autenticar()}"}
+            if headers:
+                cabecalhos.update(headers)
+            limitador.aguardar()
+            inicio = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=cabecalhos, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                metricas.observar("mix_http_segundos", time.perf_counter() - inicio, status="erro_rede")
+                tentativa += 1
+                if tentativa >= max_tentativas:
+                    raise
+                espera = calcular_backoff(tentativa)
+                print(f"[HTTP] ⚠️ Falha de rede ({exc.__class__.__name__}). Nova tentativa em {espera:.1f}s...")
+                time.sleep(espera)
+                continue
+            metricas.observar("mix_http_segundos", time.perf_counter() - inicio, status=response.status_code)
+
+            # Token revogado/expirado do lado da MiX: descarta o cache e tenta uma vez mais
+            if response.status_code == 401 and not renovou_token:
+                renovou_token = True
+                gerenciador_token.invalidar()
+                # Com stream=True, a resposta não lida prende a conexão do pool
+                response.close()
+                continue
+
+            if response.status_code not in STATUS_RETENTAVEIS:
+                return response
+
+            tentativa += 1
+            if tentativa >= max_tentativas:
+                return response
+            retry_after = ler_retry_after(response.headers.get("Retry-After"))
+            # Retry-After absurdo (86400, data distante) não pode travar o importador
+            espera = min(retry_after, BACKOFF_MAX_SEGUNDOS) if retry_after is not None else calcular_backoff(tentativa)
+            if response.status_code == 429:
+                # Pausa todas as threads: a cota é da organisation, não da requisição
+                limitador.pausar(espera)
+            print(f"[HTTP] 🔁 {response.status_code} em {caminho}. Tentativa {tentativa}/{max_tentativas - 1} em {espera:.1f}s...")
+            response.close()
+            time.sleep(espera)
+
+
+_cliente = None
+_lock = threading.Lock()
+
+
+def obter_cliente():
+    global _cliente
+    if _cliente is None:
+        with _lock:
+            if _cliente is None:
+                _cliente = ClienteMix()
+    return _cliente
+
+
+def get(caminho, **kwargs):
+    return obter_cliente().get(caminho, **kwargs)
@@ -12,3 +12,110 @@ DB_CONFIG = {
     "database": os.getenv("DB_NAME")
 }
 
+# Modo "drenar": segue o GetSinceToken até HasMoreItems=False,
+# limitado por quantidade de páginas e tempo total por execução
+DRENAR_MAX_PAGINAS = int(os.getenv("DRENAR_MAX_PAGINAS", "50"))
+DRENAR_MAX_SEGUNDOS = int(os.getenv("DRENAR_MAX_SEGUNDOS", "600"))
+
+# Pipeline busca/gravação: páginas buscadas aguardando gravação
+PIPELINE_TAMANHO_FILA = int(os.getenv("PIPELINE_TAMANHO_FILA", "2"))
+
+# Quantidade de linhas por INSERT multi-linha (executemany)
+LOTE_INSERT_TAMANHO = int(os.getenv("LOTE_INSERT_TAMANHO", "500"))
+
+# Cliente HTTP compartilhado com a API MiX
+MIX_API_URL = os.getenv("MIX_API_URL", "https://integrate.us.mixtelematics.com")
+HTTP_POOL_TAMANHO = int(os.getenv("HTTP_POOL_TAMANHO", "10"))
+HTTP_TIMEOUT_CONEXAO = float(os.getenv("HTTP_TIMEOUT_CONEXAO", "10"))
+HTTP_TIMEOUT_LEITURA = float(os.getenv("HTTP_TIMEOUT_LEITURA", "60"))
+
+# Cache em disco dos cadastros (assets, drivers, tipos de eventos, licenças)
+HTTP_CACHE = os.getenv("HTTP_CACHE", "1").lower() in ("1", "true", "sim")
+HTTP_CACHE_PASTA = os.getenv("HTTP_CACHE_PASTA", "cache_http")
+HTTP_CACHE_TTL_SEGUNDOS = float(os.getenv("HTTP_CACHE_TTL_SEGUNDOS", "3600"))
+HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+
+# Cota da API MiX (token bucket) e política de novas tentativas
+MIX_LIMITE_POR_MINUTO = int(os.getenv("MIX_LIMITE_POR_MINUTO", "20"))
+MIX_LIMITE_POR_HORA = int(os.getenv("MIX_LIMITE_POR_HORA", "500"))
+HTTP_MAX_TENTATIVAS = int(os.getenv("HTTP_MAX_TENTATIVAS", "5"))
+BACKOFF_BASE_SEGUNDOS = float(os.getenv("BACKOFF_BASE_SEGUNDOS", "2"))
+BACKOFF_MAX_SEGUNDOS = float(os.getenv("BACKOFF_MAX_SEGUNDOS", "120"))
+
+# Quantos importadores podem rodar ao mesmo tempo
+IMPORTADORES_PARALELISMO = int(os.getenv("IMPORTADORES_PARALELISMO", "3"))
+
+# Lê as páginas grandes da MiX item a item, sem montar a lista inteira em memória
+JSON_STREAMING = os.getenv("JSON_STREAMING", "0").lower() in ("1", "true", "sim")
+
+# Pool de conexões MySQL compartilhado pelos importadores (0 desliga o pool)
+DB_POOL_TAMANHO = int(os.getenv("DB_POOL_TAMANHO", "5"))
+DB_POOL_ESPERA_SEGUNDOS = float(os.getenv("DB_POOL_ESPERA_SEGUNDOS", "30"))
+DB_RECONEXAO_TENTATIVAS = int(os.getenv("DB_RECONEXAO_TENTATIVAS", "3"))
+
+# Intervalos (segundos) de cada endpoint no daemon de sincronização
+INTERVALOS_SYNC = {
+    "eventos": int(os.getenv("INTERVALO_EVENTOS_SEGUNDOS", "900")),
+    "trips": int(os.getenv("INTERVALO_TRIPS_SEGUNDOS", "900")),
+    "subtrips": int(os.getenv("INTERVALO_SUBTRIPS_SEGUNDOS", "3600")),
+    "assets": int(os.getenv("INTERVALO_ASSETS_SEGUNDOS", "86400")),
+    "drivers": int(os.getenv("INTERVALO_DRIVERS_SEGUNDOS", "86400")),
+    "tipos_eventos": int(os.getenv("INTERVALO_TIPOS_EVENTOS_SEGUNDOS", "86400")),
+}
+
+# Intervalo adaptativo (eventos/trips): volta na hora se houver backlog e
+# recua até o teto quando as páginas chegam quase vazias
+ADAPTATIVO_MIN_SEGUNDOS = int(os.getenv("ADAPTATIVO_MIN_SEGUNDOS", "30"))
+ADAPTATIVO_MAX_SEGUNDOS = int(os.getenv("ADAPTATIVO_MAX_SEGUNDOS", "1800"))
+ADAPTATIVO_FATOR = float(os.getenv("ADAPTATIVO_FATOR", "2"))
+ADAPTATIVO_LIMIAR_CHEIO = float(os.getenv("ADAPTATIVO_LIMIAR_CHEIO", "0.9"))
+ADAPTATIVO_LIMIAR_VAZIO = float(os.getenv("ADAPTATIVO_LIMIAR_VAZIO", "0.1"))
+ADAPTATIVOS = tuple(filter(None, os.getenv("ADAPTATIVOS", "eventos,trips").split(",")))
+
+# Guarda os since_tokens na tabela since_tokens, na mesma transação dos dados
+# (o arquivo em since_tokens/ continua como espelho/fallback)
+CHECKPOINT_NO_BANCO = os.getenv("CHECKPOINT_NO_BANCO", "1").lower() in ("1", "true", "sim")
+
+# Eventos (Tr) numa única tabela eventos_tr particionada por mês, com views
+# no lugar das tabelas tr_* (rode migrar_eventos_tr.py antes de ligar)
+EVENTOS_TABELA_UNICA = os.getenv("EVENTOS_TABELA_UNICA", "0").lower() in ("1", "true", "sim")
+EVENTOS_PARTICOES_A_FRENTE = int(os.getenv("EVENTOS_PARTICOES_A_FRENTE", "3"))
+
+# Registro dos tipos de evento (Tr), lido da tabela tipos_eventos
+REGISTRO_EVENTOS_ARQUIVO = os.getenv("REGISTRO_EVENTOS_ARQUIVO", "tipos_eventos_tr.json")
+REGISTRO_EVENTOS_RECARREGAR_SEGUNDOS = int(os.getenv("REGISTRO_EVENTOS_RECARREGAR_SEGUNDOS", "3600"))
+
+# Arquivo bruto das páginas de eventos/trips (JSONL compactado) para reprocessar
+ARQUIVO_BRUTO = os.getenv("ARQUIVO_BRUTO", "1").lower() in ("1", "true", "sim")
+ARQUIVO_BRUTO_PASTA = os.getenv("ARQUIVO_BRUTO_PASTA", "arquivo_bruto")
+ARQUIVO_BRUTO_COMPRESSAO = os.getenv("ARQUIVO_BRUTO_COMPRESSAO", "gzip").lower()
+ARQUIVO_BRUTO_MAX_MB = float(os.getenv("ARQUIVO_BRUTO_MAX_MB", "64"))
+ARQUIVO_BRUTO_RETER_DIAS = int(os.getenv("ARQUIVO_BRUTO_RETER_DIAS", "7"))
+
+# Spool em disco para páginas buscadas enquanto o MySQL está fora
+SPOOL = os.getenv("SPOOL", "1").lower() in ("1", "true", "sim")
+SPOOL_PASTA = os.getenv("SPOOL_PASTA", "spool")
+SPOOL_INTERVALO_SEGUNDOS = float(os.getenv("SPOOL_INTERVALO_SEGUNDOS", "30"))
+# Falhas de gravação seguidas de um segmento antes de ir para a quarentena
+SPOOL_MAX_TENTATIVAS = int(os.getenv("SPOOL_MAX_TENTATIVAS", "5"))
+
+# Carga em massa (TSV + LOAD DATA LOCAL INFILE) a partir deste número de linhas
+# por gravação (ex.: 20000); 0 (padrão) desliga e mantém allow_local_infile
+# desligado no conector. Exige local_infile=ON no servidor MySQL
+CARGA_EM_MASSA_MIN_LINHAS = int(os.getenv("CARGA_EM_MASSA_MIN_LINHAS", "0"))
+CARGA_EM_MASSA_BLOCO = int(os.getenv("CARGA_EM_MASSA_BLOCO", "200000"))
+if CARGA_EM_MASSA_MIN_LINHAS > 0:
+    DB_CONFIG["allow_local_infile"] = True
+
+# Backfill histórico em fatias paralelas
+BACKFILL_FATIAS = int(os.getenv("BACKFILL_FATIAS", "7"))
+BACKFILL_PARALELISMO = int(os.getenv("BACKFILL_PARALELISMO", "3"))
+
+# Assets/drivers: grava só linhas novas ou alteradas (hash do conteúdo em hashes_entidades)
+DETECTAR_MUDANCAS = os.getenv("DETECTAR_MUDANCAS", "1").lower() in ("1", "true", "sim")
+
+# Métricas Prometheus do daemon: endpoint HTTP (/metrics) e/ou arquivo .prom
+# para o textfile collector do node_exporter (0 / vazio desliga)
+METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+METRICAS_ARQUIVO = os.getenv("METRICAS_ARQUIVO", "")
+METRICAS_INTERVALO_SEGUNDOS = float(os.getenv("METRICAS_INTERVALO_SEGUNDOS", "15"))
@@ -0,0 +1,182 @@
+import functools
+import inspect
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.auth import autenticar
+from core.config import (
+    IMPORTADORES_PARALELISMO,
+    INTERVALOS_SYNC,
+    ADAPTATIVO_MIN_SEGUNDOS,
+    ADAPTATIVO_MAX_SEGUNDOS,
+    ADAPTATIVO_FATOR,
+    ADAPTATIVO_LIMIAR_CHEIO,
+    ADAPTATIVO_LIMIAR_VAZIO,
+    ADAPTATIVOS,
+)
+from core.db import conectar_banco
+from core.metricas import ExportadorMetricas, importador, registrar_execucao
+from core.pipeline import solicitar_encerramento
+from core.spool import DrenadorSpool, spool
+
+
+class IntervaloAdaptativo:
+    """Calcula o próximo intervalo a partir do resultado da última execução.
+
+    - HasMoreItems=True (backlog além do limite de páginas): roda de novo na hora;
+    - última página cheia (>= limiar_cheio): volta no intervalo mínimo;
+    - última página quase vazia (< limiar_vazio): multiplica o intervalo por
+      `fator`, até `maximo`;
+    - caso intermediário ou erro: usa o intervalo base configurado.
+    """
+
+    def __init__(self, base, minimo=ADAPTATIVO_MIN_SEGUNDOS, maximo=ADAPTATIVO_MAX_SEGUNDOS,
+                 fator=ADAPTATIVO_FATOR, limiar_cheio=ADAPTATIVO_LIMIAR_CHEIO,
+                 limiar_vazio=ADAPTATIVO_LIMIAR_VAZIO):
+        self.base = base
+        self.minimo = minimo
+        self.maximo = max(maximo, base)
+        self.fator = fator
+        self.limiar_cheio = limiar_cheio
+        self.limiar_vazio = limiar_vazio
+        self.atual = base
+
+    def proximo(self, resultado):
+        if resultado is None or getattr(resultado, "erro", True):
+            self.atual = self.base
+        elif resultado.has_more:
+            self.atual = 0
+        elif resultado.ocupacao >= self.limiar_cheio:
+            self.atual = self.minimo
+        elif resultado.ocupacao < self.limiar_vazio:
+            self.atual = min(self.maximo, max(self.atual, self.minimo) * self.fator)
+        else:
+            self.atual = self.base
+        return self.atual
+
+
+def aceita_modo_adaptativo(funcao):
+    """Só importadores de stream (eventos, trips) aceitam reiniciar_no_fim e devolvem o resultado do pipeline."""
+    try:
+        return "reiniciar_no_fim" in inspect.signature(funcao).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class TarefaSync:
+    def __init__(self, nome, funcao, intervalo, adaptativo=False):
+        self.nome = nome
+        self.funcao = funcao
+        self.intervalo = intervalo
+        self.adaptativo = IntervaloAdaptativo(intervalo) if adaptativo else None
+        self.proxima = 0.0  # roda na primeira volta
+        self.futuro = None
+
+    def em_execucao(self):
+        return self.futuro is not None and not self.futuro.done()
+
+
+class DaemonSync:
+    """Processo único que sincroniza todos os endpoints, cada um no seu intervalo.
+
+    Um endpoint nunca tem duas execuções simultâneas: se ainda estiver rodando
+    quando vencer o intervalo, a próxima execução espera ele terminar. O pool
+    MySQL e o token ficam vivos no processo entre um ciclo e outro. Endpoints em
+    ADAPTATIVOS recalculam o intervalo a cada execução (IntervaloAdaptativo). SIGTERM/SIGINT
+    param de agendar novas execuções e aguardam as que estão em andamento
+    gravarem as páginas já buscadas. Uma thread à parte drena o spool em
+    disco (core.spool) assim que o MySQL volta. Com METRICAS_PORTA ou
+    METRICAS_ARQUIVO, as métricas de core.metricas são exportadas para o Prometheus.
+    """
+
+    def __init__(self, importadores, intervalos=INTERVALOS_SYNC, paralelismo=IMPORTADORES_PARALELISMO):
+        self.tarefas = []
+        for nome in ADAPTATIVOS:
+            if nome not in importadores:
+                print(f"⚠️ ADAPTATIVOS: importador desconhecido '{nome}', ignorado.")
+        for nome, funcao in importadores.items():
+            if intervalos.get(nome, 0) <= 0:
+                continue
+            adaptativo = nome in ADAPTATIVOS
+            if adaptativo and not aceita_modo_adaptativo(funcao):
+                print(f"⚠️ ADAPTATIVOS: '{nome}' não segue um stream com since_token "
+                      "(sem reiniciar_no_fim); usando intervalo fixo.")
+                adaptativo = False
+            if adaptativo:
+                # Polling curto só faz sentido seguindo o stream, sem voltar 24h no fim dos dados
+                funcao = functools.partial(funcao, reiniciar_no_fim=False)
+            self.tarefas.append(TarefaSync(nome, funcao, intervalos[nome], adaptativo))
+        self.paralelismo = paralelismo
+        self.parar = threading.Event()
+        self.acordar = threading.Event()
+        self.drenador = DrenadorSpool(spool) if spool.ativo else None
+        self.exportador = ExportadorMetricas()
+
+    def _executar(self, tarefa):
+        inicio = time.perf_counter()
+        print(f"⏰ [{tarefa.nome}] Iniciando importação...")
+        resultado = None
+        sucesso = False
+        with importador(tarefa.nome):
+            try:
+                resultado = tarefa.funcao()
+                sucesso = not getattr(resultado, "erro", False)
+                print(f"✅ [{tarefa.nome}] Concluído em {time.perf_counter() - inicio:.1f}s")
+            except Exception as e:
+                print(f"❌ [{tarefa.nome}] Erro na importação: {e}")
+            registrar_execucao(time.perf_counter() - inicio, sucesso)
+
+        if tarefa.adaptativo:
+            intervalo = tarefa.adaptativo.proximo(resultado)
+            tarefa.proxima = time.monotonic() + intervalo
+            print(f"⏭️ [{tarefa.nome}] Próxima execução em {intervalo:.0f}s")
+
+    def _aquecer(self):
+        try:
+            autenticar()
+            conectar_banco().close()
+        except Exception as e:
+            print(f"⚠️ Falha ao aquecer token/pool: {e}")
+
+    def encerrar(self, signum=None, frame=None):
+        if not self.parar.is_set():
+            print("\n🛑 Encerramento solicitado. Aguardando importações em andamento...")
+        self.parar.set()
+        self.acordar.set()
+        if self.drenador:
+            self.drenador.encerrar()
+        solicitar_encerramento()
+
+    def instalar_sinais(self):
+        signal.signal(signal.SIGTERM, self.encerrar)
+        signal.signal(signal.SIGINT, self.encerrar)
+
+    def executar(self):
+        self._aquecer()
+        if self.drenador:
+            self.drenador.start()
+        if self.exportador.ativo:
+            self.exportador.iniciar()
+        for tarefa in self.tarefas:
+            print(f"🔁 {tarefa.nome}: a cada {tarefa.intervalo}s")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.paralelismo), thread_name_prefix="sync") as pool:
+            while not self.parar.is_set():
+                agora = time.monotonic()
+                for tarefa in self.tarefas:
+                    if tarefa.em_execucao() or agora < tarefa.proxima:
+                        continue
+                    tarefa.proxima = agora + tarefa.intervalo
+                    tarefa.futuro = pool.submit(self._executar, tarefa)
+                    # Reavalia a agenda assim que a execução terminar
+                    tarefa.futuro.add_done_callback(lambda _: self.acordar.set())
+
+                pendentes = [t.proxima for t in self.tarefas if not t.em_execucao()]
+                proxima = min(pendentes, default=agora + 60)
+                self.acordar.wait(max(0.0, proxima - time.monotonic()))
+                self.acordar.clear()
+
+        if self.exportador.ativo:
+            self.exportador.encerrar()
+        print("👋 Daemon finalizado.")
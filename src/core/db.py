@@ -1,5 +1,75 @@
+import threading
+import time
 import mysql.connector
-from core.config import DB_CONFIG
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from core.config import (
+    DB_CONFIG,
+    DB_POOL_TAMANHO,
+    DB_POOL_ESPERA_SEGUNDOS,
+    DB_RECONEXAO_TENTATIVAS,
+)
+
+# Usa a extensão C do conector quando ela estiver instalada
+USAR_EXTENSAO_C = getattr(mysql.connector, "HAVE_CEXT", False)
+
+_pool = None
+_lock = threading.Lock()
+
+
+def obter_pool():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="importador_mix",
+                    pool_size=DB_POOL_TAMANHO,
+                    pool_reset_session=True,
+                    use_pure=not USAR_EXTENSAO_C,
+                    **DB_CONFIG
+                )
+    return _pool
+
 
 def conectar_banco():
-    return mysql.connector.connect(**DB_CONFIG)
+    """Retorna uma conexão do pool compartilhado.
+
+    A conexão é testada (ping com reconexão) antes de ser entregue, e
+    `conn.close()` devolve ao pool em vez de encerrar. Se o pool estiver
+    esgotado, aguarda até DB_POOL_ESPERA_SEGUNDOS por uma conexão livre.
+    """
+    if DB_POOL_TAMANHO <= 0:
+        return mysql.connector.connect(use_pure=not USAR_EXTENSAO_C, **DB_CONFIG)
+
+    pool = obter_pool()
+    limite = time.monotonic() + DB_POOL_ESPERA_SEGUNDOS
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= limite:
+                raise
+            time.sleep(0.1)
+
+    try:
+        # Conexões ociosas podem ter sido derrubadas pelo wait_timeout do MySQL
+        conn.ping(reconnect=True, attempts=DB_RECONEXAO_TENTATIVAS, delay=1)
+    except mysql.connector.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def gravar_direto(gravar_banco, itens, novo_token=None):
+    """Grava com `gravar_banco(conn, itens, novo_token)` numa conexão própria, sem spool.
+
+    Para backfill e reprocessamento: com o MySQL fora o erro sobe para quem
+    chamou, em vez de a página ir quieta para o spool.
+    """
+    conn = conectar_banco()
+    try:
+        return gravar_banco(conn, itens, novo_token)
+    finally:
+        conn.close()
@@ -0,0 +1,58 @@
+import time
+from core.config import LOTE_INSERT_TAMANHO
+from core.metricas import metricas
+
+
+def inserir_em_lotes(cursor, sql, linhas, tamanho_lote=None, identificar=None, prefixo="[DB]"):
+    """Grava `linhas` com executemany em blocos de `tamanho_lote`.
+
+    O conector transforma o executemany de um INSERT em um único INSERT
+    multi-linha por bloco. Se o bloco falhar, as linhas dele são regravadas
+    uma a uma para que o erro seja reportado por linha.
+    Retorna (gravadas, falhas, segundos).
+    """
+    tamanho_lote = tamanho_lote or LOTE_INSERT_TAMANHO
+    inicio = time.perf_counter()
+    gravadas, falhas, ignoradas = 0, 0, 0
+    # No INSERT IGNORE, rowcount < linhas do bloco = duplicadas descartadas pelo MySQL
+    insert_ignore = sql.lstrip().upper().startswith("INSERT IGNORE")
+
+    for i in range(0, len(linhas), tamanho_lote):
+        bloco = linhas[i:i + tamanho_lote]
+        try:
+            cursor.executemany(sql, bloco)
+            gravadas += len(bloco)
+            if insert_ignore:
+                ignoradas += linhas_duplicadas(cursor, len(bloco))
+            continue
+        except Exception as exc:
+            print(f"{prefixo} ⚠️ Falha no lote de {len(bloco)} linhas ({exc}). Gravando linha a linha...")
+
+        for linha in bloco:
+            try:
+                cursor.execute(sql, linha)
+                gravadas += 1
+            except Exception as e:
+                falhas += 1
+                descricao = identificar(linha) if identificar else linha
+                print(f"{prefixo} ⚠️ Erro ao inserir {descricao}: {e}")
+
+    segundos = time.perf_counter() - inicio
+    if linhas:
+        metricas.observar("mix_gravacao_segundos", segundos)
+        metricas.linhas(inseridas=gravadas - ignoradas, ignoradas=ignoradas, falhas=falhas)
+    return gravadas, falhas, segundos
+
+
+def linhas_duplicadas(cursor, enviadas):
+    """Linhas descartadas por um INSERT IGNORE (enviadas - rowcount); 0 se o cursor não informar."""
+    afetadas = getattr(cursor, "rowcount", -1)
+    if not isinstance(afetadas, int) or afetadas < 0:
+        return 0
+    return max(0, enviadas - afetadas)
+
+
+def formatar_vazao(linhas, segundos):
+    if segundos <= 0:
+        return "∞ linhas/s"
+    return f"{linhas / segundos:.0f} linhas/s"
@@ -0,0 +1,237 @@
+"""Registro declarativo de colunas: JSON da MiX -> linhas das tabelas MySQL.
+
+Cada entidade declara, por coluna, o caminho no JSON (aceita campos aninhados
+como "StartPosition.Latitude" e alternativas em tupla, usando a primeira que
+não for None) e o conversor. A partir disso são gerados o extrator de linhas
+(uma função compilada, sem laço por coluna) e o SQL de gravação em lote.
+"""
+import json
+from datetime import datetime
+
+from core.metricas import metricas
+from core.utils import converter_lote_utc_para_manaus, normalizar_data
+
+
+class Coluna:
+    def __init__(self, nome, caminho=None, conversor=None, lote=None, atualizar=True):
+        """
+        nome: coluna no MySQL; caminho: chave(s) no JSON (padrão = nome);
+        conversor: função aplicada valor a valor; lote: função aplicada à
+        coluna inteira (ex.: datas vetorizadas); atualizar: entra no
+        ON DUPLICATE KEY UPDATE.
+        """
+        self.nome = nome
+        caminho = caminho or nome
+        self.caminhos = caminho if isinstance(caminho, tuple) else (caminho,)
+        self.conversor = conversor
+        self.lote = lote
+        self.atualizar = atualizar
+
+
+def _expressao_caminho(caminho):
+    partes = caminho.split(".")
+    expressao = f"_d.get({partes[0]!r})"
+    for parte in partes[1:]:
+        expressao = f"(({expressao}) or {{}}).get({parte!r})"
+    return expressao
+
+
+class Entidade:
+    def __init__(self, nome, tabela, colunas, modo="upsert"):
+        """modo: "upsert" (ON DUPLICATE KEY UPDATE) ou "ignore" (INSERT IGNORE)."""
+        self.nome = nome
+        self.tabela = tabela
+        self.colunas = colunas
+        self.modo = modo
+        self.nomes = [c.nome for c in colunas]
+        self._lotes = [(i, c.lote) for i, c in enumerate(colunas) if c.lote]
+        self._extrair = self._compilar()
+
+    def _compilar(self):
+        ambiente = {}
+        expressoes = []
+        for i, coluna in enumerate(self.colunas):
+            if coluna.lote:
+                # Preenchida depois, na conversão da coluna inteira; aqui só o valor bruto
+                expressao = _expressao_caminho(coluna.caminhos[0])
+            elif len(coluna.caminhos) == 1:
+                expressao = _expressao_caminho(coluna.caminhos[0])
+            else:
+                alternativas = ", ".join(_expressao_caminho(c) for c in coluna.caminhos)
+                expressao = f"_primeiro(({alternativas}))"
+                ambiente["_primeiro"] = _primeiro_valor
+            if coluna.conversor and not coluna.lote:
+                ambiente[f"_c{i}"] = coluna.conversor
+                expressao = f"_c{i}({expressao})"
+            expressoes.append(expressao)
+        codigo = f"def _extrair(_d):\n    return ({', '.join(expressoes)},)\n"
+        exec(compile(codigo, f"<esquema {self.nome}>", "exec"), ambiente)
+        return ambiente["_extrair"]
+
+    def extrair(self, item):
+        """Linha (tupla) de um único item, sem conversões em lote."""
+        linha = self._extrair(item)
+        if not self._lotes:
+            return linha
+        linha = list(linha)
+        for i, funcao in self._lotes:
+            linha[i] = funcao([linha[i]])[0]
+        return tuple(linha)
+
+    def extrair_lote(self, itens):
+        """Linhas de vários itens; colunas com `lote` são convertidas de uma vez."""
+        with metricas.medir("mix_transformacao_segundos", entidade=self.nome):
+            linhas = [self._extrair(item) for item in itens]
+            if not self._lotes or not linhas:
+                return linhas
+            colunas = list(zip(*linhas))
+            for i, funcao in self._lotes:
+                colunas[i] = funcao(colunas[i])
+            return list(zip(*colunas))
+
+    def sql(self, **formatos):
+        """INSERT multi-linha pronto para executemany (`formatos` preenche o nome da tabela)."""
+        tabela = self.tabela.format(**formatos)
+        colunas = ", ".join(self.nomes)
+        valores = ", ".join(["%s"] * len(self.nomes))
+        if self.modo == "ignore":
+            return f"INSERT IGNORE INTO {tabela} ({colunas}) VALUES ({valores})"
+        atualizacoes = ", ".join(f"{c.nome}=VALUES({c.nome})" for c in self.colunas if c.atualizar)
+        return f"INSERT INTO {tabela} ({colunas}) VALUES ({valores}) ON DUPLICATE KEY UPDATE {atualizacoes}"
+
+    def sql_mesclar(self, origem, **formatos):
+        """INSERT ... SELECT da tabela `origem` (staging da carga em massa) para o destino."""
+        tabela = self.tabela.format(**formatos)
+        colunas = ", ".join(self.nomes)
+        if self.modo == "ignore":
+            return f"INSERT IGNORE INTO {tabela} ({colunas}) SELECT {colunas} FROM {origem}"
+        atualizacoes = ", ".join(f"{c.nome}=VALUES({c.nome})" for c in self.colunas if c.atualizar)
+        return (f"INSERT INTO {tabela} ({colunas}) SELECT {colunas} FROM {origem} "
+                f"ON DUPLICATE KEY UPDATE {atualizacoes}")
+
+
+def _primeiro_valor(valores):
+    for valor in valores:
+        if valor is not None:
+            return valor
+    return None
+
+
+def _data_iso(valor):
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        print(f"⚠️ Formato inválido de data: {valor}")
+        return None
+
+
+def _json_ou_nulo(valor):
+    return json.dumps(valor) if valor else None
+
+
+EVENTOS_TR = Entidade("eventos_tr", "{tabela}", [
+    Coluna("AssetId"),
+    Coluna("DriverId"),
+    Coluna("EventId"),
+    Coluna("EventTypeId"),
+    Coluna("EventCategory"),
+    Coluna("StartDateTime", lote=converter_lote_utc_para_manaus),
+    Coluna("StartLatitude", ("StartLatitude", "StartPosition.Latitude")),
+    Coluna("StartLongitude", ("StartLongitude", "StartPosition.Longitude")),
+    Coluna("StartSpeedKph", ("StartSpeedKph", "StartPosition.SpeedKilometresPerHour")),
+    Coluna("StartOdometer", ("StartOdometer", "StartPosition.OdometerKilometres")),
+    Coluna("EndDateTime", lote=converter_lote_utc_para_manaus),
+    Coluna("EndLatitude", ("EndLatitude", "EndPosition.Latitude")),
+    Coluna("EndLongitude", ("EndLongitude", "EndPosition.Longitude")),
+    Coluna("EndSpeedKph", ("EndSpeedKph", "EndPosition.SpeedKilometresPerHour")),
+    Coluna("EndOdometer", ("EndOdometer", "EndPosition.OdometerKilometres")),
+    Coluna("Value"),
+    Coluna("FuelUsedLitres"),
+    Coluna("ValueType"),
+    Coluna("ValueUnits"),
+    Coluna("TotalTimeSeconds"),
+    Coluna("TotalOccurances"),
+    Coluna("SpeedLimit"),
+], modo="ignore")
+
+TRIPS = Entidade("trips", "trips", [
+    Coluna("TripId", atualizar=False),
+    Coluna("AssetId"),
+    Coluna("DistanceKilometers", atualizar=False),
+    Coluna("DriverId"),
+    Coluna("DrivingTime", atualizar=False),
+    Coluna("Duration", atualizar=False),
+    Coluna("EndEngineSeconds", atualizar=False),
+    Coluna("EndOdometerKilometers", atualizar=False),
+    Coluna("EngineSeconds", atualizar=False),
+    Coluna("FirstDepart", lote=converter_lote_utc_para_manaus, atualizar=False),
+    Coluna("FuelUsedLitres", atualizar=False),
+    Coluna("LastHalt", lote=converter_lote_utc_para_manaus, atualizar=False),
+    Coluna("MaxAccelerationKilometersPerHourPerSecond", atualizar=False),
+    Coluna("MaxDecelerationKilometersPerHourPerSecond", atualizar=False),
+    Coluna("MaxRpm", atualizar=False),
+    Coluna("MaxSpeedKilometersPerHour", atualizar=False),
+    Coluna("Notes", atualizar=False),
+    Coluna("PulseValue", atualizar=False),
+    Coluna("StandingTime", atualizar=False),
+    Coluna("StartEngineSeconds", atualizar=False),
+    Coluna("StartOdometerKilometers", atualizar=False),
+    Coluna("TripEnd", lote=converter_lote_utc_para_manaus),
+    Coluna("TripStart", lote=converter_lote_utc_para_manaus, atualizar=False),
+])
+
+# Itens de subtrips: cada SubTrip com TripId/AssetId/DriverId da trip copiados
+SUBTRIPS = Entidade("subtrips", "subtrips", [
+    Coluna("TripId", atualizar=False),
+    Coluna("AssetId", atualizar=False),
+    Coluna("DriverId", atualizar=False),
+    Coluna("SubTripStart", conversor=normalizar_data),
+    Coluna("SubTripEnd", conversor=normalizar_data),
+    Coluna("StartOdometer", "StartOdometerKilometres"),
+    Coluna("EndOdometer", "EndOdometerKilometres"),
+    Coluna("Distance", "DistanceKilometres"),
+    Coluna("FuelUsed", "FuelUsedLitres"),
+    Coluna("StartLatitude", "StartPosition.Latitude"),
+    Coluna("StartLongitude", "StartPosition.Longitude"),
+    Coluna("EndLatitude", "EndPosition.Latitude"),
+    Coluna("EndLongitude", "EndPosition.Longitude"),
+])
+
+DRIVERS = Entidade("drivers", "drivers", [
+    Coluna("DriverId", atualizar=False),
+    Coluna("SiteId"),
+    Coluna("Name"),
+    Coluna("ImageUri"),
+    Coluna("FmDriverId"),
+    Coluna("EmployeeNumber"),
+    Coluna("IsSystemDriver"),
+    Coluna("MobileNumber"),
+    Coluna("Email"),
+    Coluna("ExtendedDriverId"),
+    Coluna("ExtendedDriverIdType"),
+    Coluna("Country"),
+    Coluna("AdditionalDetailFields", conversor=_json_ou_nulo),
+])
+
+ASSETS = Entidade("assets", "assets", [
+    Coluna("AssetId", atualizar=False),
+    Coluna("AssetTypeId", atualizar=False),
+    *[Coluna(nome) for nome in (
+        "Description", "IsConnectedTrailer", "RegistrationNumber", "SiteId", "FuelType",
+        "FuelTankCapacity", "TargetFuelConsumption", "TargetFuelConsumptionUnits",
+        "TargetHourlyFuelConsumption", "TargetHourlyFuelConsumptionUnits", "FleetNumber",
+        "WltpMaxRangeKm", "BatteryCapacitykWh", "UsableBatteryCapacitykWh", "Make", "Model",
+        "Year", "VinNumber", "SerialNumber", "AempEquipmentId", "EngineNumber",
+        "DefaultDriverId", "FmVehicleId", "AdditionalMobileDevice", "Notes", "Icon",
+        "IconColour", "Colour", "AssetImage", "IsDefaultImage", "AssetImageUrl",
+        "UserState", "CreatedBy",
+    )],
+    Coluna("CreatedDate", conversor=_data_iso),
+    Coluna("Odometer"),
+    Coluna("EngineHours"),
+    Coluna("Country"),
+])
+
+ESQUEMAS = {entidade.nome: entidade for entidade in (EVENTOS_TR, TRIPS, SUBTRIPS, DRIVERS, ASSETS)}
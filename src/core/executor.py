@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.auth import autenticar
+from core.config import IMPORTADORES_PARALELISMO
+from core.metricas import importador, registrar_execucao
+
+
+def _executar(nome, funcao):
+    inicio = time.perf_counter()
+    with importador(nome):
+        try:
+            resultado = funcao()
+            sucesso, erro = True, None
+        except Exception as exc:
+            resultado, sucesso, erro = None, False, exc
+        # Importador que devolve um resultado com erro=True (pipeline interrompido) também falhou
+        sucesso = sucesso and not getattr(resultado, "erro", False)
+        segundos = time.perf_counter() - inicio
+        registrar_execucao(segundos, sucesso)
+    return nome, sucesso, segundos, erro
+
+
+def executar_importadores(importadores, paralelismo=IMPORTADORES_PARALELISMO):
+    """Roda os importadores independentes em paralelo num pool de threads.
+
+    `importadores` é um dict nome -> função sem argumentos. O token é obtido uma
+    vez antes de disparar as threads e fica no cache de core.auth para todas.
+    Retorna uma lista (nome, sucesso, segundos, exceção) na ordem de término.
+    """
+    autenticar()
+    inicio = time.perf_counter()
+    resultados = []
+
+    with ThreadPoolExecutor(max_workers=max(1, paralelismo), thread_name_prefix="importador") as pool:
+        futuros = [pool.submit(_executar, nome, funcao) for nome, funcao in importadores.items()]
+        for futuro in as_completed(futuros):
+            nome, sucesso, segundos, erro = futuro.result()
+            if erro:
+                print(f"❌ [{nome}] Erro na importação: {erro}")
+            resultados.append((nome, sucesso, segundos, erro))
+
+    total = time.perf_counter() - inicio
+    print("\n⏱️ Resumo da execução")
+    for nome, sucesso, segundos, _ in resultados:
+        status = "✅" if sucesso else "❌"
+        print(f"  {status} {nome:<15} {segundos:8.1f}s")
+    print(f"  Total (paralelismo={paralelismo}): {total:.1f}s | Soma sequencial: {sum(r[2] for r in resultados):.1f}s")
+    return resultados
@@ -1,15 +1,34 @@
 import os
-import requests
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
+from core import cliente_mix
+from core.arquivo_bruto import arquivar_pagina
 from core.auth import autenticar
-from core.db import conectar_banco
+from core.config import (
+    DRENAR_MAX_PAGINAS,
+    DRENAR_MAX_SEGUNDOS,
+    JSON_STREAMING,
+    LOTE_INSERT_TAMANHO,
+    EVENTOS_TABELA_UNICA,
+)
+from core.carga_massa import gravar_linhas, tamanho_bloco
+from core.db_utils import formatar_vazao
+from core.json_stream import iterar_itens
+from core.metricas import metricas
+from core.esquema import ESQUEMAS
+from core.pipeline import executar_pipeline
+from core.registro_eventos import registro_eventos
+from core.spool import spool
+from core.tabela_eventos import TABELA_UNICA, garantir_particoes
 from core.since_token import (
     gerar_token_relativo_info,
     traduzir_token as traduzir_token_fmt,
     token_para_datetime,
     validar_idade_token,
     formatar_timedelta,
+    ler_checkpoint,
+    salvar_checkpoint,
+    gravar_token_arquivo,
 )
 
 load_dotenv()
@@ -18,46 +37,28 @@ BASE_URL = os.getenv("MIX_API_URL")
 ORGANISATION_ID = os.getenv("MIX_ORGANISATION_ID")
 QUANTITY = 1000
 SINCE_TOKEN_DIR = "since_tokens"
+CHECKPOINT_TIPO = "eventos"
 FUSO_MANAUS = timezone(timedelta(hours=-4))
-
-EVENTOS_TR = {
-    -614457561876096876: ("tr_aceleracao_brusca", "Aceleração Brusca"),
-    3296322604872944138: ("tr_curva_brusca", "Curva Brusca"),
-    -1988381093544824498: ("tr_embreagem_acionada_indevida", "Embreagem Indevida"),
-    2164520525956490666: ("tr_excesso_rpm_parado", "Excesso RPM Parado"),
-    74735825877637374: ("tr_excesso_velocidade_20km", "Excesso Velocidade 20km"),
-    -6248653914463313400: ("tr_excesso_velocidade_30km", "Excesso Velocidade 30km"),
-    6474504604434952727: ("tr_excesso_velocidade_40km_1", "Excesso Velocidade 40km 1"),
-    -1992910974424714295: ("tr_excesso_velocidade_40km_2", "Excesso Velocidade 40km 2"),
-    5511057473630489154: ("tr_excesso_velocidade_50km", "Excesso Velocidade 50km"),
-    6580201539568389304: ("tr_excesso_velocidade_55km_1", "Excesso Velocidade 55km 1"),
-    -9050647299058098294: ("tr_excesso_velocidade_55km_2", "Excesso Velocidade 55km 2"),
-    908787025131282024: ("tr_excesso_velocidade_60km", "Excesso Velocidade 60km"),
-    -6437542951044419628: ("tr_fora_faixa_verde", "Fora da Faixa Verde"),
-    337658916843834225: ("tr_freada_brusca", "Freada Brusca"),
-    -1150311268842644462: ("tr_freada_brusca_grave", "Freada Brusca Grave"),
-    6314588935029952465: ("tr_inercia_aproveitada", "Inércia Aproveitada"),
-    2561992611692992861: ("tr_marcha_lenta", "Marcha Lenta"),
-    -154632669554799975: ("tr_marcha_lenta_5min", "Marcha Lenta 5min"),
-    8889515098300962737: ("tr_excesso_rotacao", "Excesso de Rotação"),
-    -4465594527070247088: ("tr_batendo_transmissao", "Batendo Transmissão")
-}
+ESQUEMA_EVENTO = ESQUEMAS["eventos_tr"]
 
 def since_token_path():
     os.makedirs(SINCE_TOKEN_DIR, exist_ok=True)
     return os.path.join(SINCE_TOKEN_DIR, "since_token_eventos.txt")
 
 def carregar_since_token():
-    path = since_token_path()
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return f.read().strip()
+    # Páginas no spool já foram buscadas: segue do token da mais recente
+    token = spool.ultimo_token(CHECKPOINT_TIPO)
+    if token:
+        print(f"[EVENTOS] 📌 SinceToken carregado do spool ({spool.pendentes(CHECKPOINT_TIPO)} página(s) pendente(s)).")
+        return token
+    token, origem = ler_checkpoint(CHECKPOINT_TIPO, since_token_path())
+    if token:
+        print(f"[EVENTOS] 📌 SinceToken carregado do {origem}.")
+        return token
     return gerar_since_token()
 
 def salvar_since_token(token):
-    path = since_token_path()
-    with open(path, "w") as f:
-        f.write(token)
+    salvar_checkpoint(CHECKPOINT_TIPO, token, since_token_path())
 
 def gerar_since_token(horas_atras=24):
     token, dt_manaus, dt_utc = gerar_token_relativo_info(horas_atras)
@@ -101,13 +102,11 @@ def _format_token_debug(token):
         return token
     return f"{token[:6]}...{token[-4:]} (len={len(token)})"
 
-def buscar_eventos(token, since_token):
-    headers = {"Authorization": f"Bearer {token}"}
-    url = f"{BASE_URL}/api/events/groups/createdsince/organisation/{ORGANISATION_ID}/sincetoken/{since_token}/quantity/{QUANTITY}"
+def buscar_eventos(since_token, stream=False):
+    url = f"/api/events/groups/createdsince/organisation/{ORGANISATION_ID}/sincetoken/{since_token}/quantity/{QUANTITY}"
     # print(f"[EVENTOS][DEBUG] URL requisitada: {url}")
-    # print(f"[EVENTOS][DEBUG] Header Authorization: Bearer {_format_token_debug(token)}")
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = cliente_mix.get(url, stream=stream)
     except Exception as exc:
         # print(f"[EVENTOS][DEBUG] Falha de requisição: {exc}")
         raise
@@ -116,121 +115,195 @@ def buscar_eventos(token, since_token):
     #     print(f"[EVENTOS][DEBUG] Corpo de erro: {response.text}")
     return response
 
-def importar_eventos_lote():
-    print("\n######## EVENTOS ########")
-    # print(f"[EVENTOS][DEBUG] BASE_URL={BASE_URL} | ORGANISATION_ID={ORGANISATION_ID} | QUANTITY={QUANTITY}")
-    # print(f"[EVENTOS][DEBUG] SINCE_TOKEN_DIR={SINCE_TOKEN_DIR} (abs: {os.path.abspath(SINCE_TOKEN_DIR)})")
-    token = autenticar()
-    # print(f"[EVENTOS][DEBUG] Token recebido: {_format_token_debug(token)}")
-    since_token = carregar_since_token()
-    since_token = garantir_token_na_janela(since_token)
-    print(f"[EVENTOS] SinceToken em uso: {since_token}")
-    dt_utc = token_para_datetime(since_token)
-    if dt_utc:
-        dt_manaus = dt_utc.astimezone(FUSO_MANAUS)
-        print(f"[EVENTOS] • UTC/Londres (+0): {dt_utc.strftime('%d/%m/%Y %H:%M:%S')}")
-        print(f"[EVENTOS] • Manaus (-4): {dt_manaus.strftime('%d/%m/%Y %H:%M:%S')}")
-    else:
-        print("[EVENTOS] • Não foi possível interpretar o since_token.")
-    print("--------------------------------------------------")
+def buscar_pagina_eventos(since_token):
+    """Busca uma página de eventos.
 
-    response = buscar_eventos(token, since_token)
+    Retorna (eventos, novo_token, has_more) ou None se a página não pôde ser lida.
+    Com JSON_STREAMING, `eventos` é um iterador lido direto do corpo da resposta.
+    """
+    response = buscar_eventos(since_token, stream=JSON_STREAMING)
 
     if response.status_code not in (200, 206):
         print(f"[EVENTOS] ❌ Erro {response.status_code} ao buscar eventos.")
-        return
+        return None
+
+    novo_token = response.headers.get("GetSinceToken")
+    has_more = response.headers.get("HasMoreItems", "False") == "True"
+
+    if JSON_STREAMING:
+        print(f"[EVENTOS] 📥 Recebendo eventos em streaming | HasMoreItems: {has_more}")
+        itens = iterar_itens(response, ("Events",))
+        return arquivar_pagina(CHECKPOINT_TIPO, since_token, response, itens, novo_token, has_more), novo_token, has_more
 
     try:
-        eventos = response.json()
+        with metricas.medir("mix_decodificacao_segundos"):
+            eventos = response.json()
         if not isinstance(eventos, list):
             eventos = eventos.get("Events", [])
         if not isinstance(eventos, list):
             print("[EVENTOS] ⚠️ Resposta inesperada.")
             # print(f"[EVENTOS][DEBUG] Corpo bruto: {response.text}")
-            return
+            return None
     except Exception as exc:
         print("[EVENTOS] ❌ Erro ao interpretar resposta.")
         # print(f"[EVENTOS][DEBUG] Exceção: {exc}")
         # print(f"[EVENTOS][DEBUG] Corpo bruto: {response.text}")
-        return
+        return None
 
     print(f"[EVENTOS] ➕ {len(eventos)} eventos recebidos")
     progresso = min(len(eventos), QUANTITY)
     percentual = (progresso / QUANTITY) * 100
     print(f"[EVENTOS] Progresso: {percentual:.1f}% do lote ({progresso}/{QUANTITY})")
+    print(f"[EVENTOS] HasMoreItems: {has_more}")
+    eventos = arquivar_pagina(CHECKPOINT_TIPO, since_token, response, eventos, novo_token, has_more)
+    return eventos, novo_token, has_more
+
+def tabela_do_evento(tipo):
+    """Tabela de destino: a tr_* do tipo ou, no modo tabela única, eventos_tr."""
+    return TABELA_UNICA if EVENTOS_TABELA_UNICA else tipo.tabela
+
+def gravar_eventos(eventos, novo_token=None):
+    """Grava os eventos (Tr) em lotes por tabela de destino.
 
-    conn = conectar_banco()
+    Aceita lista ou iterador: cada tabela é descarregada ao atingir
+    LOTE_INSERT_TAMANHO linhas, então a memória não cresce com o tamanho da página.
+    Com EVENTOS_TABELA_UNICA todos os tipos vão num único fluxo para eventos_tr.
+    O novo_token, se informado, é gravado na mesma transação dos eventos.
+    Se o MySQL estiver fora, a página vai para o spool (core.spool).
+    Retorna a quantidade de eventos lidos.
+    """
+    return spool.gravar(CHECKPOINT_TIPO, _gravar_eventos_banco, eventos, novo_token)
+
+def _gravar_eventos_banco(conn, eventos, novo_token=None):
     cursor = conn.cursor()
-    contadores = {}
-
-    for evento in eventos:
-        tipo = evento.get("EventTypeId")
-        if tipo not in EVENTOS_TR:
-            continue
-        tabela, _ = EVENTOS_TR[tipo]
-        contadores[tipo] = contadores.get(tipo, 0) + 1
-        try:
-            cursor.execute(f'''
-                INSERT IGNORE INTO {tabela} (
-                    AssetId, DriverId, EventId, EventTypeId, EventCategory,
-                    StartDateTime, StartLatitude, StartLongitude, StartSpeedKph,
-                    StartOdometer, EndDateTime, EndLatitude, EndLongitude,
-                    EndSpeedKph, EndOdometer, Value, FuelUsedLitres,
-                    ValueType, ValueUnits, TotalTimeSeconds, TotalOccurances, SpeedLimit
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
-                evento.get("AssetId"),
-                evento.get("DriverId"),
-                evento.get("EventId"),
-                evento.get("EventTypeId"),
-                evento.get("EventCategory"),
-                converter_utc_para_manaus(evento.get("StartDateTime")),
-                evento.get("StartLatitude"),
-                evento.get("StartLongitude"),
-                evento.get("StartSpeedKph"),
-                evento.get("StartOdometer"),
-                converter_utc_para_manaus(evento.get("EndDateTime")),
-                evento.get("EndLatitude"),
-                evento.get("EndLongitude"),
-                evento.get("EndSpeedKph"),
-                evento.get("EndOdometer"),
-                evento.get("Value"),
-                evento.get("FuelUsedLitres"),
-                evento.get("ValueType"),
-                evento.get("ValueUnits"),
-                evento.get("TotalTimeSeconds"),
-                evento.get("TotalOccurances"),
-                evento.get("SpeedLimit")
-            ))
-        except Exception as e:
-            print(f"[EVENTOS] ⚠️ Erro ao inserir EventId {evento.get('EventId')}: {e}")
-
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-    for tipo_id, qtd in contadores.items():
-        print(f"[EVENTOS] ▶️ {EVENTOS_TR[tipo_id][1]}: {qtd} eventos")
-
-    total_eventos = len(eventos)
-    inseridos = sum(contadores.values())
+    pendentes = {}
+    por_tipo = {}
+    resumo = {}
+    total_eventos = 0
+    falhas = 0
+
+    def descarregar(tabela):
+        nonlocal falhas
+        lote = pendentes.pop(tabela, None)
+        if not lote:
+            return
+        linhas = ESQUEMA_EVENTO.extrair_lote(lote)
+        gravadas, falhas_lote, segundos = gravar_linhas(
+            cursor,
+            ESQUEMA_EVENTO,
+            linhas,
+            identificar=lambda linha: f"EventId {linha[2]}",
+            prefixo="[EVENTOS]",
+            tabela=tabela,
+        )
+        falhas += falhas_lote
+        acumulado = resumo.setdefault(tabela, [0, 0, 0.0])
+        acumulado[0] += len(linhas)
+        acumulado[1] += gravadas
+        acumulado[2] += segundos
+
+    # Lotes grandes (backfill/reprocessamento) vão inteiros para a carga em massa
+    limite_lote = tamanho_bloco(eventos, LOTE_INSERT_TAMANHO)
+
+    try:
+        # Mesmo registro do início ao fim da página; DDL antes de qualquer linha
+        tipos = registro_eventos.tipos()
+        if EVENTOS_TABELA_UNICA:
+            garantir_particoes(cursor)
+        registro_eventos.garantir_tabelas(cursor, tipos)
+        for evento in eventos:
+            total_eventos += 1
+            tipo = tipos.get(evento.get("EventTypeId"))
+            if tipo is None:
+                continue
+            por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+            tabela = tabela_do_evento(tipo)
+            lote = pendentes.setdefault(tabela, [])
+            lote.append(evento)
+            if len(lote) >= limite_lote:
+                descarregar(tabela)
+        for tabela in list(pendentes):
+            descarregar(tabela)
+        if novo_token:
+            salvar_checkpoint(CHECKPOINT_TIPO, novo_token, cursor=cursor)
+        conn.commit()
+    finally:
+        cursor.close()
+
+    for tipo, qtd in por_tipo.items():
+        print(f"[EVENTOS] ▶️ {tipo.nome}: {qtd} eventos -> {tabela_do_evento(tipo)}")
+    for tabela, (_, gravadas, segundos) in resumo.items():
+        print(f"[EVENTOS] 💾 {tabela}: {gravadas} linhas ({formatar_vazao(gravadas, segundos)})")
+
+    inseridos = sum(por_tipo.values())
     ignorados = total_eventos - inseridos
+    # Tipos fora do registro (Tr); gravadas/falhas já contam em core.db_utils
+    metricas.linhas(ignoradas=ignorados)
 
-    print(f"[EVENTOS] ✅ Incluídos: {inseridos} | Ignorados: {ignorados}")
+    print(f"[EVENTOS] ✅ Incluídos: {inseridos} | Ignorados: {ignorados} | Falhas: {falhas}")
+    return total_eventos
 
-    novo_token = response.headers.get("GetSinceToken")
-    proximo_legivel = None
-    has_more = response.headers.get("HasMoreItems", "False") == "True"
-    print(f"[EVENTOS] HasMoreItems: {has_more}")
+def importar_eventos_lote(drenar=True, max_paginas=None, max_segundos=None, reiniciar_no_fim=True):
+    """Importa eventos seguindo o GetSinceToken.
+
+    Com drenar=True continua buscando páginas enquanto HasMoreItems for True,
+    respeitando max_paginas e max_segundos (padrões em core.config).
+    A busca da próxima página acontece em paralelo à gravação da atual
+    (core.pipeline) e o since_token é salvo ao final de cada página gravada.
+    Com reiniciar_no_fim=False o token do fim dos dados é mantido em vez de
+    voltar 24h (usado pelo daemon no modo adaptativo).
+    """
+    print("\n######## EVENTOS ########")
+    # print(f"[EVENTOS][DEBUG] BASE_URL={BASE_URL} | ORGANISATION_ID={ORGANISATION_ID} | QUANTITY={QUANTITY}")
+    # print(f"[EVENTOS][DEBUG] SINCE_TOKEN_DIR={SINCE_TOKEN_DIR} (abs: {os.path.abspath(SINCE_TOKEN_DIR)})")
+    if max_paginas is None:
+        max_paginas = DRENAR_MAX_PAGINAS if drenar else 1
+    if max_segundos is None:
+        max_segundos = DRENAR_MAX_SEGUNDOS
+
+    # Aquece o cache do token: credencial inválida falha aqui, antes do pipeline
+    autenticar()
+    spool.drenar(CHECKPOINT_TIPO)
+    since_token = carregar_since_token()
+    since_token = garantir_token_na_janela(since_token)
+    print(f"[EVENTOS] SinceToken em uso: {since_token}")
+    dt_utc = token_para_datetime(since_token)
+    if dt_utc:
+        dt_manaus = dt_utc.astimezone(FUSO_MANAUS)
+        print(f"[EVENTOS] • UTC/Londres (+0): {dt_utc.strftime('%d/%m/%Y %H:%M:%S')}")
+        print(f"[EVENTOS] • Manaus (-4): {dt_manaus.strftime('%d/%m/%Y %H:%M:%S')}")
+    else:
+        print("[EVENTOS] • Não foi possível interpretar o since_token.")
+    print("--------------------------------------------------")
+
+    resultado = executar_pipeline(
+        buscar=buscar_pagina_eventos,
+        gravar=gravar_eventos,
+        salvar_token=lambda token: gravar_token_arquivo(since_token_path(), token),
+        since_token=since_token,
+        max_paginas=max_paginas,
+        max_segundos=max_segundos,
+        tamanho_pagina=QUANTITY,
+        prefixo="[EVENTOS]",
+    )
+    print(f"[EVENTOS] 📚 {resultado.paginas} página(s) em {resultado.segundos:.1f}s")
+    if resultado.erro:
+        return resultado
 
-    if novo_token:
-        salvar_since_token(novo_token)
-        proximo_legivel = traduzir_token(novo_token)
+    has_more = resultado.has_more
+    proximo_legivel = traduzir_token(resultado.ultimo_token) if resultado.ultimo_token else None
 
     if has_more:
         complemento = f" (próximo lote a partir de {proximo_legivel})" if proximo_legivel else ""
         print(f"[EVENTOS] 🔁 Ainda existem dados pendentes.{complemento}")
         print("[EVENTOS] ▶️ Rode novamente para continuar a importação.")
-    else:
+    elif reiniciar_no_fim:
         print("[EVENTOS] 🚫 Fim dos dados. Próxima execução usará token das últimas 24h.")
         salvar_since_token(gerar_since_token())
+    else:
+        print("[EVENTOS] 🚫 Fim dos dados. Próxima execução continua do último GetSinceToken.")
+
+    return resultado
+
+
+spool.registrar(CHECKPOINT_TIPO, _gravar_eventos_banco)
@@ -0,0 +1,16 @@
+from core.importador_lote import importar_eventos_lote
+from endpoints.drivers import importar_drivers
+from endpoints.assets import importar_assets
+from endpoints.trips import importar_trips
+from endpoints.subtrips import importar_subtrips
+from endpoints.tipos_eventos import importar_tipos_eventos
+
+# Nome -> função de cada importador (usado pelo terminal e pelo daemon)
+IMPORTADORES = {
+    "tipos_eventos": importar_tipos_eventos,
+    "eventos": importar_eventos_lote,
+    "drivers": importar_drivers,
+    "assets": importar_assets,
+    "trips": importar_trips,
+    "subtrips": importar_subtrips,
+}
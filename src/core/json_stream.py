@@ -0,0 +1,103 @@
+import codecs
+import json
+
+TAMANHO_CHUNK = 64 * 1024
+_ESPACOS = " \t\r\n"
+_FIM_DE_ITEM = _ESPACOS + ",]"
+
+
+class RespostaInesperada(ValueError):
+    """O corpo da resposta não é uma lista JSON (nem um objeto com a lista esperada)."""
+
+
+def _ler_chunks(response, tamanho=TAMANHO_CHUNK):
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    for chunk in response.iter_content(chunk_size=tamanho):
+        if chunk:
+            yield decoder.decode(chunk)
+    resto = decoder.decode(b"", final=True)
+    if resto:
+        yield resto
+
+
+def iterar_itens(response, chaves=()):
+    """Percorre uma lista JSON item a item direto do corpo da resposta.
+
+    Use com requisições feitas com stream=True: apenas o item atual (e o trecho
+    ainda não interpretado do corpo) fica em memória, independente do tamanho
+    da página. Se a resposta for um objeto, o corpo é lido inteiro e a lista é
+    procurada nas `chaves` informadas (ex.: "Events", "Items").
+    """
+    decoder = json.JSONDecoder()
+    chunks = _ler_chunks(response)
+    buffer = ""
+    pos = 0
+    fim_do_corpo = False
+
+    def ler_mais():
+        nonlocal buffer, pos, fim_do_corpo
+        try:
+            buffer = buffer[pos:] + next(chunks)
+            pos = 0
+            return True
+        except StopIteration:
+            fim_do_corpo = True
+            return False
+
+    # Primeiro caractere significativo decide o formato
+    while True:
+        while pos < len(buffer) and buffer[pos] in _ESPACOS:
+            pos += 1
+        if pos < len(buffer):
+            break
+        if not ler_mais():
+            raise RespostaInesperada("corpo vazio")
+
+    if buffer[pos] != "[":
+        corpo = buffer[pos:] + "".join(chunks)
+        dados = json.loads(corpo)
+        if isinstance(dados, dict):
+            for chave in chaves:
+                if isinstance(dados.get(chave), list):
+                    yield from dados[chave]
+                    return
+        raise RespostaInesperada(f"esperado lista, recebido {type(dados).__name__}")
+
+    pos += 1
+    while True:
+        # Pula espaços e vírgulas entre os itens
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _ESPACOS or buffer[pos] == ","):
+                pos += 1
+            if pos < len(buffer) or not ler_mais():
+                break
+        if pos >= len(buffer):
+            raise RespostaInesperada("lista JSON incompleta")
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, fim = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Item cortado no meio do chunk: lê mais e tenta de novo
+            if fim_do_corpo or not ler_mais():
+                raise
+            continue
+        if not fim_do_corpo and (fim == len(buffer) or buffer[fim] not in _FIM_DE_ITEM):
+            # Valor colado no fim do chunk: um número pode continuar no próximo
+            if ler_mais():
+                continue
+        pos = fim
+        yield item
+
+
+def em_blocos(itens, tamanho):
+    """Agrupa um iterável em listas de até `tamanho` elementos."""
+    bloco = []
+    for item in itens:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from core.config import (
+    MIX_LIMITE_POR_MINUTO,
+    MIX_LIMITE_POR_HORA,
+    BACKOFF_BASE_SEGUNDOS,
+    BACKOFF_MAX_SEGUNDOS,
+)
+
+
+class BaldeTokens:
+    """Token bucket: `capacidade` requisições em rajada, repostas a `taxa` por segundo."""
+
+    def __init__(self, capacidade, taxa):
+        self.capacidade = float(capacidade)
+        self.taxa = float(taxa)
+        self._tokens = float(capacidade)
+        self._atualizado = time.monotonic()
+
+    def _repor(self, agora):
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._atualizado) * self.taxa)
+        self._atualizado = agora
+
+    def espera_necessaria(self, agora):
+        self._repor(agora)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.taxa
+
+    def consumir(self):
+        self._tokens -= 1
+
+
+class LimitadorMix:
+    """Limitador compartilhado por todos os módulos que chamam a API MiX.
+
+    Combina um balde por minuto e outro por hora (cota da MiX) e permite pausar
+    todas as threads quando a API responde 429 com Retry-After.
+    """
+
+    def __init__(self, por_minuto=MIX_LIMITE_POR_MINUTO, por_hora=MIX_LIMITE_POR_HORA):
+        self._baldes = []
+        if por_minuto > 0:
+            self._baldes.append(BaldeTokens(por_minuto, por_minuto / 60.0))
+        if por_hora > 0:
+            self._baldes.append(BaldeTokens(por_hora, por_hora / 3600.0))
+        self._pausado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até existir cota para mais uma requisição."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                espera = max([self._pausado_ate - agora] + [b.espera_necessaria(agora) for b in self._baldes])
+                if espera <= 0:
+                    for balde in self._baldes:
+                        balde.consumir()
+                    return
+            time.sleep(espera)
+
+    def pausar(self, segundos):
+        with self._lock:
+            self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+
+def ler_retry_after(valor):
+    """Interpreta o cabeçalho Retry-After (segundos ou data HTTP). Retorna segundos ou None."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+
+def calcular_backoff(tentativa, base=BACKOFF_BASE_SEGUNDOS, maximo=BACKOFF_MAX_SEGUNDOS):
+    """Backoff exponencial com jitter completo: uniforme entre 0 e min(maximo, base * 2^tentativa)."""
+    return random.uniform(0, min(maximo, base * (2 ** tentativa)))
+
+
+limitador = LimitadorMix()
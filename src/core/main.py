@@ -1,22 +1,13 @@
-import time
-import schedule
-from importador_lote import importar_eventos_lote
+from core.daemon import DaemonSync
+from core.importadores import IMPORTADORES
 
-def tarefa():
-    print("⏰ Executando importação automática...")
-    try:
-        importar_eventos_lote()
-    except Exception as e:
-        print("❌ Erro na importação:", e)
+# Execute a partir de src/: python -m core.main
 
-def iniciar_agendador():
-    schedule.every(15).minutes.do(tarefa)
-    print("🔁 Agendador iniciado. Rodando a cada 15 minutos.")
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+def iniciar_daemon():
+    daemon = DaemonSync(IMPORTADORES)
+    daemon.instalar_sinais()
+    daemon.executar()
 
 if __name__ == "__main__":
     print("🚀 Iniciando aplicação...")
-    tarefa()  # executa a primeira importação logo ao iniciar
-    iniciar_agendador()
+    iniciar_daemon()
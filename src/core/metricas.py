@@ -0,0 +1,240 @@
+"""Métricas por importador no formato texto do Prometheus.
+
+Cada etapa registra aqui o próprio tempo e volume: autenticação, requisição
+HTTP, decodificação do JSON, transformação (esquema -> linhas), gravação no
+banco, linhas inseridas/ignoradas/falhas, páginas buscadas e o atraso do
+since_token (agora - token_para_datetime). O importador em execução vem de
+`importador_atual`, definido pelo daemon/executor com `importador(nome)`.
+
+O daemon expõe o texto em http://<host>:METRICAS_PORTA/metrics e/ou grava
+METRICAS_ARQUIVO (.prom) a cada METRICAS_INTERVALO_SEGUNDOS para o textfile
+collector do node_exporter.
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.config import METRICAS_PORTA, METRICAS_ARQUIVO, METRICAS_INTERVALO_SEGUNDOS
+
+importador_atual = contextvars.ContextVar("importador_atual", default="nenhum")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Nome -> (tipo, ajuda)
+DESCRICOES = {
+    "mix_auth_segundos": ("histogram", "Tempo para obter/renovar o token na identidade MiX."),
+    "mix_http_segundos": ("histogram", "Latência de cada requisição HTTP à API MiX (por tentativa)."),
+    "mix_decodificacao_segundos": ("histogram", "Tempo de decodificação do JSON das respostas."),
+    "mix_transformacao_segundos": ("histogram", "Tempo de conversão dos itens em linhas (core.esquema)."),
+    "mix_gravacao_segundos": ("histogram", "Tempo de gravação das linhas no MySQL."),
+    "mix_execucao_segundos": ("histogram", "Duração de cada execução do importador."),
+    "mix_linhas_total": ("counter", "Linhas por resultado: inseridas, ignoradas ou falhas."),
+    "mix_paginas_total": ("counter", "Páginas (respostas 200, inclusive do cache HTTP) recebidas da API MiX."),
+    "mix_execucoes_total": ("counter", "Execuções do importador por resultado."),
+    "mix_since_token_timestamp_segundos": ("gauge", "Data (epoch) do último since_token salvo."),
+    "mix_since_token_atraso_segundos": ("gauge", "Agora menos a data do último since_token salvo."),
+}
+
+
+@contextmanager
+def importador(nome):
+    """Atribui ao importador `nome` as métricas registradas dentro do bloco."""
+    token = importador_atual.set(nome)
+    try:
+        yield
+    finally:
+        importador_atual.reset(token)
+
+
+def _rotulos(rotulos):
+    rotulos.setdefault("importador", importador_atual.get())
+    return tuple(sorted((chave, str(valor)) for chave, valor in rotulos.items()))
+
+
+def _formatar_rotulos(rotulos, extra=()):
+    pares = list(rotulos) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{chave}="{_escapar(valor)}"' for chave, valor in pares) + "}"
+
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _numero(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metricas:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+        self._medidores = {}
+
+    def somar(self, nome, valor=1, **rotulos):
+        if not valor:
+            return
+        chave = (nome, _rotulos(rotulos))
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def observar(self, nome, segundos, **rotulos):
+        chave = (nome, _rotulos(rotulos))
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = [[0] * len(self.buckets), 0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if segundos <= limite:
+                    histograma[0][i] += 1
+            histograma[1] += segundos
+            histograma[2] += 1
+
+    def definir(self, nome, valor, **rotulos):
+        with self._lock:
+            self._medidores[(nome, _rotulos(rotulos))] = valor
+
+    @contextmanager
+    def medir(self, nome, **rotulos):
+        """Observa no histograma `nome` a duração do bloco."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio, **rotulos)
+
+    def linhas(self, inseridas=0, ignoradas=0, falhas=0, **rotulos):
+        self.somar("mix_linhas_total", inseridas, resultado="inseridas", **rotulos)
+        self.somar("mix_linhas_total", ignoradas, resultado="ignoradas", **rotulos)
+        self.somar("mix_linhas_total", falhas, resultado="falhas", **rotulos)
+
+    def registrar_token(self, momento, **rotulos):
+        """`momento`: datetime do since_token salvo (token_para_datetime)."""
+        if momento is not None:
+            self.definir("mix_since_token_timestamp_segundos", momento.timestamp(), **rotulos)
+
+    def texto(self):
+        """Todas as séries no formato de exposição texto do Prometheus."""
+        with self._lock:
+            contadores = dict(self._contadores)
+            histogramas = {chave: (list(h[0]), h[1], h[2]) for chave, h in self._histogramas.items()}
+            medidores = dict(self._medidores)
+
+        agora = time.time()
+        for (nome, rotulos), valor in list(medidores.items()):
+            if nome == "mix_since_token_timestamp_segundos":
+                medidores[("mix_since_token_atraso_segundos", rotulos)] = max(0.0, agora - valor)
+
+        series = {}
+        for (nome, rotulos), valor in sorted({**contadores, **medidores}.items()):
+            series.setdefault(nome, []).append(f"{nome}{_formatar_rotulos(rotulos)} {_numero(valor)}")
+        for (nome, rotulos), (contagens, soma, total) in sorted(histogramas.items()):
+            linhas = series.setdefault(nome, [])
+            for limite, contagem in zip(self.buckets, contagens):
+                linhas.append(f"{nome}_bucket{_formatar_rotulos(rotulos, [('le', _numero(float(limite)))])} {contagem}")
+            linhas.append(f"{nome}_bucket{_formatar_rotulos(rotulos, [('le', '+Inf')])} {total}")
+            linhas.append(f"{nome}_sum{_formatar_rotulos(rotulos)} {_numero(soma)}")
+            linhas.append(f"{nome}_count{_formatar_rotulos(rotulos)} {total}")
+
+        saida = []
+        for nome in sorted(series):
+            tipo, ajuda = DESCRICOES.get(nome, ("untyped", nome))
+            saida.append(f"# HELP {nome} {ajuda}")
+            saida.append(f"# TYPE {nome} {tipo}")
+            saida.extend(series[nome])
+        return "\n".join(saida) + "\n"
+
+    def gravar_arquivo(self, caminho):
+        """Grava o texto de forma atômica (o textfile collector não pode ler pela metade)."""
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(self.texto())
+        os.replace(temporario, caminho)
+
+
+metricas = Metricas()
+
+
+def registrar_execucao(segundos, sucesso):
+    """Duração e resultado de uma execução do importador atual (daemon/executor)."""
+    metricas.observar("mix_execucao_segundos", segundos)
+    metricas.somar("mix_execucoes_total", resultado="ok" if sucesso else "erro")
+
+
+class _ManipuladorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        corpo = metricas.texto().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class ExportadorMetricas:
+    """Endpoint HTTP /metrics e/ou arquivo .prom atualizado periodicamente."""
+
+    def __init__(self, porta=METRICAS_PORTA, arquivo=METRICAS_ARQUIVO, intervalo=METRICAS_INTERVALO_SEGUNDOS):
+        self.porta = porta
+        self.arquivo = arquivo
+        self.intervalo = intervalo
+        self.parar = threading.Event()
+        self._servidor = None
+        self._threads = []
+
+    @property
+    def ativo(self):
+        return bool(self.porta or self.arquivo)
+
+    def iniciar(self):
+        if self.porta:
+            try:
+                self._servidor = ThreadingHTTPServer(("0.0.0.0", self.porta), _ManipuladorMetricas)
+            except OSError as exc:
+                print(f"[METRICAS] ⚠️ Não foi possível abrir a porta {self.porta} ({exc}).")
+            else:
+                self._servidor.daemon_threads = True
+                self._iniciar_thread(self._servidor.serve_forever, "metricas-http")
+                print(f"[METRICAS] 📈 Prometheus em http://0.0.0.0:{self.porta}/metrics")
+        if self.arquivo:
+            self._iniciar_thread(self._gravar_periodicamente, "metricas-arquivo")
+            print(f"[METRICAS] 📈 Textfile em {self.arquivo} a cada {self.intervalo:g}s")
+
+    def _iniciar_thread(self, alvo, nome):
+        thread = threading.Thread(target=alvo, name=nome, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _gravar(self):
+        try:
+            metricas.gravar_arquivo(self.arquivo)
+        except OSError as exc:
+            print(f"[METRICAS] ⚠️ Falha ao gravar {self.arquivo} ({exc}).")
+
+    def _gravar_periodicamente(self):
+        while not self.parar.wait(self.intervalo):
+            self._gravar()
+
+    def encerrar(self):
+        self.parar.set()
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+        if self.arquivo:
+            self._gravar()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from core.config import DETECTAR_MUDANCAS
+from core.db_utils import inserir_em_lotes
+from core.metricas import metricas
+
+# Hash do conteúdo de cada linha já gravada, por entidade e chave primária
+SQL_CRIAR_TABELA_HASHES = """
+    CREATE TABLE IF NOT EXISTS hashes_entidades (
+        entidade VARCHAR(50) NOT NULL,
+        chave VARCHAR(64) NOT NULL,
+        hash CHAR(32) NOT NULL,
+        atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (entidade, chave)
+    )
+"""
+SQL_SALVAR_HASH = """
+    INSERT INTO hashes_entidades (entidade, chave, hash) VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE hash = VALUES(hash)
+"""
+SQL_REMOVER_HASH = "DELETE FROM hashes_entidades WHERE entidade = %s AND chave = %s"
+
+_tabela_hashes_ok = False
+
+
+def _garantir_tabela_hashes(cursor) -> None:
+    # CREATE TABLE faz commit implícito: chamar antes de qualquer escrita da transação
+    global _tabela_hashes_ok
+    if not _tabela_hashes_ok:
+        cursor.execute(SQL_CRIAR_TABELA_HASHES)
+        _tabela_hashes_ok = True
+
+
+def hash_linha(linha, semente: bytes = b"") -> str:
+    """Hash (128 bits, hex) dos valores já convertidos de uma linha."""
+    conteudo = json.dumps(linha, default=str, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(semente + conteudo, digest_size=16).hexdigest()
+
+
+@dataclass
+class Mudancas:
+    novas: List[Tuple] = field(default_factory=list)
+    alteradas: List[Tuple] = field(default_factory=list)
+    inalteradas: int = 0
+    removidas: List[str] = field(default_factory=list)
+    hashes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def linhas(self) -> List[Tuple]:
+        return self.novas + self.alteradas
+
+
+def detectar_mudancas(cursor, entidade, linhas, indice_chave: int = 0, forcar: bool = False) -> Mudancas:
+    """Compara as linhas da API com os hashes gravados na última execução.
+
+    A semente do hash inclui as colunas do esquema, então mudar o mapeamento
+    da entidade faz todas as linhas serem regravadas uma vez. Com `forcar`,
+    todas as linhas são tratadas como alteradas.
+    """
+    _garantir_tabela_hashes(cursor)
+    cursor.execute("SELECT chave, hash FROM hashes_entidades WHERE entidade = %s", (entidade.nome,))
+    anteriores: Dict[str, Any] = dict(cursor.fetchall())
+
+    semente = ",".join(entidade.nomes).encode("utf-8")
+    mudancas = Mudancas()
+    for linha in linhas:
+        chave = str(linha[indice_chave])
+        atual = hash_linha(linha, semente)
+        mudancas.hashes[chave] = atual
+        anterior = anteriores.get(chave)
+        if anterior is None:
+            mudancas.novas.append(linha)
+        elif forcar or anterior != atual:
+            mudancas.alteradas.append(linha)
+        else:
+            mudancas.inalteradas += 1
+    mudancas.removidas = sorted(set(anteriores) - set(mudancas.hashes))
+    return mudancas
+
+
+def registrar_hashes(cursor, entidade, mudancas: Mudancas, indice_chave: int = 0) -> None:
+    """Grava os hashes das linhas escritas e esquece as chaves removidas (mesma transação)."""
+    alteradas = {str(linha[indice_chave]) for linha in mudancas.linhas}
+    cursor.executemany(
+        SQL_SALVAR_HASH,
+        [(entidade.nome, chave, mudancas.hashes[chave]) for chave in alteradas],
+    )
+    if mudancas.removidas:
+        cursor.executemany(SQL_REMOVER_HASH, [(entidade.nome, chave) for chave in mudancas.removidas])
+
+
+def gravar_alterados(cursor, entidade, linhas, identificar=None, prefixo="[DB]", forcar=False):
+    """Grava só as linhas novas ou alteradas de uma entidade de cadastro.
+
+    Retorna (mudancas, gravadas, falhas, segundos). Com DETECTAR_MUDANCAS
+    desligado, grava tudo como antes (mudancas = None). Se alguma linha falhar,
+    os hashes não são atualizados e a próxima execução tenta de novo.
+    """
+    if not DETECTAR_MUDANCAS:
+        return (None,) + inserir_em_lotes(cursor, entidade.sql(), linhas, identificar=identificar, prefixo=prefixo)
+
+    mudancas = detectar_mudancas(cursor, entidade, linhas, forcar=forcar)
+    gravadas, falhas, segundos = inserir_em_lotes(
+        cursor, entidade.sql(), mudancas.linhas, identificar=identificar, prefixo=prefixo
+    )
+    metricas.linhas(ignoradas=mudancas.inalteradas)
+    if falhas:
+        print(f"{prefixo} ⚠️ {falhas} linhas falharam; hashes não atualizados nesta execução.")
+    else:
+        registrar_hashes(cursor, entidade, mudancas)
+
+    print(f"{prefixo} 🔎 {len(mudancas.novas)} novos, {len(mudancas.alteradas)} alterados, "
+          f"{mudancas.inalteradas} sem mudança, {len(mudancas.removidas)} removidos da API")
+    if mudancas.removidas:
+        amostra = ", ".join(mudancas.removidas[:20])
+        resto = f" (+{len(mudancas.removidas) - 20})" if len(mudancas.removidas) > 20 else ""
+        print(f"{prefixo} 🗑️ Não vieram mais da API: {amostra}{resto}")
+    return mudancas, gravadas, falhas, segundos
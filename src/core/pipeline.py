@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from core.config import PIPELINE_TAMANHO_FILA
+from core.metricas import metricas
+from core.since_token import token_para_datetime
+
+# Sinaliza ao consumidor que o produtor terminou
+_FIM = object()
+
+# Pedido de encerramento do processo (ex.: SIGTERM no daemon): nenhuma página
+# nova é buscada, mas as que já estão na fila são gravadas e têm o token salvo
+encerramento = threading.Event()
+
+
+def solicitar_encerramento():
+    encerramento.set()
+
+
+@dataclass
+class Pagina:
+    numero: int
+    since_token: str
+    itens: Iterable[Any]
+    novo_token: Optional[str]
+    has_more: bool
+
+
+@dataclass
+class ResultadoPipeline:
+    paginas: int = 0
+    itens: int = 0
+    has_more: bool = False
+    ultimo_token: Optional[str] = None
+    erro: bool = False
+    segundos: float = 0.0
+    # Fração da última página preenchida (itens / tamanho_pagina)
+    ocupacao: float = 0.0
+
+
+def executar_pipeline(
+    buscar: Callable[[str], Optional[Tuple[Iterable[Any], Optional[str], bool]]],
+    gravar: Callable[[Iterable[Any], Optional[str]], Optional[int]],
+    salvar_token: Callable[[str], None],
+    since_token: str,
+    max_paginas: int,
+    max_segundos: float,
+    tamanho_fila: int = PIPELINE_TAMANHO_FILA,
+    tamanho_pagina: Optional[int] = None,
+    prefixo: str = "[PIPELINE]",
+    parar_em: Optional[Callable[[str], bool]] = None,
+) -> ResultadoPipeline:
+    """Busca páginas numa thread enquanto grava a página anterior na thread atual.
+
+    `buscar(since_token)` retorna (itens, novo_token, has_more) ou None em caso
+    de erro; `itens` pode ser uma lista ou um iterador (modo streaming) e
+    `gravar(itens, novo_token)` pode devolver quantos itens consumiu e deve
+    gravar o novo_token na mesma transação dos itens (core.since_token).
+    `salvar_token` só é chamado depois que `gravar` conclui a página, então
+    uma falha na escrita nunca avança o checkpoint. A fila é limitada a `tamanho_fila` páginas para manter
+    a memória sob controle. `parar_em(novo_token)`, se informado, encerra a
+    busca quando devolver True (ex.: o stream passou do fim de uma fatia).
+    """
+    fila: "queue.Queue" = queue.Queue(maxsize=max(1, tamanho_fila))
+    parar = threading.Event()
+    resultado = ResultadoPipeline(ultimo_token=since_token)
+    inicio = time.monotonic()
+
+    def enfileirar(item) -> bool:
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produtor():
+        token_atual = since_token
+        numero = 0
+        try:
+            while not parar.is_set():
+                if encerramento.is_set():
+                    print(f"{prefixo} 🛑 Encerramento solicitado, finalizando páginas pendentes.")
+                    break
+                retorno = buscar(token_atual)
+                if retorno is None:
+                    resultado.erro = True
+                    break
+                itens, novo_token, has_more = retorno
+                numero += 1
+                if not enfileirar(Pagina(numero, token_atual, itens, novo_token, has_more)):
+                    break
+                if not has_more or not novo_token:
+                    break
+                if parar_em and parar_em(novo_token):
+                    break
+                if numero >= max_paginas:
+                    print(f"{prefixo} ⏸️ Limite de {max_paginas} páginas atingido.")
+                    break
+                if time.monotonic() - inicio >= max_segundos:
+                    print(f"{prefixo} ⏸️ Limite de {max_segundos}s atingido.")
+                    break
+                token_atual = novo_token
+        except Exception as exc:
+            print(f"{prefixo} ❌ Erro ao buscar página: {exc}")
+            resultado.erro = True
+        finally:
+            enfileirar(_FIM)
+
+    # Mesmo contexto (importador_atual) na thread produtora, para as métricas HTTP
+    contexto = contextvars.copy_context()
+    thread = threading.Thread(target=contexto.run, args=(produtor,), name=f"produtor{prefixo}", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            pagina = fila.get()
+            if pagina is _FIM:
+                break
+            gravados = gravar(pagina.itens, pagina.novo_token)
+            resultado.paginas += 1
+            qtd_pagina = gravados if gravados is not None else len(pagina.itens)
+            resultado.itens += qtd_pagina
+            if tamanho_pagina:
+                resultado.ocupacao = min(1.0, qtd_pagina / tamanho_pagina)
+            resultado.has_more = pagina.has_more
+            if pagina.novo_token:
+                salvar_token(pagina.novo_token)
+                resultado.ultimo_token = pagina.novo_token
+                metricas.registrar_token(token_para_datetime(pagina.novo_token))
+    except Exception as exc:
+        print(f"{prefixo} ❌ Erro ao gravar página: {exc}")
+        resultado.erro = True
+    finally:
+        parar.set()
+        thread.join()
+        resultado.segundos = time.monotonic() - inicio
+
+    return resultado
@@ -0,0 +1,192 @@
+"""Registro dos tipos de evento (Tr): EventTypeId -> (tabela tr_*, nome).
+
+Carregado da tabela `tipos_eventos` (preenchida por importar_tipos_eventos),
+filtrando as descrições que começam com "(Tr)". O resultado fica em memória
+e num arquivo JSON local, usado quando o banco não responde. Tipos novos
+cadastrados na MiX passam a ser importados sem mudar código.
+"""
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, NamedTuple, Optional
+
+import mysql.connector
+
+from core.config import (
+    EVENTOS_TABELA_UNICA,
+    REGISTRO_EVENTOS_ARQUIVO,
+    REGISTRO_EVENTOS_RECARREGAR_SEGUNDOS,
+)
+from core.db import conectar_banco
+from core.tabela_eventos import sql_view, tipo_da_tabela
+
+PREFIXO_TR = "(Tr)"
+TABELA_MODELO = "tr_excesso_velocidade_55km_2"
+
+# Nomes das tabelas criadas antes do registro (não seguem o nome derivado da descrição)
+TABELAS_LEGADAS = {
+    -614457561876096876: ("tr_aceleracao_brusca", "Aceleração Brusca"),
+    3296322604872944138: ("tr_curva_brusca", "Curva Brusca"),
+    -1988381093544824498: ("tr_embreagem_acionada_indevida", "Embreagem Indevida"),
+    2164520525956490666: ("tr_excesso_rpm_parado", "Excesso RPM Parado"),
+    74735825877637374: ("tr_excesso_velocidade_20km", "Excesso Velocidade 20km"),
+    -6248653914463313400: ("tr_excesso_velocidade_30km", "Excesso Velocidade 30km"),
+    6474504604434952727: ("tr_excesso_velocidade_40km_1", "Excesso Velocidade 40km 1"),
+    -1992910974424714295: ("tr_excesso_velocidade_40km_2", "Excesso Velocidade 40km 2"),
+    5511057473630489154: ("tr_excesso_velocidade_50km", "Excesso Velocidade 50km"),
+    6580201539568389304: ("tr_excesso_velocidade_55km_1", "Excesso Velocidade 55km 1"),
+    -9050647299058098294: ("tr_excesso_velocidade_55km_2", "Excesso Velocidade 55km 2"),
+    908787025131282024: ("tr_excesso_velocidade_60km", "Excesso Velocidade 60km"),
+    -6437542951044419628: ("tr_fora_faixa_verde", "Fora da Faixa Verde"),
+    337658916843834225: ("tr_freada_brusca", "Freada Brusca"),
+    -1150311268842644462: ("tr_freada_brusca_grave", "Freada Brusca Grave"),
+    6314588935029952465: ("tr_inercia_aproveitada", "Inércia Aproveitada"),
+    2561992611692992861: ("tr_marcha_lenta", "Marcha Lenta"),
+    -154632669554799975: ("tr_marcha_lenta_5min", "Marcha Lenta 5min"),
+    8889515098300962737: ("tr_excesso_rotacao", "Excesso de Rotação"),
+    -4465594527070247088: ("tr_batendo_transmissao", "Batendo Transmissão"),
+}
+
+
+class TipoEvento(NamedTuple):
+    tabela: str
+    nome: str
+
+
+def nome_tabela(descricao: str) -> str:
+    """"(Tr) Freada Brusca Grave" -> "tr_freada_brusca_grave"."""
+    texto = descricao.strip()
+    if texto.startswith(PREFIXO_TR):
+        texto = texto[len(PREFIXO_TR):]
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "_", texto.lower()).strip("_")
+    return f"tr_{slug}"[:64]
+
+
+def tipos_legados() -> Dict[int, TipoEvento]:
+    return {tipo_id: TipoEvento(*valor) for tipo_id, valor in TABELAS_LEGADAS.items()}
+
+
+def montar_tipos(linhas) -> Dict[int, TipoEvento]:
+    """Monta o registro a partir de (EventTypeId, Description) da tabela tipos_eventos.
+
+    Parte sempre dos TABELAS_LEGADAS: um tipo legado que falte em tipos_eventos
+    (ou cuja descrição não comece com "(Tr)") continua sendo importado.
+    """
+    tipos = tipos_legados()
+    usadas = {tabela for tabela, _ in TABELAS_LEGADAS.values()}
+    for tipo_id, descricao in linhas:
+        tipo_id = int(tipo_id)
+        if tipo_id in TABELAS_LEGADAS:
+            continue
+        nome = (descricao or "").strip()[len(PREFIXO_TR):].strip() or str(tipo_id)
+        tabela = nome_tabela(descricao or str(tipo_id))
+        if tabela in usadas:
+            tabela = f"{tabela[:50]}_{abs(tipo_id) % 10**8}"
+        usadas.add(tabela)
+        tipos[tipo_id] = TipoEvento(tabela, nome)
+    return tipos
+
+
+class RegistroEventos:
+    """Registro em memória, recarregado do banco a cada `recarregar` segundos."""
+
+    def __init__(self, arquivo=REGISTRO_EVENTOS_ARQUIVO, recarregar=REGISTRO_EVENTOS_RECARREGAR_SEGUNDOS):
+        self.arquivo = arquivo
+        self.recarregar = recarregar
+        self._tipos: Optional[Dict[int, TipoEvento]] = None
+        self._carregado_em = 0.0
+        self._tabelas_ok = set()
+        self._lock = threading.Lock()
+
+    def tipos(self) -> Dict[int, TipoEvento]:
+        tipos = self._tipos
+        if tipos is not None and time.monotonic() - self._carregado_em < self.recarregar:
+            return tipos
+        with self._lock:
+            if self._tipos is None or time.monotonic() - self._carregado_em >= self.recarregar:
+                self._tipos = self._carregar()
+                self._carregado_em = time.monotonic()
+            return self._tipos
+
+    def obter(self, tipo_id) -> Optional[TipoEvento]:
+        return self.tipos().get(tipo_id)
+
+    def invalidar(self):
+        """Força a releitura do banco na próxima consulta (ex.: após importar_tipos_eventos)."""
+        with self._lock:
+            self._carregado_em = 0.0
+
+    def _carregar(self) -> Dict[int, TipoEvento]:
+        try:
+            conn = conectar_banco()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT EventTypeId, Description FROM tipos_eventos WHERE TRIM(Description) LIKE %s ORDER BY EventTypeId",
+                    (f"{PREFIXO_TR}%",),
+                )
+                linhas = cursor.fetchall()
+                cursor.close()
+            finally:
+                conn.close()
+        except mysql.connector.Error as exc:
+            print(f"[EVENTOS] ⚠️ tipos_eventos indisponível ({exc}). Usando o cache local.")
+            return self._ler_arquivo()
+
+        if not linhas:
+            print("[EVENTOS] ⚠️ tipos_eventos vazia: rode o importador tipos_eventos. Usando o cache local.")
+            return self._ler_arquivo()
+
+        tipos = montar_tipos(linhas)
+        self._gravar_arquivo(tipos)
+        if self._tipos is not None and set(tipos) != set(self._tipos):
+            print(f"[EVENTOS] 🆕 Registro de tipos atualizado: {len(tipos)} tipos (Tr).")
+        return tipos
+
+    def _ler_arquivo(self) -> Dict[int, TipoEvento]:
+        try:
+            with open(self.arquivo, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            arquivo = {int(tipo_id): TipoEvento(*valor) for tipo_id, valor in dados.items()}
+            return {**tipos_legados(), **arquivo}
+        except (OSError, ValueError, TypeError) as exc:
+            print(f"[EVENTOS] 🚨 Sem banco e sem cache local de tipos ({self.arquivo}: {exc}). "
+                  f"Usando só os {len(TABELAS_LEGADAS)} tipos legados fixos no código: "
+                  "eventos de outros tipos serão ignorados até o banco voltar.")
+            return tipos_legados()
+
+    def _gravar_arquivo(self, tipos):
+        try:
+            pasta = os.path.dirname(self.arquivo)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            temporario = f"{self.arquivo}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump({str(k): list(v) for k, v in tipos.items()}, f, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.arquivo)
+        except OSError as exc:
+            print(f"[EVENTOS] ⚠️ Não foi possível gravar o cache de tipos ({exc}).")
+
+    def garantir_tabelas(self, cursor, tipos: Dict[int, TipoEvento]):
+        """Cria as tabelas tr_* (ou views, no modo tabela única) dos tipos novos.
+
+        DDL faz commit implícito: chamar antes de gravar qualquer linha da página.
+        """
+        for tipo_id, tipo in tipos.items():
+            if tipo.tabela in self._tabelas_ok:
+                continue
+            if tipo_id not in TABELAS_LEGADAS:
+                if EVENTOS_TABELA_UNICA:
+                    if tipo_da_tabela(cursor, tipo.tabela) is None:
+                        cursor.execute(sql_view(tipo.tabela, tipo_id))
+                else:
+                    cursor.execute(f"CREATE TABLE IF NOT EXISTS {tipo.tabela} LIKE {TABELA_MODELO}")
+                print(f"[EVENTOS] 🆕 {tipo.nome}: destino {tipo.tabela} preparado.")
+            self._tabelas_ok.add(tipo.tabela)
+
+
+registro_eventos = RegistroEventos()
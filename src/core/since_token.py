@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 
+from core.config import CHECKPOINT_NO_BANCO
+from core.db import conectar_banco
+
 try:
     from zoneinfo import ZoneInfo  # type: ignore
 except ImportError:  # pragma: no cover - fallback only for very old Python
@@ -92,3 +96,115 @@ def timezone_from_name(nome: Optional[str]):
         return ZoneInfo(nome)
     except Exception:
         return None
+
+
+# ---------------------------------------------------------------------------
+# Armazenamento do checkpoint (tabela since_tokens + arquivo de fallback)
+# ---------------------------------------------------------------------------
+
+SQL_CRIAR_TABELA_CHECKPOINT = """
+    CREATE TABLE IF NOT EXISTS since_tokens (
+        tipo VARCHAR(50) PRIMARY KEY,
+        token VARCHAR(32) NOT NULL,
+        atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+SQL_SALVAR_CHECKPOINT = """
+    INSERT INTO since_tokens (tipo, token) VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE token = VALUES(token)
+"""
+
+_tabela_checkpoint_ok = False
+
+
+def garantir_tabela_checkpoint(conn) -> None:
+    """Cria a tabela since_tokens (uma vez por processo) se o checkpoint for no banco.
+
+    CREATE TABLE faz commit implícito: chame com a conexão recém-obtida, nunca
+    dentro da transação de uma página.
+    """
+    global _tabela_checkpoint_ok
+    if _tabela_checkpoint_ok or not CHECKPOINT_NO_BANCO:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute(SQL_CRIAR_TABELA_CHECKPOINT)
+    finally:
+        cursor.close()
+    _tabela_checkpoint_ok = True
+
+
+def ler_token_arquivo(caminho) -> Optional[str]:
+    if not caminho or not os.path.exists(caminho):
+        return None
+    with open(caminho, "r", encoding="utf-8") as f:
+        return f.read().strip() or None
+
+
+def gravar_token_arquivo(caminho, token: str) -> None:
+    """Grava o token de forma atômica (arquivo temporário + rename)."""
+    pasta = os.path.dirname(os.fspath(caminho))
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = f"{os.fspath(caminho)}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(token)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+def ler_checkpoint(tipo: str, caminho=None) -> Tuple[Optional[str], str]:
+    """Lê o since_token de `tipo`: primeiro da tabela, depois do arquivo.
+
+    Retorna (token, origem) com origem "banco", "arquivo" ou "nenhuma".
+    """
+    if CHECKPOINT_NO_BANCO:
+        try:
+            conn = conectar_banco()
+            try:
+                garantir_tabela_checkpoint(conn)
+                cursor = conn.cursor()
+                cursor.execute("SELECT token FROM since_tokens WHERE tipo = %s", (tipo,))
+                linha = cursor.fetchone()
+                cursor.close()
+            finally:
+                conn.close()
+            if linha and linha[0]:
+                return linha[0], "banco"
+        except Exception as exc:
+            print(f"[{tipo.upper()}] ⚠️ Checkpoint no banco indisponível ({exc}). Usando arquivo.")
+
+    token = ler_token_arquivo(caminho)
+    return (token, "arquivo") if token else (None, "nenhuma")
+
+
+def salvar_checkpoint(tipo: str, token: str, caminho=None, cursor=None) -> None:
+    """Salva o since_token de `tipo`.
+
+    Com `cursor`, grava na transação aberta por quem chamou (o commit dos dados
+    da página confirma também o token) e não mexe no arquivo: espelhe com
+    gravar_token_arquivo depois do commit. Sem `cursor`, abre uma conexão
+    própria e atualiza banco e arquivo.
+    """
+    if cursor is not None:
+        if CHECKPOINT_NO_BANCO:
+            cursor.execute(SQL_SALVAR_CHECKPOINT, (tipo, token))
+        return
+
+    if CHECKPOINT_NO_BANCO:
+        try:
+            conn = conectar_banco()
+            try:
+                garantir_tabela_checkpoint(conn)
+                cur = conn.cursor()
+                cur.execute(SQL_SALVAR_CHECKPOINT, (tipo, token))
+                cur.close()
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as exc:
+            print(f"[{tipo.upper()}] ⚠️ Não foi possível salvar o checkpoint no banco ({exc}). Salvando só no arquivo.")
+
+    if caminho:
+        gravar_token_arquivo(caminho, token)
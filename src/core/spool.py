@@ -0,0 +1,308 @@
+"""Spool em disco para quando o MySQL não responde.
+
+Se a conexão falhar na hora de gravar uma página já buscada, a página vira um
+segmento em `spool/<tipo>/` (um arquivo por página, numerado em ordem) e a
+importação segue buscando na MiX. Cada segmento tem um cabeçalho JSON com o
+SHA-256 e o tamanho do corpo (JSON dos itens compactado com gzip) e é escrito
+de forma atômica (arquivo temporário + fsync + rename).
+
+Enquanto houver segmentos pendentes de um tipo, as páginas novas também vão
+para o spool, para que o banco receba tudo na ordem do stream (o checkpoint
+nunca anda para trás). O drenador grava os segmentos em ordem assim que o
+banco volta, cada um na mesma transação do seu since_token. Um segmento que
+falha SPOOL_MAX_TENTATIVAS vezes seguidas vai para `quarentena/` (as falhas
+são contadas num arquivo `.falhas` ao lado dele) para não travar o tipo.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+import mysql.connector
+
+from core.config import SPOOL, SPOOL_PASTA, SPOOL_INTERVALO_SEGUNDOS, SPOOL_MAX_TENTATIVAS
+from core.db import conectar_banco
+from core.metricas import importador
+from core.since_token import garantir_tabela_checkpoint
+
+EXTENSAO = ".seg"
+EXTENSAO_FALHAS = ".falhas"
+PASTA_CORROMPIDOS = "corrompidos"
+PASTA_QUARENTENA = "quarentena"
+
+# Servidor fora do ar / conexão caiu. PoolError (pool esgotado) não entra:
+# o banco está de pé e a falha deve subir.
+ERROS_BANCO_FORA = {2003, 2006, 2013, 2055}
+
+
+def banco_fora(exc):
+    """True se `exc` (de conectar_banco) indica MySQL inacessível."""
+    if isinstance(exc, mysql.connector.errors.InterfaceError):
+        return True
+    return isinstance(exc, mysql.connector.errors.DatabaseError) and exc.errno in ERROS_BANCO_FORA
+
+
+class SegmentoCorrompido(ValueError):
+    """Cabeçalho ilegível ou checksum diferente do corpo."""
+
+
+class Spool:
+    def __init__(self, pasta=SPOOL_PASTA, ativo=SPOOL, max_tentativas=SPOOL_MAX_TENTATIVAS):
+        self.pasta = pasta
+        self.ativo = ativo
+        self.max_tentativas = max_tentativas
+        self._gravadores = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._drenando = threading.Lock()
+
+    def registrar(self, tipo, gravar_banco):
+        """`gravar_banco(conn, itens, novo_token)` grava uma página numa conexão já aberta."""
+        self._gravadores[tipo] = gravar_banco
+
+    def _lock_tipo(self, tipo):
+        with self._lock:
+            return self._locks.setdefault(tipo, threading.Lock())
+
+    def _pasta_tipo(self, tipo):
+        return os.path.join(self.pasta, tipo)
+
+    def segmentos(self, tipo):
+        pasta = self._pasta_tipo(tipo)
+        if not os.path.isdir(pasta):
+            return []
+        return sorted(
+            os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith(EXTENSAO)
+        )
+
+    def pendentes(self, tipo):
+        return len(self.segmentos(tipo))
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def gravar(self, tipo, gravar_banco, itens, novo_token=None):
+        """Grava a página no banco ou, se ele estiver fora (ou houver fila), no spool.
+
+        Só a falha de conexão (banco_fora) desvia para o spool; pool esgotado ou
+        um erro no meio da gravação continuam subindo (o pipeline não avança o
+        checkpoint).
+        """
+        if not self.ativo:
+            return _gravar_com_conexao(conectar_banco(), gravar_banco, itens, novo_token)
+
+        with self._lock_tipo(tipo):
+            fila = self.pendentes(tipo)
+        if not fila:
+            try:
+                conn = conectar_banco()
+            except mysql.connector.Error as exc:
+                if not banco_fora(exc):
+                    raise
+                print(f"[SPOOL] ⚠️ MySQL indisponível ({exc}). Página de {tipo} vai para o spool.")
+            else:
+                return _gravar_com_conexao(conn, gravar_banco, itens, novo_token)
+
+        itens = list(itens)
+        with self._lock_tipo(tipo):
+            caminho = self.enfileirar(tipo, itens, novo_token)
+        print(f"[SPOOL] 💾 {len(itens)} itens de {tipo} em {os.path.basename(caminho)} "
+              f"({self.pendentes(tipo)} segmento(s) aguardando o banco)")
+        return len(itens)
+
+    def enfileirar(self, tipo, itens, novo_token):
+        corpo = gzip.compress(json.dumps(itens, ensure_ascii=False).encode("utf-8"), compresslevel=6)
+        cabecalho = {
+            "versao": 1,
+            "tipo": tipo,
+            "novo_token": novo_token,
+            "itens": len(itens),
+            "tamanho": len(corpo),
+            "sha256": hashlib.sha256(corpo).hexdigest(),
+            "criado_em": datetime.now(timezone.utc).isoformat(),
+        }
+        pasta = self._pasta_tipo(tipo)
+        os.makedirs(pasta, exist_ok=True)
+        existentes = self.segmentos(tipo)
+        sequencia = int(os.path.basename(existentes[-1])[:-len(EXTENSAO)]) + 1 if existentes else 1
+        caminho = os.path.join(pasta, f"{sequencia:012d}{EXTENSAO}")
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(json.dumps(cabecalho).encode("utf-8") + b"\n")
+            f.write(corpo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+        _sincronizar_pasta(pasta)
+        return caminho
+
+    # ------------------------------------------------------------------
+    # Leitura / drenagem
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def ler_cabecalho(caminho):
+        with open(caminho, "rb") as f:
+            linha = f.readline()
+        try:
+            return json.loads(linha)
+        except ValueError as exc:
+            raise SegmentoCorrompido(f"cabeçalho ilegível: {exc}")
+
+    @staticmethod
+    def ler(caminho):
+        """Retorna (cabeçalho, itens) conferindo tamanho e SHA-256 do corpo."""
+        with open(caminho, "rb") as f:
+            linha = f.readline()
+            corpo = f.read()
+        try:
+            cabecalho = json.loads(linha)
+        except ValueError as exc:
+            raise SegmentoCorrompido(f"cabeçalho ilegível: {exc}")
+        if len(corpo) != cabecalho.get("tamanho") or hashlib.sha256(corpo).hexdigest() != cabecalho.get("sha256"):
+            raise SegmentoCorrompido("checksum não confere")
+        return cabecalho, json.loads(gzip.decompress(corpo))
+
+    def ultimo_token(self, tipo):
+        """GetSinceToken da página mais recente no spool (None se não houver)."""
+        for caminho in reversed(self.segmentos(tipo)):
+            try:
+                token = self.ler_cabecalho(caminho).get("novo_token")
+            except (OSError, SegmentoCorrompido):
+                continue
+            if token:
+                return token
+        return None
+
+    @staticmethod
+    def _mover(caminho, pasta):
+        destino = os.path.join(os.path.dirname(caminho), pasta)
+        os.makedirs(destino, exist_ok=True)
+        nome = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{os.path.basename(caminho)}"
+        shutil.move(caminho, os.path.join(destino, nome))
+        if os.path.exists(caminho + EXTENSAO_FALHAS):
+            shutil.move(caminho + EXTENSAO_FALHAS, os.path.join(destino, nome + EXTENSAO_FALHAS))
+
+    def _descartar_corrompido(self, caminho, motivo):
+        self._mover(caminho, PASTA_CORROMPIDOS)
+        print(f"[SPOOL] ❌ {os.path.basename(caminho)} corrompido ({motivo}); movido para {PASTA_CORROMPIDOS}/.")
+
+    def _registrar_falha(self, caminho, motivo):
+        """Conta mais uma falha de gravação do segmento. Retorna True se ele foi para a quarentena."""
+        arquivo = caminho + EXTENSAO_FALHAS
+        try:
+            with open(arquivo, "r", encoding="utf-8") as f:
+                falhas = int(f.read().strip() or 0) + 1
+        except (OSError, ValueError):
+            falhas = 1
+        with open(arquivo, "w", encoding="utf-8") as f:
+            f.write(str(falhas))
+        if self.max_tentativas > 0 and falhas >= self.max_tentativas:
+            self._mover(caminho, PASTA_QUARENTENA)
+            print(f"[SPOOL] 🚫 {os.path.basename(caminho)} falhou {falhas} vez(es) ({motivo}); "
+                  f"movido para {PASTA_QUARENTENA}/. Reprocesse à mão depois de corrigir a causa.")
+            return True
+        print(f"[SPOOL] ❌ Falha ao gravar {os.path.basename(caminho)} "
+              f"(tentativa {falhas}/{self.max_tentativas or '∞'}): {motivo}")
+        return False
+
+    def drenar(self, tipo=None):
+        """Grava no banco, em ordem, os segmentos pendentes. Retorna quantos foram gravados.
+
+        Para no primeiro erro de conexão ou de gravação (o segmento fica para
+        a próxima tentativa); depois de max_tentativas falhas de gravação o
+        segmento vai para a quarentena e a drenagem segue com o próximo.
+        """
+        if not self.ativo:
+            return 0
+        gravados = 0
+        with self._drenando:
+            for nome_tipo in ([tipo] if tipo else list(self._gravadores)):
+                gravar_banco = self._gravadores.get(nome_tipo)
+                if gravar_banco is None:
+                    continue
+                segmentos = self.segmentos(nome_tipo)
+                if not segmentos:
+                    continue
+                print(f"[SPOOL] 🚰 Drenando {len(segmentos)} segmento(s) de {nome_tipo}...")
+                inicio = time.perf_counter()
+                for caminho in segmentos:
+                    try:
+                        cabecalho, itens = self.ler(caminho)
+                    except (SegmentoCorrompido, OSError, ValueError) as exc:
+                        self._descartar_corrompido(caminho, exc)
+                        continue
+                    try:
+                        conn = conectar_banco()
+                    except mysql.connector.Error as exc:
+                        if not banco_fora(exc):
+                            raise
+                        print(f"[SPOOL] ⏳ MySQL ainda indisponível ({exc}).")
+                        return gravados
+                    try:
+                        with importador(nome_tipo):
+                            _gravar_com_conexao(conn, gravar_banco, itens, cabecalho.get("novo_token"))
+                    except Exception as exc:
+                        if self._registrar_falha(caminho, exc):
+                            continue
+                        break
+                    with self._lock_tipo(nome_tipo):
+                        os.remove(caminho)
+                        if os.path.exists(caminho + EXTENSAO_FALHAS):
+                            os.remove(caminho + EXTENSAO_FALHAS)
+                    gravados += 1
+                print(f"[SPOOL] ✅ {nome_tipo}: spool drenado até aqui em {time.perf_counter() - inicio:.1f}s "
+                      f"({self.pendentes(nome_tipo)} pendente(s)).")
+        return gravados
+
+
+class DrenadorSpool(threading.Thread):
+    """Thread que tenta drenar o spool a cada `intervalo` segundos."""
+
+    def __init__(self, spool, intervalo=SPOOL_INTERVALO_SEGUNDOS):
+        super().__init__(name="drenador-spool", daemon=True)
+        self.spool = spool
+        self.intervalo = intervalo
+        self.parar = threading.Event()
+
+    def run(self):
+        while not self.parar.wait(self.intervalo):
+            try:
+                self.spool.drenar()
+            except Exception as exc:
+                print(f"[SPOOL] ⚠️ Erro no drenador: {exc}")
+
+    def encerrar(self):
+        self.parar.set()
+
+
+def _gravar_com_conexao(conn, gravar_banco, itens, novo_token):
+    try:
+        # A página salva o token na própria transação; a tabela precisa existir
+        # antes (banco novo e token vindo do spool pulam ler_checkpoint)
+        garantir_tabela_checkpoint(conn)
+        return gravar_banco(conn, itens, novo_token)
+    finally:
+        conn.close()
+
+
+def _sincronizar_pasta(pasta):
+    # Garante que o rename do segmento sobreviva a uma queda de energia
+    try:
+        fd = os.open(pasta, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+spool = Spool()
@@ -0,0 +1,185 @@
+"""Modo tabela única: todos os eventos (Tr) em `eventos_tr`, particionada por mês.
+
+A tabela é particionada por RANGE(TO_DAYS(StartDateTime)), com uma partição
+por mês e uma `pmax` no fim. Como o MySQL exige a coluna de partição em toda
+chave única, a chave é (EventId, StartDateTime). As tabelas tr_* antigas
+viram views filtradas por EventTypeId (ver migrar_eventos_tr.py).
+"""
+import threading
+from datetime import date
+
+import mysql.connector
+
+from core.config import EVENTOS_PARTICOES_A_FRENTE
+from core.esquema import ESQUEMAS
+
+TABELA_UNICA = "eventos_tr"
+ESQUEMA_EVENTO = ESQUEMAS["eventos_tr"]
+
+SQL_CRIAR_TABELA_UNICA = f"""
+    CREATE TABLE IF NOT EXISTS {TABELA_UNICA} (
+        AssetId BIGINT,
+        DriverId BIGINT,
+        EventId BIGINT NOT NULL,
+        EventTypeId BIGINT,
+        EventCategory VARCHAR(100),
+        StartDateTime DATETIME NOT NULL,
+        StartLatitude DECIMAL(10,8),
+        StartLongitude DECIMAL(11,8),
+        StartSpeedKph DECIMAL(6,2),
+        StartOdometer DECIMAL(10,2),
+        EndDateTime DATETIME,
+        EndLatitude DECIMAL(10,8),
+        EndLongitude DECIMAL(11,8),
+        EndSpeedKph DECIMAL(6,2),
+        EndOdometer DECIMAL(10,2),
+        Value DECIMAL(10,6),
+        FuelUsedLitres DECIMAL(10,6),
+        ValueType VARCHAR(100),
+        ValueUnits VARCHAR(100),
+        TotalTimeSeconds INT,
+        TotalOccurances INT,
+        SpeedLimit INT,
+        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (EventId, StartDateTime),
+        KEY idx_tipo_data (EventTypeId, StartDateTime),
+        KEY idx_asset_data (AssetId, StartDateTime)
+    )
+    PARTITION BY RANGE (TO_DAYS(StartDateTime)) (
+        PARTITION pmax VALUES LESS THAN MAXVALUE
+    )
+"""
+
+# Mês (1º dia) da última verificação: num daemon de longa duração, a virada
+# do mês refaz a checagem e abre a partição seguinte
+_particoes_verificadas_em = None
+# Consumidor do pipeline, drenador do spool e fatias do backfill chamam ao mesmo tempo
+_lock_particoes = threading.Lock()
+# Duplicate partition name: outro processo já criou as mesmas partições
+ERRO_PARTICAO_DUPLICADA = 1517
+
+
+def _somar_meses(dia: date, meses: int) -> date:
+    indice = dia.year * 12 + dia.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _particoes_existentes(cursor):
+    """Limites (primeiro dia do mês seguinte) das partições mensais já criadas."""
+    cursor.execute(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL",
+        (TABELA_UNICA,),
+    )
+    limites = []
+    for (nome,) in cursor.fetchall():
+        if nome != "pmax":
+            limites.append(_somar_meses(date(int(nome[1:5]), int(nome[5:7]), 1), 1))
+    return sorted(limites)
+
+
+def garantir_particoes(cursor, desde=None, meses_a_frente=EVENTOS_PARTICOES_A_FRENTE, forcar=False):
+    """Cria a tabela (se preciso) e as partições mensais até `meses_a_frente` meses adiante.
+
+    As partições novas saem de um REORGANIZE da `pmax`. `desde` (date) define o
+    primeiro mês quando a tabela ainda não tem partições mensais (padrão: mês
+    atual). Só verifica de novo quando o mês muda. DDL faz commit implícito:
+    chamar fora da transação de uma página.
+    """
+    hoje = date.today().replace(day=1)
+    if _particoes_verificadas_em == hoje and not forcar:
+        return []
+    with _lock_particoes:
+        if _particoes_verificadas_em == hoje and not forcar:
+            return []
+        return _criar_particoes(cursor, hoje, desde, meses_a_frente)
+
+
+def _criar_particoes(cursor, hoje, desde, meses_a_frente):
+    global _particoes_verificadas_em
+    cursor.execute(SQL_CRIAR_TABELA_UNICA)
+
+    limites = _particoes_existentes(cursor)
+    mes = limites[-1] if limites else (desde or hoje).replace(day=1)
+    ultimo = _somar_meses(hoje, meses_a_frente)
+
+    novas = []
+    while mes <= ultimo:
+        limite = _somar_meses(mes, 1)
+        novas.append(f"PARTITION p{mes:%Y%m} VALUES LESS THAN (TO_DAYS('{limite:%Y-%m-%d}'))")
+        mes = limite
+    if novas:
+        try:
+            cursor.execute(
+                f"ALTER TABLE {TABELA_UNICA} REORGANIZE PARTITION pmax INTO ("
+                + ", ".join(novas + ["PARTITION pmax VALUES LESS THAN MAXVALUE"]) + ")"
+            )
+        except mysql.connector.Error as exc:
+            if exc.errno != ERRO_PARTICAO_DUPLICADA:
+                raise
+            print(f"[EVENTOS] 🧱 Partições de {TABELA_UNICA} já criadas por outro processo.")
+            novas = []
+        else:
+            print(f"[EVENTOS] 🧱 {len(novas)} partição(ões) mensal(is) criada(s) em {TABELA_UNICA}.")
+    _particoes_verificadas_em = hoje
+    return novas
+
+
+def sql_view(tabela, tipo_id):
+    """View com o nome da tabela tr_* antiga, filtrando a tabela única pelo tipo."""
+    colunas = ", ".join(ESQUEMA_EVENTO.nomes + ["criado_em"])
+    return (
+        f"CREATE OR REPLACE VIEW {tabela} AS SELECT {colunas} FROM {TABELA_UNICA} "
+        f"WHERE EventTypeId = {int(tipo_id)}"
+    )
+
+
+def tipo_da_tabela(cursor, tabela):
+    """'BASE TABLE', 'VIEW' ou None se `tabela` não existir."""
+    cursor.execute(
+        "SELECT TABLE_TYPE FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (tabela,),
+    )
+    linha = cursor.fetchone()
+    return linha[0] if linha else None
+
+
+def copiar_tabela(conn, origem, tamanho_bloco=50000, a_partir_de=0):
+    """Copia `origem` (tr_* antiga) para a tabela única em blocos de id.
+
+    INSERT IGNORE: rodar de novo não duplica nada. Cada bloco tem commit
+    próprio. Retorna (linhas copiadas, último id lido).
+    """
+    colunas = ", ".join(ESQUEMA_EVENTO.nomes)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {origem}")
+        maximo = cursor.fetchone()[0]
+        copiadas = 0
+        inicio = a_partir_de
+        while inicio < maximo:
+            fim = min(inicio + tamanho_bloco, maximo)
+            cursor.execute(
+                f"INSERT IGNORE INTO {TABELA_UNICA} ({colunas}, criado_em) "
+                f"SELECT {colunas}, criado_em FROM {origem} "
+                f"WHERE id > %s AND id <= %s AND StartDateTime IS NOT NULL",
+                (inicio, fim),
+            )
+            copiadas += cursor.rowcount
+            conn.commit()
+            inicio = fim
+        return copiadas, maximo
+    finally:
+        cursor.close()
+
+
+def menor_data(cursor, tabelas):
+    """Menor StartDateTime entre as tabelas tr_* que ainda são tabelas (para a 1ª partição)."""
+    datas = []
+    for tabela in tabelas:
+        if tipo_da_tabela(cursor, tabela) == "BASE TABLE":
+            cursor.execute(f"SELECT MIN(StartDateTime) FROM {tabela}")
+            valor = cursor.fetchone()[0]
+            if valor:
+                datas.append(valor.date())
+    return min(datas) if datas else None
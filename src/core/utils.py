@@ -1,4 +1,12 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - pandas/numpy estão no requirements.txt
+    np = pd = None
+
+FUSO_MANAUS = timezone(timedelta(hours=-4))
 
 def normalizar_data(data_str):
     if not data_str:
@@ -7,3 +15,37 @@ def normalizar_data(data_str):
         return datetime.strptime(data_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S")
     except ValueError:
         return None
+
+def converter_utc_para_manaus(data_str, fuso=FUSO_MANAUS):
+    """Versão linha a linha: 'YYYY-MM-DDTHH:MM:SSZ' (UTC) -> 'YYYY-MM-DD HH:MM:SS' no fuso."""
+    if not data_str:
+        return None
+    try:
+        dt_utc = datetime.strptime(data_str.replace("Z", ""), "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+        return dt_utc.astimezone(fuso).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+def converter_lote_utc_para_manaus(valores, fuso=FUSO_MANAUS):
+    """Converte uma coluna inteira de datas 'YYYY-MM-DDTHH:MM:SSZ' (UTC) de uma vez só.
+
+    Faz o parse vetorizado com pandas, desloca para `fuso` (offset fixo) e
+    formata com numpy, devolvendo strings 'YYYY-MM-DD HH:MM:SS' (ou None para
+    valores vazios/inválidos), na mesma ordem de `valores`. Sem pandas, cai
+    na conversão linha a linha.
+    """
+    valores = list(valores)
+    if not valores:
+        return []
+    if pd is None:
+        return [converter_utc_para_manaus(v, fuso) for v in valores]
+
+    # Mesmo formato estrito da versão linha a linha: frações de segundo e
+    # offsets (+00:00) viram None nas duas, em vez de só o pandas aceitar
+    textos = pd.Series(valores, dtype="object").str.replace("Z", "", regex=False)
+    serie = pd.to_datetime(textos, utc=True, errors="coerce", format="%Y-%m-%dT%H:%M:%S")
+    deslocamento = np.timedelta64(int(fuso.utcoffset(None).total_seconds()), "s")
+    locais = serie.dt.tz_localize(None).to_numpy(dtype="datetime64[s]") + deslocamento
+    textos = np.char.replace(np.datetime_as_string(locais, unit="s"), "T", " ")
+    invalidos = np.isnat(locais)
+    return [None if invalido else texto for texto, invalido in zip(textos.tolist(), invalidos.tolist())]
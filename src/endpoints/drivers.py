@@ -1,32 +1,31 @@
 import os
-import json
-import requests
-from core.auth import autenticar
+from core import cliente_mix
 from core.db import conectar_banco
+from core.db_utils import formatar_vazao
+from core.esquema import ESQUEMAS
+from core.metricas import metricas
+from core.mudancas import gravar_alterados
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def importar_drivers():
-    token = autenticar()
+ESQUEMA_DRIVER = ESQUEMAS["drivers"]
+
+def importar_drivers(forcar=False):
     organisation_id = os.getenv("MIX_ORGANISATION_ID")
 
     if not organisation_id:
         print("⚠️ ORGANISATION_ID não definido no .env")
         return
 
-    url = f"{os.getenv('MIX_API_URL')}/api/drivers/organisation/{organisation_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json"
-    }
-
-    response = requests.get(url, headers=headers)
+    url = f"/api/drivers/organisation/{organisation_id}"
+    response = cliente_mix.get(url, cache=True)
     if response.status_code != 200:
         print(f"Erro ao buscar drivers: {response.status_code} - {response.text}")
         return
 
-    drivers = response.json()
+    with metricas.medir("mix_decodificacao_segundos"):
+        drivers = response.json()
     if not isinstance(drivers, list):
         print("Resposta da API não está em formato de lista.")
         return
@@ -34,43 +33,17 @@ def importar_drivers():
     conn = conectar_banco()
     cursor = conn.cursor()
 
-    for driver in drivers:
-        cursor.execute("""
-            INSERT INTO drivers (
-                DriverId, SiteId, Name, ImageUri, FmDriverId,
-                EmployeeNumber, IsSystemDriver, MobileNumber, Email,
-                ExtendedDriverId, ExtendedDriverIdType, Country, AdditionalDetailFields
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                SiteId=VALUES(SiteId),
-                Name=VALUES(Name),
-                ImageUri=VALUES(ImageUri),
-                FmDriverId=VALUES(FmDriverId),
-                EmployeeNumber=VALUES(EmployeeNumber),
-                IsSystemDriver=VALUES(IsSystemDriver),
-                MobileNumber=VALUES(MobileNumber),
-                Email=VALUES(Email),
-                ExtendedDriverId=VALUES(ExtendedDriverId),
-                ExtendedDriverIdType=VALUES(ExtendedDriverIdType),
-                Country=VALUES(Country),
-                AdditionalDetailFields=VALUES(AdditionalDetailFields)
-        """, (
-            driver.get("DriverId"),
-            driver.get("SiteId"),
-            driver.get("Name"),
-            driver.get("ImageUri"),
-            driver.get("FmDriverId"),
-            driver.get("EmployeeNumber"),
-            driver.get("IsSystemDriver"),
-            driver.get("MobileNumber"),
-            driver.get("Email"),
-            driver.get("ExtendedDriverId"),
-            driver.get("ExtendedDriverIdType"),
-            driver.get("Country"),
-            json.dumps(driver.get("AdditionalDetailFields")) if driver.get("AdditionalDetailFields") else None
-        ))
-
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print(f"✅ {len(drivers)} drivers importados/atualizados com sucesso.")
+    try:
+        _, gravados, falhas, segundos = gravar_alterados(
+            cursor,
+            ESQUEMA_DRIVER,
+            ESQUEMA_DRIVER.extrair_lote(drivers),
+            identificar=lambda linha: f"DriverId {linha[0]}",
+            prefixo="[DRIVERS]",
+            forcar=forcar,
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    print(f"✅ {gravados} drivers gravados (novos/alterados) ({formatar_vazao(gravados, segundos)}).")
@@ -1,20 +1,20 @@
-import requests
 import os
 from dotenv import load_dotenv
+from core import cliente_mix
 from core.db import conectar_banco
-from core.auth import autenticar
+from core.metricas import metricas
+from core.registro_eventos import registro_eventos
 
 load_dotenv()
 
-BASE_URL = os.getenv("MIX_API_URL", "https://integrate.us.mixtelematics.com")
 ORGANISATION_ID = os.getenv("MIX_ORGANISATION_ID", "5264698351645850280")
 
-def buscar_tipos_eventos(token):
-    headers = {"Authorization": f"Bearer {token}"}
-    url = f"{BASE_URL}/api/libraryevents/organisation/{ORGANISATION_ID}"
-    response = requests.get(url, headers=headers)
+def buscar_tipos_eventos():
+    url = f"/api/libraryevents/organisation/{ORGANISATION_ID}"
+    response = cliente_mix.get(url, cache=True)
     response.raise_for_status()
-    return response.json()
+    with metricas.medir("mix_decodificacao_segundos"):
+        return response.json()
 
 def inserir_tipos_eventos(cursor, tipo):
     sql = """
@@ -44,8 +44,7 @@ def inserir_tipos_eventos(cursor, tipo):
     return cursor.rowcount > 0
 
 def importar_tipos_eventos():
-    token = autenticar()
-    tipos = buscar_tipos_eventos(token)
+    tipos = buscar_tipos_eventos()
 
     if not tipos:
         print("Nenhum tipo de evento encontrado.")
@@ -64,5 +63,7 @@ def importar_tipos_eventos():
     conn.commit()
     cursor.close()
     conn.close()
+    # Tipos (Tr) novos passam a ser importados já na próxima página de eventos
+    registro_eventos.invalidar()
 
     print(f"{atualizados} tipos de eventos (Tr) atualizados ou inseridos no banco.")
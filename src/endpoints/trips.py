@@ -1,9 +1,17 @@
 import os
-import requests
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from core import cliente_mix
+from core.arquivo_bruto import arquivar_pagina
 from core.auth import autenticar
-from core.db import conectar_banco
+from core.config import DRENAR_MAX_PAGINAS, DRENAR_MAX_SEGUNDOS, JSON_STREAMING, LOTE_INSERT_TAMANHO
+from core.carga_massa import gravar_linhas, tamanho_bloco
+from core.db_utils import formatar_vazao
+from core.json_stream import iterar_itens, em_blocos
+from core.metricas import metricas
+from core.esquema import ESQUEMAS
+from core.pipeline import executar_pipeline
+from core.spool import spool
 from core.since_token import (
     datetime_para_token,
     gerar_token_relativo_info,
@@ -11,6 +19,9 @@ from core.since_token import (
     token_para_datetime,
     validar_idade_token,
     formatar_timedelta,
+    ler_checkpoint,
+    salvar_checkpoint,
+    gravar_token_arquivo,
 )
 
 load_dotenv()
@@ -19,7 +30,9 @@ BASE_URL = os.getenv("MIX_API_URL")
 ORGANISATION_ID = os.getenv("MIX_ORGANISATION_ID")
 QUANTITY = 1000
 SINCE_TOKEN_FILE = "since_tokens/since_token_trips.txt"
+CHECKPOINT_TIPO = "trips"
 FUSO_MANAUS = timezone(timedelta(hours=-4))
+ESQUEMA_TRIP = ESQUEMAS["trips"]
 
 def _format_token_debug(token):
     if not token:
@@ -33,15 +46,19 @@ def since_token_path():
     return SINCE_TOKEN_FILE
 
 def carregar_since_token():
-    path = since_token_path()
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return f.read().strip()
+    # Páginas no spool já foram buscadas: segue do token da mais recente
+    token = spool.ultimo_token(CHECKPOINT_TIPO)
+    if token:
+        print(f"[TRIPS] 📌 SinceToken carregado do spool ({spool.pendentes(CHECKPOINT_TIPO)} página(s) pendente(s)).")
+        return token
+    token, origem = ler_checkpoint(CHECKPOINT_TIPO, since_token_path())
+    if token:
+        print(f"[TRIPS] 📌 SinceToken carregado do {origem}.")
+        return token
     return gerar_since_token()
 
 def salvar_since_token(token):
-    with open(since_token_path(), "w") as f:
-        f.write(token)
+    salvar_checkpoint(CHECKPOINT_TIPO, token, since_token_path())
 
 def gerar_since_token(horas=24):
     token, dt_manaus, dt_utc = gerar_token_relativo_info(horas)
@@ -78,35 +95,17 @@ def garantir_token_na_janela(token_atual):
     print(f"[TRIPS] 🔁 Novo since_token gerado automaticamente: {novo_token} ({traduzir_token(novo_token)})")
     return novo_token
 
-def importar_trips():
-    print("\n######## TRIPS ########")
-    print("🧭 Importando viagens (trips)...")
-    # print(f"[TRIPS][DEBUG] BASE_URL={BASE_URL} | ORGANISATION_ID={ORGANISATION_ID} | QUANTITY={QUANTITY}")
-    # print(f"[TRIPS][DEBUG] SinceToken file: {since_token_path()} (abs: {os.path.abspath(since_token_path())})")
-    token_api = autenticar()
-    # print(f"[TRIPS][DEBUG] Token recebido: {_format_token_debug(token_api)}")
-    since_token = carregar_since_token()
-    since_token = garantir_token_na_janela(since_token)
-    print(f"[TRIPS] SinceToken em uso: {since_token}")
-    dt_utc = token_para_datetime(since_token)
-    if dt_utc:
-        dt_manaus = dt_utc.astimezone(FUSO_MANAUS)
-        print(f"[TRIPS] • UTC/Londres (+0): {dt_utc.strftime('%d/%m/%Y %H:%M:%S')}")
-        print(f"[TRIPS] • Manaus (-4): {dt_manaus.strftime('%d/%m/%Y %H:%M:%S')}")
-    else:
-        print("[TRIPS] • Não foi possível interpretar o since_token.")
-    print("--------------------------------------------------")
+def buscar_pagina_trips(since_token):
+    """Busca uma página de trips.
 
-    url = f"{BASE_URL}/api/trips/groups/createdsince/organisation/{ORGANISATION_ID}/sincetoken/{since_token}/quantity/{QUANTITY}"
-    headers = {
-        "Authorization": f"Bearer {token_api}",
-        "Accept": "application/json"
-    }
+    Retorna (trips, novo_token, has_more) ou None se a página não pôde ser lida.
+    Com JSON_STREAMING, `trips` é um iterador lido direto do corpo da resposta.
+    """
+    url = f"/api/trips/groups/createdsince/organisation/{ORGANISATION_ID}/sincetoken/{since_token}/quantity/{QUANTITY}"
 
     # print(f"[TRIPS][DEBUG] URL requisitada: {url}")
-    # print(f"[TRIPS][DEBUG] Headers enviados: {{'Authorization': 'Bearer {_format_token_debug(token_api)}', 'Accept': 'application/json'}}")
     try:
-        response = requests.get(url, headers=headers, timeout=60)
+        response = cliente_mix.get(url, stream=JSON_STREAMING)
     except Exception as exc:
         # print(f"[TRIPS][DEBUG] Falha na requisição: {exc}")
         raise
@@ -115,14 +114,23 @@ def importar_trips():
     if response.status_code not in (200, 206):
         print(f"[TRIPS] ❌ Erro ao buscar trips: {response.status_code}")
         # print(f"[TRIPS][DEBUG] Corpo de erro: {response.text}")
-        return
+        return None
+
+    novo_token = response.headers.get("GetSinceToken")
+    has_more = response.headers.get("HasMoreItems", "False") == "True"
+
+    if JSON_STREAMING:
+        print(f"[TRIPS] 📥 Recebendo trips em streaming | HasMoreItems: {has_more}")
+        itens = iterar_itens(response, ("Items",))
+        return arquivar_pagina(CHECKPOINT_TIPO, since_token, response, itens, novo_token, has_more), novo_token, has_more
 
     try:
-        trips_data = response.json()
+        with metricas.medir("mix_decodificacao_segundos"):
+            trips_data = response.json()
     except Exception as e:
         print(f"[TRIPS] ❌ Erro ao interpretar JSON: {e}")
         # print(f"[TRIPS][DEBUG] Corpo bruto: {response.text}")
-        return
+        return None
 
     items = trips_data if isinstance(trips_data, list) else trips_data.get("Items", [])
     # print(f"[TRIPS][DEBUG] Tipo de resposta: {type(trips_data)} | Chaves: {list(trips_data.keys()) if isinstance(trips_data, dict) else 'n/a'}")
@@ -130,84 +138,106 @@ def importar_trips():
     if not items:
         print("[TRIPS] ⚠️ Nenhuma trip retornada.")
         # print(f"[TRIPS][DEBUG] Conteúdo integral: {trips_data}")
-        return
+    else:
+        print(f"[TRIPS] ➕ {len(items)} trips recebidas")
+        percentual = (min(len(items), QUANTITY) / QUANTITY) * 100
+        print(f"[TRIPS] Progresso: {percentual:.1f}% do lote")
+    print(f"[TRIPS] HasMoreItems: {has_more}")
+    items = arquivar_pagina(CHECKPOINT_TIPO, since_token, response, items, novo_token, has_more)
+    return items, novo_token, has_more
+
+def gravar_trips(items, novo_token=None):
+    """Grava as trips em blocos de LOTE_INSERT_TAMANHO; aceita lista ou iterador.
 
-    print(f"[TRIPS] ➕ {len(items)} trips recebidas")
-    percentual = (min(len(items), QUANTITY) / QUANTITY) * 100
-    print(f"[TRIPS] Progresso: {percentual:.1f}% do lote")
+    O novo_token, se informado, é gravado na mesma transação das trips.
+    Se o MySQL estiver fora, a página vai para o spool (core.spool).
+    Retorna a quantidade de trips lidas.
+    """
+    if isinstance(items, list) and not items and not novo_token:
+        return 0
+    return spool.gravar(CHECKPOINT_TIPO, _gravar_trips_banco, items, novo_token)
 
-    # print("[TRIPS][DEBUG] Abrindo conexão com o banco...")
-    conn = conectar_banco()
+def _gravar_trips_banco(conn, items, novo_token=None):
     cursor = conn.cursor()
     # print("[TRIPS][DEBUG] Conexão estabelecida, iniciando inserções...")
 
-    inseridas, ignoradas = 0, 0
-
-    for trip in items:
-        try:
-            cursor.execute("""
-                INSERT INTO trips (
-                    TripId, AssetId, DistanceKilometers, DriverId, DrivingTime,
-                    Duration, EndEngineSeconds, EndOdometerKilometers, EngineSeconds,
-                    FirstDepart, FuelUsedLitres, LastHalt,
-                    MaxAccelerationKilometersPerHourPerSecond, MaxDecelerationKilometersPerHourPerSecond,
-                    MaxRpm, MaxSpeedKilometersPerHour, Notes, PulseValue,
-                    StandingTime, StartEngineSeconds, StartOdometerKilometers,
-                    TripEnd, TripStart
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    AssetId=VALUES(AssetId),
-                    DriverId=VALUES(DriverId),
-                    TripEnd=VALUES(TripEnd)
-            """, (
-                trip.get("TripId"),
-                trip.get("AssetId"),
-                trip.get("DistanceKilometers"),
-                trip.get("DriverId"),
-                trip.get("DrivingTime"),
-                trip.get("Duration"),
-                trip.get("EndEngineSeconds"),
-                trip.get("EndOdometerKilometers"),
-                trip.get("EngineSeconds"),
-                converter_utc_para_manaus(trip.get("FirstDepart")),
-                trip.get("FuelUsedLitres"),
-                converter_utc_para_manaus(trip.get("LastHalt")),
-                trip.get("MaxAccelerationKilometersPerHourPerSecond"),
-                trip.get("MaxDecelerationKilometersPerHourPerSecond"),
-                trip.get("MaxRpm"),
-                trip.get("MaxSpeedKilometersPerHour"),
-                trip.get("Notes"),
-                trip.get("PulseValue"),
-                trip.get("StandingTime"),
-                trip.get("StartEngineSeconds"),
-                trip.get("StartOdometerKilometers"),
-                converter_utc_para_manaus(trip.get("TripEnd")),
-                converter_utc_para_manaus(trip.get("TripStart"))
-            ))
-            inseridas += 1
-        except Exception as e:
-            ignoradas += 1
-            print(f"[TRIPS] ⚠️ Erro ao inserir TripId {trip.get('TripId')}: {e}")
-
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-    print(f"[TRIPS] ✅ Incluídas: {inseridas} | Ignoradas: {ignoradas}")
-
-    novo_token = response.headers.get("GetSinceToken")
-    proximo_legivel = None
-    has_more = response.headers.get("HasMoreItems", "False") == "True"
-    print(f"[TRIPS] HasMoreItems: {has_more}")
+    total, inseridas, ignoradas, segundos = 0, 0, 0, 0.0
+    try:
+        for bloco in em_blocos(items, tamanho_bloco(items, LOTE_INSERT_TAMANHO)):
+            total += len(bloco)
+            gravadas, falhas, duracao = gravar_linhas(
+                cursor,
+                ESQUEMA_TRIP,
+                ESQUEMA_TRIP.extrair_lote(bloco),
+                identificar=lambda linha: f"TripId {linha[0]}",
+                prefixo="[TRIPS]",
+            )
+            inseridas += gravadas
+            ignoradas += falhas
+            segundos += duracao
+        if novo_token:
+            salvar_checkpoint(CHECKPOINT_TIPO, novo_token, cursor=cursor)
+        conn.commit()
+    finally:
+        cursor.close()
+
+    print(f"[TRIPS] ✅ Incluídas: {inseridas} | Ignoradas: {ignoradas} ({formatar_vazao(inseridas, segundos)})")
+    return total
+
+def importar_trips(drenar=True, max_paginas=None, max_segundos=None, reiniciar_no_fim=True):
+    """Importa trips seguindo o GetSinceToken, com o mesmo pipeline dos eventos."""
+    print("\n######## TRIPS ########")
+    print("🧭 Importando viagens (trips)...")
+    # print(f"[TRIPS][DEBUG] BASE_URL={BASE_URL} | ORGANISATION_ID={ORGANISATION_ID} | QUANTITY={QUANTITY}")
+    # print(f"[TRIPS][DEBUG] SinceToken file: {since_token_path()} (abs: {os.path.abspath(since_token_path())})")
+    if max_paginas is None:
+        max_paginas = DRENAR_MAX_PAGINAS if drenar else 1
+    if max_segundos is None:
+        max_segundos = DRENAR_MAX_SEGUNDOS
+
+    # Aquece o cache do token: credencial inválida falha aqui, antes do pipeline
+    autenticar()
+    spool.drenar(CHECKPOINT_TIPO)
+    since_token = carregar_since_token()
+    since_token = garantir_token_na_janela(since_token)
+    print(f"[TRIPS] SinceToken em uso: {since_token}")
+    dt_utc = token_para_datetime(since_token)
+    if dt_utc:
+        dt_manaus = dt_utc.astimezone(FUSO_MANAUS)
+        print(f"[TRIPS] • UTC/Londres (+0): {dt_utc.strftime('%d/%m/%Y %H:%M:%S')}")
+        print(f"[TRIPS] • Manaus (-4): {dt_manaus.strftime('%d/%m/%Y %H:%M:%S')}")
+    else:
+        print("[TRIPS] • Não foi possível interpretar o since_token.")
+    print("--------------------------------------------------")
 
-    if novo_token:
-        salvar_since_token(novo_token)
-        proximo_legivel = traduzir_token(novo_token)
+    resultado = executar_pipeline(
+        buscar=buscar_pagina_trips,
+        gravar=gravar_trips,
+        salvar_token=lambda token: gravar_token_arquivo(since_token_path(), token),
+        since_token=since_token,
+        max_paginas=max_paginas,
+        max_segundos=max_segundos,
+        tamanho_pagina=QUANTITY,
+        prefixo="[TRIPS]",
+    )
+    print(f"[TRIPS] 📚 {resultado.paginas} página(s) em {resultado.segundos:.1f}s")
+    if resultado.erro:
+        return resultado
+
+    has_more = resultado.has_more
+    proximo_legivel = traduzir_token(resultado.ultimo_token) if resultado.ultimo_token else None
 
     if has_more:
         complemento = f" (próximo lote a partir de {proximo_legivel})" if proximo_legivel else ""
         print(f"[TRIPS] 🔁 Ainda existem dados pendentes.{complemento}")
         print("[TRIPS] ▶️ Rode novamente para continuar a importação.")
-    else:
+    elif reiniciar_no_fim:
         print("[TRIPS] 🚫 Fim dos dados. Próxima execução usará token das últimas 24h.")
         salvar_since_token(gerar_since_token())
+    else:
+        print("[TRIPS] 🚫 Fim dos dados. Próxima execução continua do último GetSinceToken.")
+
+    return resultado
+
+
+spool.registrar(CHECKPOINT_TIPO, _gravar_trips_banco)
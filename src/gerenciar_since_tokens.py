@@ -12,6 +12,8 @@ from core.since_token import (
     formatar_timedelta,
     validar_idade_token,
     timezone_from_name,
+    ler_checkpoint,
+    salvar_checkpoint,
     FUSO_MANAUS,
 )
 
@@ -58,16 +60,14 @@ def parse_datetime(value: str, tz: timezone) -> datetime:
     raise ValueError(f"Formato inválido para data/hora: {value}")
 
 
-def ler_token(path: Path) -> Optional[str]:
-    if not path.exists():
-        return None
-    conteudo = path.read_text(encoding="utf-8").strip()
-    return conteudo or None
+def ler_token(tipo: str) -> Tuple[Optional[str], str]:
+    """Lê o token do checkpoint (tabela since_tokens, com fallback no arquivo)."""
+    return ler_checkpoint(tipo, SINCE_TOKEN_MAP[tipo])
 
 
 def analisar_token(tipo: str) -> dict:
     path = SINCE_TOKEN_MAP[tipo]
-    token = ler_token(path)
+    token, origem = ler_token(tipo)
     valido, dt, idade, limite = validar_idade_token(token)
     if idade:
         idade_txt = formatar_timedelta(idade)
@@ -78,6 +78,7 @@ def analisar_token(tipo: str) -> dict:
     return {
         "tipo": tipo,
         "path": path,
+        "origem": origem,
         "token": token,
         "valido": valido and token is not None,
         "dt": dt,
@@ -90,10 +91,10 @@ def analisar_token(tipo: str) -> dict:
 
 def formatar_status(info: dict) -> str:
     if not info["token"]:
-        return f"Nenhum since_token salvo em {info['path']}"
+        return f"Nenhum since_token salvo (tabela since_tokens ou {info['path']})"
     status = "OK" if info["valido"] else "FORA DA JANELA"
     detalhes = [
-        f"Token: {info['token']}",
+        f"Token: {info['token']} (origem: {info['origem']})",
         f"Data local: {info['traduzido']}",
         f"Idade: {info['idade_txt']} | Limite: {formatar_timedelta(info['limite'])}",
         f"Situação: {status}",
@@ -110,9 +111,8 @@ def mostrar_atual(tipo: str):
 
 def salvar_token(tipo: str, token: str):
     destino = SINCE_TOKEN_MAP[tipo]
-    destino.parent.mkdir(parents=True, exist_ok=True)
-    destino.write_text(token, encoding="utf-8")
-    print(f"[{tipo.upper()}] ✅ Token salvo em {destino}")
+    salvar_checkpoint(tipo, token, destino)
+    print(f"[{tipo.upper()}] ✅ Token salvo (tabela since_tokens e {destino})")
 
 
 def confirmar(mensagem: str) -> bool:
@@ -308,7 +308,7 @@ def executar_ui():
 
 def construir_parser():
     parser = argparse.ArgumentParser(
-        description="Gera e gerencia arquivos de since_token para os importadores."
+        description="Gera e gerencia os since_tokens (tabela since_tokens e arquivos) dos importadores."
     )
     parser.add_argument("--tipo", choices=SINCE_TOKEN_MAP.keys(), required=True, help="Qual since_token deseja manipular.")
     parser.add_argument("--inicio", help="Data/hora inicial (ex: 2025-12-10 08:00 ou 10/12/2025 08:00).")
@@ -1,27 +1,20 @@
 import os
 import json
-import requests
-from core.auth import autenticar
+from core import cliente_mix
 from core.db import conectar_banco
 from dotenv import load_dotenv
 
 load_dotenv()
 
 def buscar_drivers():
-    token = autenticar()
     organisation_id = os.getenv("MIX_ORGANISATION_ID")
 
     if not organisation_id:
         print("⚠️ ORGANISATION_ID não definido no .env")
         return
 
-    url = f"{os.getenv('MIX_API_URL')}/api/drivers/organisation/{organisation_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json"
-    }
-
-    response = requests.get(url, headers=headers)
+    url = f"/api/drivers/organisation/{organisation_id}"
+    response = cliente_mix.get(url, cache=True)
     if response.status_code != 200:
         print(f"Erro ao buscar drivers: {response.status_code} - {response.text}")
         return
@@ -34,20 +27,14 @@ def buscar_drivers():
     print(f"✅ JSON de drivers salvo com sucesso.")
 
 def buscar_driverlicence_group():
-    token = autenticar()
     group_id = os.getenv("MIX_ORGANISATION_ID")
 
     if not group_id:
         print("⚠️ GROUP_ID não definido no .env")
         return
 
-    url = f"{os.getenv('MIX_API_URL')}/api/driverlicence/group/{group_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json"
-    }
-
-    response = requests.get(url, headers=headers)
+    url = f"/api/driverlicence/group/{group_id}"
+    response = cliente_mix.get(url, cache=True)
     if response.status_code != 200:
         print(f"Erro ao buscar driver licences: {response.status_code} - {response.text}")
         return
@@ -0,0 +1,94 @@
+import argparse
+from datetime import datetime
+
+from core.db import conectar_banco
+from core.registro_eventos import registro_eventos
+from core.tabela_eventos import (
+    TABELA_UNICA,
+    copiar_tabela,
+    garantir_particoes,
+    menor_data,
+    sql_view,
+    tipo_da_tabela,
+)
+
+SUFIXO_LEGADO = "_legado"
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        description=f"Migra as tabelas tr_* para a tabela única {TABELA_UNICA} (particionada por mês)."
+    )
+    parser.add_argument("--desde", help="Primeiro mês das partições (AAAA-MM). Padrão: menor StartDateTime das tr_*.")
+    parser.add_argument("--bloco", type=int, default=50000, help="Linhas copiadas por transação.")
+    parser.add_argument("--sem-views", action="store_true",
+                        help=f"Só copia os dados; mantém as tr_* como tabelas (sem renomear para *{SUFIXO_LEGADO}).")
+    parser.add_argument("--particoes", action="store_true",
+                        help="Só cria as partições dos próximos meses (manutenção) e sai.")
+    return parser
+
+
+def migrar_tabela(conn, tabela, tipo_id, bloco, criar_view):
+    cursor = conn.cursor()
+    try:
+        situacao = tipo_da_tabela(cursor, tabela)
+    finally:
+        cursor.close()
+
+    if situacao == "VIEW":
+        print(f"⏭️  {tabela}: já é view de {TABELA_UNICA}.")
+        return 0
+    if situacao is None:
+        if criar_view:
+            cursor = conn.cursor()
+            cursor.execute(sql_view(tabela, tipo_id))
+            cursor.close()
+            print(f"🪟 {tabela}: não existia, view criada.")
+        return 0
+
+    copiadas, ultimo_id = copiar_tabela(conn, tabela, bloco)
+    if not criar_view:
+        print(f"📦 {tabela}: {copiadas} linhas copiadas.")
+        return copiadas
+
+    legado = f"{tabela}{SUFIXO_LEGADO}"
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"RENAME TABLE {tabela} TO {legado}")
+        cursor.execute(sql_view(tabela, tipo_id))
+    finally:
+        cursor.close()
+    # Linhas gravadas entre a cópia e o RENAME
+    extras, _ = copiar_tabela(conn, legado, bloco, a_partir_de=ultimo_id)
+    print(f"📦 {tabela}: {copiadas + extras} linhas copiadas; tabela original em {legado}, view criada.")
+    return copiadas + extras
+
+
+def main():
+    args = construir_parser().parse_args()
+    conn = conectar_banco()
+    try:
+        cursor = conn.cursor()
+        if args.particoes:
+            garantir_particoes(cursor, forcar=True)
+            cursor.close()
+            return
+
+        tipos = registro_eventos.tipos()
+        desde = datetime.strptime(args.desde, "%Y-%m").date() if args.desde else None
+        desde = desde or menor_data(cursor, [tipo.tabela for tipo in tipos.values()])
+        garantir_particoes(cursor, desde=desde, forcar=True)
+        cursor.close()
+
+        print(f"🚚 Migrando {len(tipos)} tabelas tr_* para {TABELA_UNICA}...")
+        total = 0
+        for tipo_id, tipo in tipos.items():
+            total += migrar_tabela(conn, tipo.tabela, tipo_id, args.bloco, not args.sem_views)
+        conn.commit()
+        print(f"✅ {total} linhas migradas. Ligue EVENTOS_TABELA_UNICA=1 no .env.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
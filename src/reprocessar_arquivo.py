@@ -0,0 +1,103 @@
+import argparse
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.arquivo_bruto import listar_segmentos, ler_segmento
+from core.carga_massa import Acumulador
+from core.config import ARQUIVO_BRUTO_PASTA, IMPORTADORES_PARALELISMO
+from core.db import gravar_direto
+from core.db_utils import formatar_vazao
+
+TIPOS = ("eventos", "trips")
+
+
+def _gravadores():
+    # Import tardio: só carrega o importador do tipo pedido. Grava direto no
+    # MySQL (sem spool): com o banco fora o segmento falha, não vai para a fila
+    from core.importador_lote import _gravar_eventos_banco
+    from endpoints.trips import _gravar_trips_banco
+    return {
+        "eventos": functools.partial(gravar_direto, _gravar_eventos_banco),
+        "trips": functools.partial(gravar_direto, _gravar_trips_banco),
+    }
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(
+        description="Regrava no banco as páginas do arquivo bruto, sem chamar a MiX."
+    )
+    parser.add_argument("--tipo", choices=TIPOS, required=True, help="Arquivo a reprocessar.")
+    parser.add_argument("--de", help="Primeira hora UTC (AAAAMMDDTHH ou AAAAMMDD).")
+    parser.add_argument("--ate", help="Última hora UTC (AAAAMMDDTHH ou AAAAMMDD), inclusive.")
+    parser.add_argument("--pasta", default=ARQUIVO_BRUTO_PASTA, help="Pasta do arquivo bruto.")
+    parser.add_argument("--paralelismo", type=int, default=IMPORTADORES_PARALELISMO,
+                        help="Segmentos reprocessados ao mesmo tempo.")
+    parser.add_argument("arquivos", nargs="*", help="Segmentos específicos (ignora --de/--ate).")
+    return parser
+
+
+def filtrar_segmentos(segmentos, tipo, de=None, ate=None):
+    """Filtra pelo carimbo de hora do nome (<tipo>-AAAAMMDDTHH-NNNN...)."""
+    selecionados = []
+    for caminho in segmentos:
+        hora = os.path.basename(caminho)[len(tipo) + 1:len(tipo) + 12]
+        if de and hora < de:
+            continue
+        if ate and hora[:len(ate)] > ate:
+            continue
+        selecionados.append(caminho)
+    return selecionados
+
+
+def reprocessar_segmento(caminho, gravar):
+    """Grava todas as páginas do segmento; o since_token não é tocado.
+
+    As páginas são acumuladas até CARGA_EM_MASSA_MIN_LINHAS para usar a carga
+    em massa (core.carga_massa).
+    """
+    paginas, itens = 0, 0
+    inicio = time.perf_counter()
+    acumulador = Acumulador(gravar)
+    for registro in ler_segmento(caminho):
+        itens += acumulador.adicionar(registro.get("itens") or [])
+        paginas += 1
+    acumulador.descarregar()
+    return paginas, itens, time.perf_counter() - inicio
+
+
+def main():
+    args = construir_parser().parse_args()
+    segmentos = args.arquivos or filtrar_segmentos(listar_segmentos(args.tipo, args.pasta), args.tipo, args.de, args.ate)
+    if not segmentos:
+        print("⚠️ Nenhum segmento encontrado.")
+        return
+
+    gravar = _gravadores()[args.tipo]
+    print(f"[REPROCESSAR {args.tipo.upper()}] 📂 {len(segmentos)} segmento(s), paralelismo={args.paralelismo}")
+    comeco = time.perf_counter()
+    total_paginas, total_itens, erros = 0, 0, 0
+    with ThreadPoolExecutor(max_workers=max(1, args.paralelismo), thread_name_prefix="reprocessar") as pool:
+        futuros = {pool.submit(reprocessar_segmento, caminho, gravar): caminho for caminho in segmentos}
+        for futuro in as_completed(futuros):
+            nome = os.path.basename(futuros[futuro])
+            try:
+                paginas, itens, segundos = futuro.result()
+            except Exception as exc:
+                erros += 1
+                print(f"  ❌ {nome}: {exc}")
+                continue
+            total_paginas += paginas
+            total_itens += itens
+            print(f"  ✅ {nome}: {paginas} páginas, {itens} itens em {segundos:.1f}s")
+
+    segundos = time.perf_counter() - comeco
+    print(f"[REPROCESSAR {args.tipo.upper()}] 📊 {total_paginas} páginas, {total_itens} itens em {segundos:.1f}s "
+          f"({formatar_vazao(total_itens, segundos)}) | segmentos com erro: {erros}")
+    if erros:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,34 @@
-import os
+import argparse
 from core.auth import autenticar
-from core.importador_lote import importar_eventos_lote
-from endpoints.drivers import importar_drivers
-from endpoints.assets import importar_assets
-from endpoints.trips import importar_trips
-from endpoints.subtrips import importar_subtrips
-from endpoints.tipos_eventos import importar_tipos_eventos
+from core.config import IMPORTADORES_PARALELISMO
+from core.executor import executar_importadores
+from core.importadores import IMPORTADORES
+
+PADRAO = ["eventos", "trips"]
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(description="Executa os importadores da MiX em paralelo.")
+    parser.add_argument("importadores", nargs="*", metavar="IMPORTADOR",
+                        help=f"Importadores a executar: {', '.join(IMPORTADORES)} (padrão: {' '.join(PADRAO)}).")
+    parser.add_argument("--todos", action="store_true", help="Executa todos os importadores.")
+    parser.add_argument("--paralelismo", type=int, default=IMPORTADORES_PARALELISMO,
+                        help="Quantidade máxima de importadores simultâneos.")
+    return parser
 
 
 if __name__ == "__main__":
+    parser = construir_parser()
+    args = parser.parse_args()
+    nomes = list(IMPORTADORES) if args.todos else (args.importadores or PADRAO)
+    desconhecidos = [nome for nome in nomes if nome not in IMPORTADORES]
+    if desconhecidos:
+        parser.error(f"Importador(es) desconhecido(s): {', '.join(desconhecidos)}")
+
     print("🔐 Autenticando na API...")
     autenticar()
-    
-    # print("📄 Importando tipos de eventos...")
-    # importar_tipos_eventos()
-    
-    print("\n🚚 Importando eventos TR...")
-    importar_eventos_lote()
-
-    # print("\n👨‍✈️ Importando motoristas...")
-    # importar_drivers()
-
-    # print("\n🚗 Importando ativos (assets)...")
-    # importar_assets()
 
-    print("\n🧭 Importando viagens (trips)...")
-    importar_trips()
+    print(f"\n🚚 Importando: {', '.join(nomes)} (paralelismo={args.paralelismo})")
+    executar_importadores({nome: IMPORTADORES[nome] for nome in nomes}, args.paralelismo)
 
     print("\n✅ Importação completa.")
@@ -158,3 +158,51 @@ CREATE TABLE IF NOT EXISTS subtrips (
     EndLatitude DECIMAL(10,8),
     EndLongitude DECIMAL(11,8)
 );
+
+CREATE TABLE IF NOT EXISTS since_tokens (
+    tipo VARCHAR(50) PRIMARY KEY,
+    token VARCHAR(32) NOT NULL,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS hashes_entidades (
+    entidade VARCHAR(50) NOT NULL,
+    chave VARCHAR(64) NOT NULL,
+    hash CHAR(32) NOT NULL,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (entidade, chave)
+);
+
+-- Modo tabela única (EVENTOS_TABELA_UNICA=1): criada e particionada por
+-- core/tabela_eventos.py / migrar_eventos_tr.py; as tr_* viram views.
+CREATE TABLE IF NOT EXISTS eventos_tr (
+    AssetId BIGINT,
+    DriverId BIGINT,
+    EventId BIGINT NOT NULL,
+    EventTypeId BIGINT,
+    EventCategory VARCHAR(100),
+    StartDateTime DATETIME NOT NULL,
+    StartLatitude DECIMAL(10,8),
+    StartLongitude DECIMAL(11,8),
+    StartSpeedKph DECIMAL(6,2),
+    StartOdometer DECIMAL(10,2),
+    EndDateTime DATETIME,
+    EndLatitude DECIMAL(10,8),
+    EndLongitude DECIMAL(11,8),
+    EndSpeedKph DECIMAL(6,2),
+    EndOdometer DECIMAL(10,2),
+    Value DECIMAL(10,6),
+    FuelUsedLitres DECIMAL(10,6),
+    ValueType VARCHAR(100),
+    ValueUnits VARCHAR(100),
+    TotalTimeSeconds INT,
+    TotalOccurances INT,
+    SpeedLimit INT,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (EventId, StartDateTime),
+    KEY idx_tipo_data (EventTypeId, StartDateTime),
+    KEY idx_asset_data (AssetId, StartDateTime)
+)
+PARTITION BY RANGE (TO_DAYS(StartDateTime)) (
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
@@ -0,0 +1,55 @@
+import os
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from core.cache_http import CacheHttp
+
+URL = "https://api.exemplo/api/assets/organisation/1"
+
+
+def _resposta(corpo, etag=None):
+    response = Response()
+    response.status_code = 200
+    response._content = corpo
+    response.encoding = "utf-8"
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+def test_salvar_e_ler(tmp_path):
+    cache = CacheHttp(pasta=str(tmp_path), ttl=60, max_bytes=10_000)
+    cache.salvar(URL, _resposta(b'[{"AssetId": 1}]', etag='"v1"'))
+    meta, corpo = cache.ler(URL)
+    assert corpo == b'[{"AssetId": 1}]'
+    assert cache.cabecalhos_condicionais(meta) == {"If-None-Match": '"v1"'}
+    response = CacheHttp.resposta(URL, meta, corpo)
+    assert response.from_cache and response.json() == [{"AssetId": 1}]
+    assert cache.ler(URL + "?outra=1") is None
+
+
+def test_ttl_e_revalidacao(tmp_path):
+    cache = CacheHttp(pasta=str(tmp_path), ttl=60, max_bytes=10_000)
+    meta = cache.salvar(URL, _resposta(b"[]"))
+    assert cache.fresca(meta)
+    vencida = dict(meta, validado_em=meta["validado_em"] - 61)
+    assert not cache.fresca(vencida)
+    assert cache.fresca(cache.revalidada(URL, vencida))
+    assert cache.fresca(cache.ler(URL)[0])
+
+
+def test_despeja_as_menos_usadas(tmp_path):
+    cache = CacheHttp(pasta=str(tmp_path), ttl=60, max_bytes=250)
+    urls = [f"{URL}?pagina={i}" for i in range(3)]
+    for idade, url in zip((300, 200), urls):
+        cache.salvar(url, _resposta(b"x" * 100))
+        corpo = cache._caminhos(url)[1]
+        os.utime(corpo, (os.path.getmtime(corpo) - idade,) * 2)
+    # A mais antiga foi lida agora: passa a ser a mais recente
+    assert cache.ler(urls[0]) is not None
+    cache.salvar(urls[2], _resposta(b"x" * 100))
+    assert cache.ler(urls[1]) is None
+    assert cache.ler(urls[0]) is not None and cache.ler(urls[2]) is not None
+    assert not any(nome.endswith(".tmp") for nome in os.listdir(tmp_path))
@@ -0,0 +1,55 @@
+from core.esquema import Coluna, Entidade, TRIPS
+
+
+def _entidade(**kwargs):
+    return Entidade("teste", "teste", [
+        Coluna("Id"),
+        Coluna("Latitude", ("Latitude", "Position.Latitude")),
+        Coluna("Velocidade", "Position.Speed.Kph"),
+        Coluna("Nome", conversor=lambda valor: valor.strip() if valor else None),
+    ], **kwargs)
+
+
+def test_chaves_presentes_e_aninhadas():
+    item = {"Id": 7, "Position": {"Latitude": -3.1, "Speed": {"Kph": 42}}, "Nome": " Ana "}
+    assert _entidade().extrair(item) == (7, -3.1, 42, "Ana")
+
+
+def test_chaves_ausentes_viram_none():
+    assert _entidade().extrair({}) == (None, None, None, None)
+
+
+def test_objeto_aninhado_nulo_ou_ausente():
+    entidade = _entidade()
+    assert entidade.extrair({"Id": 1, "Position": None}) == (1, None, None, None)
+    assert entidade.extrair({"Id": 1, "Position": {"Speed": None}}) == (1, None, None, None)
+    assert entidade.extrair({"Id": 1, "Position": {}}) == (1, None, None, None)
+
+
+def test_alternativas_usam_o_primeiro_valor_nao_nulo():
+    entidade = _entidade()
+    assert entidade.extrair({"Latitude": None, "Position": {"Latitude": -3.2}})[1] == -3.2
+    assert entidade.extrair({"Latitude": 0.0, "Position": {"Latitude": -3.2}})[1] == 0.0
+
+
+def test_extrair_lote_converte_colunas_de_data():
+    itens = [
+        {"TripId": 1, "FirstDepart": "2025-03-01T12:00:00Z"},
+        {"TripId": 2, "FirstDepart": None},
+        {"TripId": 3},
+    ]
+    indice_id = TRIPS.nomes.index("TripId")
+    indice_data = TRIPS.nomes.index("FirstDepart")
+    linhas = TRIPS.extrair_lote(itens)
+    assert [linha[indice_id] for linha in linhas] == [1, 2, 3]
+    assert [linha[indice_data] for linha in linhas] == ["2025-03-01 08:00:00", None, None]
+    assert TRIPS.extrair(itens[0])[indice_data] == "2025-03-01 08:00:00"
+
+
+def test_extrair_lote_vazio():
+    assert TRIPS.extrair_lote([]) == []
+
+
+def test_sql_por_modo():
+    assert _entidade(modo="ignore").sql().startswith("INSERT IGNORE INTO teste (Id, Latitude, Velocidade, Nome)")
+    assert "ON DUPLICATE KEY UPDATE Id=VALUES(Id)" in _entidade().sql()
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from core.json_stream import RespostaInesperada, em_blocos, iterar_itens
+
+
+class RespostaFalsa:
+    """Imita requests.Response com stream=True, entregando o corpo em pedaços de `tamanho` bytes."""
+
+    def __init__(self, corpo, tamanho, encoding="utf-8"):
+        self.corpo = corpo.encode("utf-8") if isinstance(corpo, str) else corpo
+        self.tamanho = tamanho
+        self.encoding = encoding
+
+    def iter_content(self, chunk_size=None):
+        for inicio in range(0, len(self.corpo), self.tamanho):
+            yield self.corpo[inicio:inicio + self.tamanho]
+
+
+EVENTOS = [
+    {"EventId": 1, "Description": "Excesso de velocidade ]", "Position": {"Latitude": -3.1, "Longitude": -60.02}},
+    {"EventId": 2, "Description": "Frenagem, brusca", "Value": 12.5, "Tags": []},
+    {"EventId": 3, "Description": "Condução em área proibida ç ã é", "Value": None},
+]
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 5, 17, 64, 4096])
+def test_objetos_cortados_entre_chunks(tamanho):
+    corpo = json.dumps(EVENTOS, ensure_ascii=False)
+    assert list(iterar_itens(RespostaFalsa(corpo, tamanho))) == EVENTOS
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3])
+def test_numeros_cortados_entre_chunks(tamanho):
+    assert list(iterar_itens(RespostaFalsa("[123, 45678, true, null, -9.75]", tamanho))) == [123, 45678, True, None, -9.75]
+
+
+def test_espacos_e_lista_vazia():
+    assert list(iterar_itens(RespostaFalsa(" \n [ ] \n", 1))) == []
+    assert list(iterar_itens(RespostaFalsa("\n[\n  {\"a\": 1} ,\n  {\"a\": 2}\n]\n", 4))) == [{"a": 1}, {"a": 2}]
+
+
+def test_objeto_com_lista_na_chave():
+    corpo = json.dumps({"Total": 3, "Events": EVENTOS})
+    assert list(iterar_itens(RespostaFalsa(corpo, 7), chaves=("Items", "Events"))) == EVENTOS
+
+
+def test_objeto_sem_a_chave_esperada():
+    with pytest.raises(RespostaInesperada):
+        list(iterar_itens(RespostaFalsa('{"Message": "erro"}', 3), chaves=("Events",)))
+
+
+def test_corpo_vazio():
+    with pytest.raises(RespostaInesperada):
+        list(iterar_itens(RespostaFalsa("", 10)))
+
+
+def test_lista_incompleta():
+    with pytest.raises(RespostaInesperada):
+        list(iterar_itens(RespostaFalsa('[{"a": 1}, ', 4)))
+
+
+def test_item_truncado():
+    with pytest.raises(json.JSONDecodeError):
+        list(iterar_itens(RespostaFalsa('[{"a": 1}, {"b": ', 4)))
+
+
+def test_em_blocos():
+    assert list(em_blocos(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(em_blocos([], 3)) == []
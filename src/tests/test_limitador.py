@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from core.limitador import BaldeTokens, ler_retry_after
+
+
+def test_balde_permite_rajada_ate_a_capacidade():
+    balde = BaldeTokens(3, 1.0)
+    agora = balde._atualizado
+    for _ in range(3):
+        assert balde.espera_necessaria(agora) == 0.0
+        balde.consumir()
+    assert balde.espera_necessaria(agora) == pytest.approx(1.0)
+
+
+def test_balde_repoe_pela_taxa():
+    balde = BaldeTokens(2, 0.5)
+    agora = balde._atualizado
+    balde.consumir()
+    balde.consumir()
+    assert balde.espera_necessaria(agora + 1) == pytest.approx(1.0)
+    assert balde.espera_necessaria(agora + 2) == 0.0
+
+
+def test_balde_nao_passa_da_capacidade():
+    balde = BaldeTokens(2, 10.0)
+    agora = balde._atualizado
+    balde.espera_necessaria(agora + 3600)
+    balde.consumir()
+    balde.consumir()
+    assert balde.espera_necessaria(agora + 3600) > 0
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("30", 30.0),
+    ("0", 0.0),
+    ("1.5", 1.5),
+    ("-5", 0.0),
+    (None, None),
+    ("", None),
+    ("amanhã", None),
+])
+def test_retry_after_em_segundos(valor, esperado):
+    assert ler_retry_after(valor) == esperado
+
+
+def test_retry_after_em_data_http():
+    futuro = datetime.now(timezone.utc) + timedelta(seconds=120)
+    segundos = ler_retry_after(format_datetime(futuro, usegmt=True))
+    assert 100 <= segundos <= 120
+
+
+def test_retry_after_no_passado():
+    passado = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert ler_retry_after(format_datetime(passado, usegmt=True)) == 0.0
@@ -0,0 +1,92 @@
+import pytest
+
+from core import mudancas
+from core.esquema import Coluna, Entidade
+
+ENTIDADE = Entidade("teste_mudancas", "teste_mudancas", [Coluna("Id"), Coluna("Nome")])
+
+
+class CursorFalso:
+    """Guarda os hashes numa dict, como a tabela hashes_entidades."""
+
+    def __init__(self, hashes=None):
+        self.hashes = dict(hashes or {})
+        self._resultado = []
+
+    def execute(self, sql, parametros=None):
+        if sql.lstrip().startswith("SELECT"):
+            self._resultado = list(self.hashes.items())
+
+    def fetchall(self):
+        return self._resultado
+
+    def executemany(self, sql, parametros):
+        for valores in parametros:
+            if sql.lstrip().startswith("DELETE"):
+                self.hashes.pop(valores[1], None)
+            else:
+                self.hashes[valores[1]] = valores[2]
+
+
+@pytest.fixture
+def gravacoes(monkeypatch):
+    gravadas = []
+    falhas = {"quantidade": 0}
+
+    def inserir_em_lotes(cursor, sql, linhas, identificar=None, prefixo="[DB]"):
+        gravadas.append(list(linhas))
+        return len(linhas) - falhas["quantidade"], falhas["quantidade"], 0.0
+
+    monkeypatch.setattr(mudancas, "DETECTAR_MUDANCAS", True)
+    monkeypatch.setattr(mudancas, "inserir_em_lotes", inserir_em_lotes)
+    monkeypatch.setattr(mudancas, "_tabela_hashes_ok", True)
+    return gravadas, falhas
+
+
+def test_segunda_execucao_grava_so_o_que_mudou(gravacoes):
+    gravadas, _ = gravacoes
+    cursor = CursorFalso()
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana"), (2, "Bia")])
+    resultado, *_ = mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana"), (2, "Beatriz"), (3, "Caio")])
+    assert gravadas[-1] == [(3, "Caio"), (2, "Beatriz")]
+    assert resultado.inalteradas == 1
+    assert set(cursor.hashes) == {"1", "2", "3"}
+
+
+def test_removidas_saem_dos_hashes(gravacoes):
+    cursor = CursorFalso()
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana"), (2, "Bia")])
+    resultado, *_ = mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana")])
+    assert resultado.removidas == ["2"]
+    assert set(cursor.hashes) == {"1"}
+
+
+def test_falha_nao_avanca_os_hashes(gravacoes):
+    gravadas, falhas = gravacoes
+    cursor = CursorFalso()
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana")])
+    antes = dict(cursor.hashes)
+
+    falhas["quantidade"] = 1
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana Maria"), (2, "Bia")])
+    assert cursor.hashes == antes
+
+    # Próxima execução tenta de novo as mesmas linhas
+    falhas["quantidade"] = 0
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana Maria"), (2, "Bia")])
+    assert gravadas[-1] == [(2, "Bia"), (1, "Ana Maria")]
+    assert cursor.hashes["1"] != antes["1"]
+
+
+def test_forcar_regrava_tudo(gravacoes):
+    gravadas, _ = gravacoes
+    cursor = CursorFalso()
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana")])
+    mudancas.gravar_alterados(cursor, ENTIDADE, [(1, "Ana")], forcar=True)
+    assert gravadas[-1] == [(1, "Ana")]
+
+
+def test_hash_depende_do_esquema():
+    linha = (1, "Ana")
+    assert mudancas.hash_linha(linha, b"Id,Nome") == mudancas.hash_linha(linha, b"Id,Nome")
+    assert mudancas.hash_linha(linha, b"Id,Nome") != mudancas.hash_linha(linha, b"Id,Nome,Email")
@@ -0,0 +1,79 @@
+import pytest
+
+from core.pipeline import executar_pipeline
+
+
+def _buscar_paginas(paginas):
+    """`paginas`: since_token -> (itens, novo_token, has_more)."""
+    def buscar(since_token):
+        return paginas[since_token]
+    return buscar
+
+
+PAGINAS = {
+    "t0": ([1, 2], "t1", True),
+    "t1": ([3], "t2", True),
+    "t2": ([4, 5, 6], "t3", False),
+}
+
+
+def _executar(gravar, paginas=PAGINAS, **kwargs):
+    eventos = []
+
+    def salvar_token(token):
+        eventos.append(("token", token))
+
+    resultado = executar_pipeline(
+        buscar=_buscar_paginas(paginas),
+        gravar=lambda itens, token: gravar(eventos, itens, token),
+        salvar_token=salvar_token,
+        since_token="t0",
+        max_paginas=kwargs.pop("max_paginas", 100),
+        max_segundos=60,
+        tamanho_fila=kwargs.pop("tamanho_fila", 1),
+        **kwargs,
+    )
+    return resultado, eventos
+
+
+def _gravar_ok(eventos, itens, token):
+    eventos.append(("gravar", token))
+    return len(list(itens))
+
+
+def test_token_salvo_depois_de_cada_pagina_gravada():
+    resultado, eventos = _executar(_gravar_ok, tamanho_pagina=3)
+    assert eventos == [
+        ("gravar", "t1"), ("token", "t1"),
+        ("gravar", "t2"), ("token", "t2"),
+        ("gravar", "t3"), ("token", "t3"),
+    ]
+    assert (resultado.paginas, resultado.itens, resultado.ultimo_token) == (3, 6, "t3")
+    assert not resultado.erro and not resultado.has_more
+    assert resultado.ocupacao == pytest.approx(1.0)
+
+
+def test_falha_na_gravacao_nao_avanca_o_token():
+    def gravar(eventos, itens, token):
+        if token == "t2":
+            raise RuntimeError("MySQL caiu")
+        return _gravar_ok(eventos, itens, token)
+
+    resultado, eventos = _executar(gravar)
+    assert ("token", "t2") not in eventos and ("token", "t3") not in eventos
+    assert eventos == [("gravar", "t1"), ("token", "t1")]
+    assert resultado.erro and resultado.ultimo_token == "t1"
+
+
+def test_falha_na_busca_marca_erro():
+    paginas = {"t0": ([1], "t1", True), "t1": None}
+    resultado, eventos = _executar(_gravar_ok, paginas=paginas)
+    assert resultado.erro
+    assert eventos == [("gravar", "t1"), ("token", "t1")]
+
+
+def test_parar_em_e_max_paginas():
+    resultado, _ = _executar(_gravar_ok, parar_em=lambda token: token == "t2")
+    assert resultado.paginas == 2 and resultado.ultimo_token == "t2"
+    resultado, _ = _executar(_gravar_ok, max_paginas=1)
+    assert resultado.paginas == 1 and resultado.has_more
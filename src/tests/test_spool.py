@@ -0,0 +1,118 @@
+import os
+
+import pytest
+from mysql.connector import errors
+
+from core import spool as modulo_spool
+from core.spool import PASTA_CORROMPIDOS, PASTA_QUARENTENA, SegmentoCorrompido, Spool
+
+
+class ConexaoFalsa:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def banco(monkeypatch):
+    """Controla conectar_banco: `banco["erro"]` é levantado na conexão se definido."""
+    estado = {"erro": None}
+
+    def conectar_banco():
+        if estado["erro"] is not None:
+            raise estado["erro"]
+        return ConexaoFalsa()
+
+    monkeypatch.setattr(modulo_spool, "conectar_banco", conectar_banco)
+    monkeypatch.setattr(modulo_spool, "garantir_tabela_checkpoint", lambda conn: None)
+    return estado
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return Spool(pasta=str(tmp_path), ativo=True, max_tentativas=2)
+
+
+def test_segmento_ida_e_volta(spool):
+    caminho = spool.enfileirar("eventos", [{"EventId": 1}, {"EventId": 2}], "20260101000000000")
+    cabecalho, itens = Spool.ler(caminho)
+    assert itens == [{"EventId": 1}, {"EventId": 2}]
+    assert cabecalho["itens"] == 2 and cabecalho["novo_token"] == "20260101000000000"
+    assert spool.ultimo_token("eventos") == "20260101000000000"
+    assert os.path.basename(spool.enfileirar("eventos", [], "t2")) == "000000000002.seg"
+
+
+def test_checksum_detecta_corpo_alterado(spool):
+    caminho = spool.enfileirar("eventos", [{"EventId": 1}], "t1")
+    with open(caminho, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        ultimo = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([ultimo[0] ^ 0xFF]))
+    with pytest.raises(SegmentoCorrompido):
+        Spool.ler(caminho)
+
+
+def test_drenar_grava_em_ordem_e_descarta_corrompidos(spool, banco):
+    gravados = []
+    spool.registrar("eventos", lambda conn, itens, token: gravados.append(token))
+    spool.enfileirar("eventos", [1], "t1")
+    corrompido = spool.enfileirar("eventos", [2], "t2")
+    spool.enfileirar("eventos", [3], "t3")
+    with open(corrompido, "ab") as f:
+        f.write(b"lixo")
+
+    assert spool.drenar() == 2
+    assert gravados == ["t1", "t3"]
+    assert spool.pendentes("eventos") == 0
+    assert len(os.listdir(os.path.join(spool.pasta, "eventos", PASTA_CORROMPIDOS))) == 1
+
+
+def test_segmento_que_sempre_falha_vai_para_quarentena(spool, banco):
+    gravados = []
+
+    def gravar(conn, itens, token):
+        if token == "t1":
+            raise ValueError("linha inválida")
+        gravados.append(token)
+
+    spool.registrar("eventos", gravar)
+    spool.enfileirar("eventos", [1], "t1")
+    spool.enfileirar("eventos", [2], "t2")
+
+    # 1ª falha: a fila para no segmento, na ordem
+    assert spool.drenar() == 0 and gravados == []
+    # 2ª falha (max_tentativas=2): quarentena e o próximo segue
+    assert spool.drenar() == 1 and gravados == ["t2"]
+    quarentena = os.listdir(os.path.join(spool.pasta, "eventos", PASTA_QUARENTENA))
+    assert sorted(nome.split("-", 1)[1] for nome in quarentena) == ["000000000001.seg", "000000000001.seg.falhas"]
+
+
+def test_banco_fora_para_o_drenar_sem_contar_falha(spool, banco):
+    spool.registrar("eventos", lambda conn, itens, token: None)
+    spool.enfileirar("eventos", [1], "t1")
+    banco["erro"] = errors.InterfaceError(errno=2003, msg="Can't connect")
+    for _ in range(3):
+        assert spool.drenar() == 0
+    assert spool.pendentes("eventos") == 1
+    assert not os.path.exists(os.path.join(spool.pasta, "eventos", PASTA_QUARENTENA))
+
+
+def test_gravar_vai_para_o_spool_so_com_o_banco_fora(spool, banco):
+    gravados = []
+
+    def gravar(conn, itens, token):
+        gravados.append(list(itens))
+        return len(gravados[-1])
+
+    banco["erro"] = errors.DatabaseError(errno=2003, msg="Can't connect")
+    assert spool.gravar("eventos", gravar, iter([1, 2]), "t1") == 2
+    assert spool.pendentes("eventos") == 1 and gravados == []
+
+    # Com fila pendente, a página nova também vai para o spool (ordem do stream)
+    banco["erro"] = None
+    spool.gravar("eventos", gravar, [3], "t2")
+    assert spool.pendentes("eventos") == 2 and gravados == []
+
+    banco["erro"] = errors.PoolError("pool esgotado")
+    with pytest.raises(errors.PoolError):
+        Spool(pasta=os.path.join(spool.pasta, "outro"), ativo=True).gravar("trips", gravar, [4], "t1")